@@ -1,7 +1,59 @@
+import os
 import sys
+from widgets.startup_profile import StartupProfiler
+from widgets.tracing import Tracer
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_TIMEOUT_MS = 10000
+TRACE_FLAG = "--trace"
+
+profile_prefix = None
+trace_prefix = None
+for _arg in list(sys.argv[1:]):
+    if _arg == PROFILE_FLAG or _arg.startswith(PROFILE_FLAG + "="):
+        profile_prefix = _arg.partition("=")[2] or "startup_profile"
+        sys.argv.remove(_arg)
+    elif _arg == TRACE_FLAG or _arg.startswith(TRACE_FLAG + "="):
+        trace_prefix = _arg.partition("=")[2] or "trace"
+        sys.argv.remove(_arg)
+if profile_prefix:
+    StartupProfiler().enable()
+if trace_prefix:
+    Tracer().enable()
+
 from PyQt5 import QtWidgets, QtCore, QtGui
 from widgets import COLORS, ModernWindow
 
+
+def write_profile_when_settled(app, prefix):
+    profiler = StartupProfiler()
+    timer = QtCore.QTimer(app)
+    started = QtCore.QElapsedTimer()
+    started.start()
+
+    def check():
+        painted = profiler.first_paint is not None
+        if (painted and not profiler.pending) or started.elapsed() > PROFILE_TIMEOUT_MS:
+            timer.stop()
+            profiler.disable()
+            print(profiler.write(prefix))
+            print(f"Отчёт: {prefix}.txt, трасса: {prefix}.json")
+
+    timer.timeout.connect(check)
+    timer.start(100)
+    app._profile_timer = timer
+
+
+def dump_trace(prefix):
+    print(f"Трасса сохранена: {Tracer().dump(prefix)}")
+
+
+def install_trace_shortcut(window, prefix):
+    shortcut = QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+Shift+T"), window)
+    shortcut.setContext(QtCore.Qt.ApplicationShortcut)
+    shortcut.activated.connect(lambda: dump_trace(prefix))
+    window._trace_shortcut = shortcut
+
 def main():
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
@@ -55,9 +107,29 @@ def main():
     palette.setColor(QtGui.QPalette.BrightText, QtCore.Qt.red)
     app.setPalette(palette)
 
-    w = ModernWindow()
-    w.show()
-    sys.exit(app.exec_())
+    recorder = None
+    if os.environ.get("BOT_RECORD"):
+        from widgets.recorder import FrameRecorder
+        recorder = FrameRecorder(os.environ["BOT_RECORD"]).attach()
+
+    profiler = StartupProfiler()
+    with profiler.span("ModernWindow()", "init"):
+        w = ModernWindow()
+    with profiler.span("ModernWindow.show", "init"):
+        w.show()
+    if profile_prefix:
+        write_profile_when_settled(app, profile_prefix)
+    if trace_prefix:
+        install_trace_shortcut(w, trace_prefix)
+    code = app.exec_()
+    worker_module = sys.modules.get("widgets.worker")
+    if worker_module:
+        worker_module.BotWorker.shutdown_all()
+    if trace_prefix:
+        dump_trace(trace_prefix)
+    if recorder:
+        recorder.close()
+    sys.exit(code)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, NamedTuple
+import cv2
+import numpy as np
+from widgets.capture import FULL_SCREEN, FrameGate, screen_region
+from widgets.detectors import CowDetector, GymDetector, PortDetector, ShveikaDetector, TokarDetector
+from widgets.locator import Locator
+from widgets.recorder import Recording, ReplayFinished, ReplaySource
+
+ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+
+class Case(NamedTuple):
+    region: Dict[str, float]
+    step: Callable[[np.ndarray, Dict[str, int]], object]
+    paint: Callable[[np.ndarray, np.random.Generator], None]
+
+
+def read_template(*parts) -> np.ndarray:
+    img = cv2.imread(os.path.join(ASSETS, *parts), cv2.IMREAD_UNCHANGED)
+    if img is None:
+        raise FileNotFoundError(os.path.join(*parts))
+    return np.ascontiguousarray(img[:, :, :3])
+
+
+def paste(image: np.ndarray, templ: np.ndarray, rng: np.random.Generator, x: int = None, y: int = None):
+    h, w = templ.shape[:2]
+    if x is None:
+        x = int(rng.integers(0, image.shape[1] - w))
+        y = int(rng.integers(0, image.shape[0] - h))
+    image[y:y + h, x:x + w, :3] = templ
+
+
+def paint_port(image: np.ndarray, rng: np.random.Generator):
+    x = int(rng.integers(0, image.shape[1] - 60))
+    y = int(rng.integers(0, image.shape[0] - 20))
+    image[y:y + 20, x:x + 30] = PortDetector.RED[::-1] + (255,)
+    image[y:y + 20, x + 30:x + 60] = PortDetector.GREEN[::-1] + (255,)
+
+
+def paint_gym(image: np.ndarray, rng: np.random.Generator):
+    center = (int(rng.integers(30, image.shape[1] - 30)), int(rng.integers(30, image.shape[0] - 30)))
+    cv2.circle(image, center, 20, GymDetector.TARGET_RGB[::-1] + (255,), -1)
+
+
+def paint_grid(templates, columns: int, spacing: int):
+    def paint(image: np.ndarray, rng: np.random.Generator):
+        rows = (len(templates) + columns - 1) // columns
+        x0 = int(rng.integers(0, image.shape[1] - columns * spacing))
+        y0 = int(rng.integers(0, image.shape[0] - rows * spacing))
+        for i, templ in enumerate(templates):
+            row, col = divmod(i, columns)
+            paste(image, templ, rng, x0 + col * spacing, y0 + row * spacing)
+    return paint
+
+
+def paint_one_of(templates):
+    def paint(image: np.ndarray, rng: np.random.Generator):
+        paste(image, templates[int(rng.integers(0, len(templates)))], rng)
+    return paint
+
+
+def build_cases() -> Dict[str, Case]:
+    port = PortDetector()
+    gym = GymDetector()
+    cow_templates = {"1": read_template("cow", "1.png"), "2": read_template("cow", "2.png")}
+    cow = CowDetector(cow_templates)
+    stroyka_paths = [os.path.join(ASSETS, "stroyka", f"image{i}.png") for i in range(1, 5)]
+    stroyka = Locator.from_files(stroyka_paths, 0.95)
+    shveika_templates = [read_template("shveika", f"{i}.png") for i in range(1, 21)]
+    shveika = ShveikaDetector(shveika_templates)
+    tokar_template = read_template("tokar", "i3.png")
+    tokar = TokarDetector(tokar_template)
+
+    def shveika_step(image, region):
+        coords = shveika.detect(image, region)
+        return coords is not None and all(coords)
+
+    return {
+        "port": Case(PortDetector.REGION, lambda image, region: port.detect(image), paint_port),
+        "gym": Case(GymDetector.REGION, lambda image, region: gym.detect(image), paint_gym),
+        "cow": Case(CowDetector.REGION, lambda image, region: cow.detect(image), paint_one_of(list(cow_templates.values()))),
+        "stroyka": Case(FULL_SCREEN, lambda image, region: any(stroyka.locate_all(image, region).values()),
+                        paint_one_of(list(stroyka.templates.values()))),
+        "shveika": Case(ShveikaDetector.REGION, shveika_step, paint_grid(shveika_templates, 5, 60)),
+        "tokar": Case(TokarDetector.REGION, lambda image, region: tokar.search(image, region, region), paint_one_of([tokar_template])),
+    }
+
+
+def synthetic_frames(case: Case, region: Dict[str, int], count: int, hit_every: int, seed: int, hold: int = 1):
+    rng = np.random.default_rng(seed)
+    h, w = region["height"], region["width"]
+    for i in range(0, count, hold):
+        coarse = rng.integers(0, 256, (h // 32 + 2, w // 32 + 2, 3), dtype=np.uint8)
+        image = np.empty((h, w, 4), np.uint8)
+        image[:, :, :3] = cv2.resize(coarse, (w, h), interpolation=cv2.INTER_LINEAR)
+        image[:, :, 3] = 255
+        if hit_every and (i // hold) % hit_every == 0:
+            case.paint(image, rng)
+        for _ in range(min(hold, count - i)):
+            yield image
+
+
+def recorded_frames(recording: Recording, region: Dict[str, int], count: int):
+    sub = ReplaySource(recording).subscribe(region)
+    for _ in range(count):
+        try:
+            yield sub.read().image
+        except ReplayFinished:
+            return
+
+
+def measure(case: Case, frames, region: Dict[str, int], warmup: int, gate: bool = False) -> dict:
+    frames = list(frames)
+    if not frames:
+        return {"frames": 0, "skipped": "нет кадров для области"}
+    for image in frames[:warmup]:
+        case.step(image, region)
+    frame_gate = None
+    if gate:
+        frame_gate = FrameGate()
+        step = case.step
+        case = case._replace(step=lambda image, region: frame_gate.run(image, lambda im: step(im, region)))
+
+    samples = np.empty(len(frames))
+    hits = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for i, image in enumerate(frames):
+        t0 = time.perf_counter()
+        hits += bool(case.step(image, region))
+        samples[i] = time.perf_counter() - t0
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    ms = samples * 1000.0
+    result = {
+        "frames": len(frames),
+        "hits": hits,
+        "region": region,
+        "fps": len(frames) / wall if wall else 0.0,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_util": cpu / wall if wall else 0.0,
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+    if frame_gate is not None:
+        result["gate_skipped"] = frame_gate.skipped
+        result["gate_hit_rate"] = frame_gate.hit_rate
+    return result
+
+
+def print_report(results: dict, baseline: dict = None):
+    print(f"{'детектор':<10}{'кадров':>8}{'fps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'cpu s':>9}{'hits':>7}{'Δfps':>9}")
+    for name, r in results.items():
+        if not r.get("frames"):
+            print(f"{name:<10}{'—':>8}  {r.get('skipped', '')}")
+            continue
+        delta = ""
+        old = (baseline or {}).get(name)
+        if old and old.get("fps"):
+            delta = f"x{r['fps'] / old['fps']:.2f}"
+        print(f"{name:<10}{r['frames']:>8}{r['fps']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['cpu_s']:>9.2f}{r['hits']:>7}{delta:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк детекторов воркеров")
+    parser.add_argument("--detectors", default="port,gym,cow,stroyka,shveika,tokar")
+    parser.add_argument("--recording", help="папка записи FrameRecorder вместо синтетических кадров")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--hit-every", type=int, default=4, help="каждый N-й синтетический кадр содержит цель (0 — никогда)")
+    parser.add_argument("--hold", type=int, default=1, help="сколько подряд кадров синтетический кадр остаётся неизменным")
+    parser.add_argument("--gate", action="store_true", help="пропускать неизменившиеся кадры через FrameGate")
+    parser.add_argument("--screen", default="1920x1080")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="куда записать результаты в JSON")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    args = parser.parse_args(argv)
+
+    screen = tuple(int(v) for v in args.screen.lower().split("x"))
+    cv2.setUseOptimized(True)
+    cases = build_cases()
+    recording = Recording(args.recording) if args.recording else None
+
+    results = {}
+    for name in args.detectors.split(","):
+        name = name.strip()
+        case = cases[name]
+        region = screen_region(screen, **case.region)
+        if recording is not None:
+            frames = recorded_frames(recording, region, args.frames)
+        else:
+            frames = synthetic_frames(case, region, args.frames, args.hit_every, args.seed, max(1, args.hold))
+        results[name] = measure(case, frames, region, args.warmup, args.gate)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fp:
+            baseline = json.load(fp)["results"]
+    print_report(results, baseline)
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "screen": args.screen,
+            "source": args.recording or "synthetic",
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
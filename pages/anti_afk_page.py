@@ -1,15 +1,17 @@
 from PyQt5 import QtWidgets, QtCore
 import random
-import threading
 import os
 import pyautogui
-import keyboard
-from typing import Optional, Tuple, Callable
+from typing import Optional, Tuple
 import time
-from widgets.common import CommonLogger, ScriptController, SettingsManager, CheckWithTooltip, CommonUI
+from widgets.common import ScriptController, SettingsManager, CheckWithTooltip, CommonUI, auto_detect_region
+from widgets.capture import CaptureService, FULL_SCREEN
+from widgets.locator import Locator
+from widgets.worker import BotWorker
 import vgamepad as vg
 
 BASE_ASSETS_PATH = "assets/spin/"
+SPIN_IMAGES = ("cols.jpg", "casinoIcon.png", "kasspin.jpg", "spinbutton.jpg")
 
 class AntiAfkPage(QtWidgets.QWidget):
     statusChanged = QtCore.pyqtSignal(bool)
@@ -84,25 +86,23 @@ class AntiAfkPage(QtWidgets.QWidget):
             log_output=self.log_output,
             status_signal=self.statusChanged
         )
-class AntiAfkWorker(QtCore.QThread):
-    log_signal = QtCore.pyqtSignal(str)
-
+class AntiAfkWorker(BotWorker):
     def __init__(self, min_delay=1.0, max_delay=3.5, min_pause=0.5, max_pause=2.0, checkwheel=False):
         super().__init__()
-        self.running = True
         self.min_delay = min_delay
         self.max_delay = max_delay
         self.min_pause = min_pause
         self.max_pause = max_pause
         self.checkwheel = checkwheel
-        self.gamepad = vg.VX360Gamepad()
-        print("Создан gamepad с PID:", self.gamepad.get_pid())
-        print("Создан gamepad с VID:", self.gamepad.get_vid())
-        self.gamepad.reset()
-        self.gamepad.update()
-        self._stop = threading.Event()
+        self.gamepad = None
         self.confidence = 0.85
         self.last_roulette_spin_time = time.time()
+        self.locator = Locator.from_files({
+            image_filename: os.path.join(BASE_ASSETS_PATH, image_filename)
+            for image_filename in SPIN_IMAGES
+            if os.path.exists(os.path.join(BASE_ASSETS_PATH, image_filename))
+        }, self.confidence)
+        self.screen = None
 
         self.DIRECTIONS = {
             'up': (0, 32767),
@@ -121,36 +121,34 @@ class AntiAfkWorker(QtCore.QThread):
         else:
             self.roulette_thread = None
 
-    def log(self, message: str):
-        CommonLogger.log(message, self.log_signal)
+    def _connect_gamepad(self):
+        gamepad = vg.VX360Gamepad()
+        print("Создан gamepad с PID:", gamepad.get_pid())
+        print("Создан gamepad с VID:", gamepad.get_vid())
+        self.on_teardown(self._disconnect_gamepad)
+        self.gamepad = self.use_gamepad(gamepad)
+        self.gamepad.reset()
+        self.gamepad.update()
 
-    def close(self):
-        if self.roulette_thread:
-            self.roulette_thread.stop()
-            self.roulette_thread.wait()
-        if self.gamepad:
-            try:
-                self.gamepad.reset()
-                self.gamepad.update()
-            except Exception:
-                pass
-            self.gamepad = None
-
-    def click_image_in_region(self,image_filename: str,region: Optional[Tuple[int, int, int, int]] = None,confidence: float = 0.85,click: Optional[Callable[[int, int], None]] = pyautogui.click) -> bool:
-        full_image_path = os.path.join(BASE_ASSETS_PATH, image_filename)
-        if not os.path.exists(full_image_path):
-            print(f"Ошибка: Файл изображения '{full_image_path}' не найден.")
+    def _disconnect_gamepad(self):
+        self.gamepad = None
+
+    def click_image_in_region(self,image_filename: str,region: Optional[Tuple[int, int, int, int]] = None,confidence: float = 0.85,click: bool = True) -> bool:
+        if image_filename not in self.locator.templates:
+            print(f"Ошибка: Файл изображения '{os.path.join(BASE_ASSETS_PATH, image_filename)}' не найден.")
             return False
         try:
-            location = pyautogui.locateOnScreen(full_image_path, region=region, confidence=confidence)
+            roi = dict(zip(("left", "top", "width", "height"), region)) if region else None
+            frame = self.screen.read()
+            location = self.locator.locate(frame.image, self.screen.region, image_filename, confidence=confidence, roi=roi)
 
             if location:
-                if click is not None:
-                    center_x, center_y = pyautogui.center(location)
-                    click(center_x, center_y)
+                if click:
+                    center_x, center_y = location.center
+                    self.pointer.click(center_x, center_y)
                     print(f"Изображение '{image_filename}' найдено и был выполнен клик по координатам ({center_x}, {center_y}).")
                 else:
-                    print(f"Изображение '{image_filename}' найдено, но клик не выполнялся (click=None).")
+                    print(f"Изображение '{image_filename}' найдено, но клик не выполнялся (click=False).")
                 return True
             else:
                 print(f"Изображение '{image_filename}' не найдено.")
@@ -159,16 +157,22 @@ class AntiAfkWorker(QtCore.QThread):
             return False
 
     def perform_roulette_spin(self):
+        if not self.running:
+            return
+        with CaptureService().subscribe(auto_detect_region(**FULL_SCREEN)) as self.screen:
+            self._spin_roulette()
+
+    def _spin_roulette(self):
         screen_width, screen_height = pyautogui.size()
         left_half_region = (0, 0, screen_width // 2, screen_height)
         right_half_region = (screen_width // 2, 0, screen_width // 2, screen_height)
         top_half_region = (0, 0, screen_width, screen_height // 2)
         bottom_half_region = (0, screen_height // 2, screen_width, screen_height // 2)
 
-        pos = self.click_image_in_region("cols.jpg", region=top_half_region, click=None)
+        pos = self.click_image_in_region("cols.jpg", region=top_half_region, click=False)
         if pos:
             self.log(f"[✓] Открываю телефон.")
-            keyboard.press_and_release('up')
+            self.tap('up')
             self._stop.wait(2)
 
             if self.click_image_in_region("casinoIcon.png", region=right_half_region,confidence=0.55):
@@ -190,64 +194,46 @@ class AntiAfkWorker(QtCore.QThread):
                 return
 
             self._stop.wait(0.5)
-            keyboard.press_and_release('esc')
+            self.tap('esc')
             self._stop.wait(0.5)
-            keyboard.press_and_release('esc')
+            self.tap('esc')
             self._stop.wait(0.5)
-            keyboard.press_and_release('backspace')
+            self.tap('backspace')
         else:
             self.log("[→] пропускаем колесо")
 
-    def run(self):
+    def work(self):
         self.log("[→] Скрипт анти-АФК запущен.")
-        try:
-            if self.roulette_thread:
-                self.roulette_thread.start()
-            self.gamepad.reset()
+        self._connect_gamepad()
+        if self.roulette_thread:
+            self.own(self.roulette_thread).start()
+        while self.running:
+            direction = random.choice(list(self.DIRECTIONS.keys()))
+            hold_time = random.uniform(self.min_delay, self.max_delay)
+            pause_time = random.uniform(self.min_pause, self.max_pause)
+            x, y = self.DIRECTIONS[direction]
+
+            self.log(f"[•] Направление: {direction}, зажатие: {hold_time:.2f} сек.")
+            self.gamepad.left_joystick(x_value=x, y_value=y)
             self.gamepad.update()
-            while self.running and not self._stop.is_set():
-                direction = random.choice(list(self.DIRECTIONS.keys()))
-                hold_time = random.uniform(self.min_delay, self.max_delay)
-                pause_time = random.uniform(self.min_pause, self.max_pause)
-                x, y = self.DIRECTIONS[direction]
-
-                self.log(f"[•] Направление: {direction}, зажатие: {hold_time:.2f} сек.")
-                self.gamepad.left_joystick(x_value=x, y_value=y)
-                self.gamepad.update()
 
-                if self._stop.wait(hold_time):
-                    break
+            if self._stop.wait(hold_time):
+                break
 
-                self.gamepad.left_joystick(x_value=0, y_value=0)
-                self.gamepad.update()
+            self.gamepad.left_joystick(x_value=0, y_value=0)
+            self.gamepad.update()
 
-                self.log(f"[…] Пауза между: {pause_time:.2f} сек.")
-                if self._stop.wait(pause_time):
-                    break
+            self.log(f"[…] Пауза между: {pause_time:.2f} сек.")
+            if self._stop.wait(pause_time):
+                break
 
-        except Exception as e:
-            self.log(f"[Ошибка] {e}")
-        finally:
-            try:
-                self.gamepad.left_joystick(x_value=0, y_value=0)
-                self.gamepad.update()
-            except Exception:
-                pass
-            self.close()
-
-class RouletteThread(QtCore.QThread):
+class RouletteThread(BotWorker):
     trigger = QtCore.pyqtSignal()
 
     def __init__(self, interval=10, parent=None):
         super().__init__(parent)
         self.interval = interval
-        self._stop_event = threading.Event()
 
-    def run(self):
-        while not self._stop_event.is_set():
-            if self._stop_event.wait(self.interval):
-                break
+    def work(self):
+        while not self._stop.wait(self.interval):
             self.trigger.emit()
-
-    def stop(self):
-        self._stop_event.set()
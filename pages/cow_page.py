@@ -1,13 +1,15 @@
 from PyQt5 import QtWidgets, QtCore
 import time
-import keyboard
 import cv2
-import numpy as np
-import mss
 import os
-from pynput.keyboard import Controller
-from widgets.common import CommonLogger, ScriptController, HotkeyManager, SettingsManager, auto_detect_region, load_images, CommonUI
-import threading
+from widgets.capture import CaptureService, FrameGate
+from widgets.detectors import CowDetector
+from widgets.pacing import Pacer
+from widgets.templates import ScaleCalibrator
+from widgets.tracing import span
+from widgets.worker import BotWorker
+import pyautogui
+from widgets.common import ScriptController, HotkeyManager, SettingsManager, auto_detect_region, load_images, CommonUI
 
 class CowPage(QtWidgets.QWidget):
     statusChanged = QtCore.pyqtSignal(bool)
@@ -33,10 +35,12 @@ class CowPage(QtWidgets.QWidget):
         pause_layout, self.pause_slider, self.get_pause_slider = CommonUI.create_slider_row("Время паузы:", minimum=0.07, maximum=5, default=0.07, suffix="сек", step=0.01)
 
         self.counter_label = CommonUI.create_counter()
+        self.metrics_label = CommonUI.create_metrics_label()
 
         settings_layout.addLayout(hotkey_layout)
         settings_layout.addLayout(pause_layout)
         settings_layout.addWidget(self.counter_label)
+        settings_layout.addWidget(self.metrics_label)
 
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
@@ -60,20 +64,21 @@ class CowPage(QtWidgets.QWidget):
             widget=self,
             worker_factory=CowWorker,
             log_output=self.log_output,
-            extra_signals={"counter_signal": self._update_counter},
+            extra_signals={"counter_signal": self._update_counter, "metrics_signal": self.metrics_label.update_metrics},
             worker_kwargs={"hotkey": self.hotkey_input.text().strip() or 'f5', "pause_delay": self.pause_slider.value() / 100.0}
         )
 
     def _update_counter(self, value: int):
         self.counter_label.setText(f"Счётчик: {value}")
 
-class CowWorker(QtCore.QThread):
-    log_signal = QtCore.pyqtSignal(str)
+class CowWorker(BotWorker):
     counter_signal = QtCore.pyqtSignal(int)
 
-    def __init__(self, hotkey: str = 'f5', pause_delay: float = 0.07):
+    MAX_FPS = 100
+    IDLE_FPS = 10
+
+    def __init__(self, hotkey: str = 'f5', pause_delay: float = 0.07, source=None):
         super().__init__()
-        self.running = True
         self._count = 0
         try:
             cv2.setUseOptimized(True)
@@ -81,14 +86,21 @@ class CowWorker(QtCore.QThread):
         except Exception:
             pass
         self.templates = load_images("cow", mapping={"1.png": "1", "2.png": "2"}, as_cv2=True)
-        self.monitor = auto_detect_region(width_ratio=1.0, height_ratio=0.65, top_ratio=0.35)
+        self.detector = CowDetector(self.templates)
+        self.calibrator = ScaleCalibrator("cow", list(self.templates.values()), pyautogui.size(), SettingsManager(), self._stop,
+                                          CowDetector.THRESHOLD)
+        self.detector.rescale(self.calibrator.scale)
+        self.gate = FrameGate()
+        self.monitor = auto_detect_region(**CowDetector.REGION)
+        self.source = source or CaptureService()
         self.pause_delay = pause_delay
-        self._stop = threading.Event()
+        max_fps = 1.0 / pause_delay if pause_delay > 0 else self.MAX_FPS
+        self.pacer = Pacer(max_fps, min(max_fps, self.IDLE_FPS), stop_event=self._stop)
+        self.metrics.track(self.gate, self.pacer)
         self._auto_e_enabled = False
         self.min_press_interval = 0
         self._last_press_time = 0.0
         self.ui_update_every = 5
-        self.keyboard_controller = Controller()
         self.hotkey_manager = HotkeyManager(
             hotkey=hotkey,
             toggle_callback=self._on_toggle_auto_e,
@@ -98,53 +110,45 @@ class CowWorker(QtCore.QThread):
     def _on_toggle_auto_e(self, enabled: bool):
         self._auto_e_enabled = enabled
 
-    def log(self, message: str):
-        CommonLogger.log(message, self.log_signal)
-
-    def run(self):
+    def work(self):
         self.hotkey_manager.register()
-        with mss.mss() as sct:
-            self.log("Скрипт коровы запущен.")
-            self.log(f"Область поиска: {self.monitor}")
-
-            try:
-                while self.running and not self._stop.is_set():
-                    frame = np.array(sct.grab(self.monitor))
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-
-                    scores = {}
-                    for key, template in self.templates.items():
-                        res = cv2.matchTemplate(frame_rgb, template, cv2.TM_CCOEFF_NORMED)
-                        _, max_val, _, _ = cv2.minMaxLoc(res)
-                        if max_val >= 0.91:
-                            scores[key] = max_val
-
-                    found = bool(scores)
-
-                    if found:
-                        now = time.time()
-                        if now - self._last_press_time >= self.min_press_interval:
-                            if scores.get("1", -1) >= scores.get("2", -1):
-                                self.keyboard_controller.tap('a')
-                                self.keyboard_controller.tap('ф')
-                            else:
-                                self.keyboard_controller.tap('d')
-                                self.keyboard_controller.tap('в')
-
-                            self._last_press_time = now
-                            if self._count % self.ui_update_every == 0:
-                                self.counter_signal.emit(self._count)
-
-                    elif self._auto_e_enabled:
-                        self.keyboard_controller.tap('e')
-                        self.keyboard_controller.tap('у')
-
-                    if self.pause_delay > 0:
-                        if self._stop.wait(self.pause_delay):
-                            break
-
-            except Exception as exc:
-                self.log(f"[Ошибка потока] {str(exc)}")
-            finally:
-                self.hotkey_manager.unregister()
-                self.stop()
\ No newline at end of file
+        self.on_teardown(self.hotkey_manager.unregister)
+        self.on_teardown(self.calibrator.close)
+        roi = self.subscribe(self.monitor)
+        self.log("Скрипт коровы запущен.")
+        self.log(f"Область поиска: {self.monitor}")
+
+        try:
+            while self.running:
+                with self.metrics.timed("capture"):
+                    image = roi.read().image
+                with self.metrics.timed("match"):
+                    scores = self.gate.run(image, self.detector.detect)
+                found = bool(scores)
+                if self.calibrator.apply(self.detector, image, found):
+                    self.gate.reset()
+
+                if found:
+                    self.metrics.detected()
+                    now = time.time()
+                    if now - self._last_press_time >= self.min_press_interval:
+                        with span("decision"):
+                            key = 'a' if scores.get("1", -1) >= scores.get("2", -1) else 'd'
+                        with span("input"):
+                            self.tap(key)
+                        self.metrics.acted()
+
+                        self._last_press_time = now
+                        if self._count % self.ui_update_every == 0:
+                            self.counter_signal.emit(self._count)
+
+                elif self._auto_e_enabled:
+                    with span("input"):
+                        self.tap('e')
+                    self.metrics.acted()
+
+                if self.pacer.wait(active=found):
+                    break
+                self.publish_metrics()
+        finally:
+            self.log(f"[i] {self.gate.summary()}")
\ No newline at end of file
@@ -1,31 +1,17 @@
 import time
 import pyautogui
-import cv2
-import numpy as np
-import mss
-from widgets.common import CommonLogger, ScriptController, auto_detect_region, load_images, SettingsManager, OverlayWindow, CheckWithTooltip,CommonUI
-import threading
-import time, threading
+from widgets.capture import CaptureService, FrameGate
+from widgets.detectors import ShveikaDetector, TokarDetector
+from widgets.pacing import Pacer
+from widgets.pointer import ClickTarget
+from widgets.metrics import hud_fields
+from widgets.sound import SoundPool
+from widgets.tracing import span
+from widgets.worker import BotWorker
+from widgets.templates import ScaleCalibrator, TemplateRegistry
+from widgets.common import ScriptController, auto_detect_region, load_images, SettingsManager, OverlayWindow, CheckWithTooltip,CommonUI
 from PyQt5 import QtWidgets, QtCore
-import os, time, sys
-from PyQt5 import QtMultimedia
-
-def resource_path(relative_path: str) -> str:
-    if getattr(sys, 'frozen', False):
-        base_path = os.path.dirname(sys.executable)
-    else:
-        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    return os.path.join(base_path, relative_path)
-
-def play_beep(self):
-    timer_path = resource_path(os.path.join("assets", "beep.wav"))
-    if os.path.exists(timer_path):
-        self.sound_player = QtMultimedia.QMediaPlayer() 
-        self.sound_player.setMedia(QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(timer_path)))
-        self.sound_player.setVolume(100)
-        self.sound_player.play()
-    else:
-        print(f"[⚠️] Файл {timer_path} не найден.")
+
 
 class DemorganPage(QtWidgets.QWidget):
     statusChanged = QtCore.pyqtSignal(bool)
@@ -36,12 +22,31 @@ class DemorganPage(QtWidgets.QWidget):
         self.settings = SettingsManager()
         self._init_ui()
         self._load_settings()
-        self.hud = OverlayWindow(
-            title="Деморган",
-            fields={"Действий": 0},
-            f_keys="F1",
-            auto_monitor=False
-        )
+        self._hud = None
+
+    @property
+    def hud(self) -> OverlayWindow:
+        if self._hud is None:
+            self._hud = OverlayWindow(
+                title="Деморган",
+                fields={"Действий": 0},
+                f_keys="F1",
+                auto_monitor=False
+            )
+        return self._hud
+
+    def _update_hud(self, data: dict):
+        if self._hud is not None:
+            self._hud.update_values(**data)
+
+    def _update_metrics(self, record: dict):
+        self.metrics_label.update_metrics(record)
+        self._update_hud(hud_fields(record))
+
+    def _close_hud(self):
+        if self._hud is not None:
+            self._hud.stop_monitor()
+            self._hud.close()
 
     def _init_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -64,6 +69,8 @@ class DemorganPage(QtWidgets.QWidget):
         settings_layout.addLayout(shveika_layout)
         settings_layout.addLayout(shveika_exe_layout)
         settings_layout.addWidget(self.checkoverlay)
+        self.metrics_label = CommonUI.create_metrics_label()
+        settings_layout.addWidget(self.metrics_label)
 
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
@@ -97,7 +104,8 @@ class DemorganPage(QtWidgets.QWidget):
                            "shveika_pause": self.shveika_pause_slider.value(), 
                            "shveika_exe": self.get_tokar_pause()},
             extra_signals = {
-                "hud_update_signal": lambda data: self.hud.update_values(**data)
+                "hud_update_signal": self._update_hud,
+                "metrics_signal": self._update_metrics
             }
         )
 
@@ -106,14 +114,11 @@ class DemorganPage(QtWidgets.QWidget):
                 self.hud.start_monitor()
                 self.hud.show()
             else:
-                self.hud.stop_monitor()
-                self.hud.close()
+                self._close_hud()
         else:
-            self.hud.stop_monitor()
-            self.hud.close()
+            self._close_hud()
 
-class TimerWorker(QtCore.QThread):
-    log_signal = QtCore.pyqtSignal(str)
+class TimerWorker(BotWorker):
     finished_signal = QtCore.pyqtSignal()
     hud_update_signal = QtCore.pyqtSignal(dict)
 
@@ -121,9 +126,8 @@ class TimerWorker(QtCore.QThread):
         super().__init__()
         self.seconds = seconds
         self.label = label
-        self.running = True
 
-    def run(self):
+    def work(self):
         start = time.time()
         while self.running and (time.time() - start) < self.seconds:
             left = self.seconds - int(time.time() - start)
@@ -132,32 +136,33 @@ class TimerWorker(QtCore.QThread):
             self.hud_update_signal.emit({
                 "Сдавать через": f"{mins:02d}:{secs:02d}"
             })
-            time.sleep(1)
+            self._stop.wait(1)
         if self.running:
             self.log_signal.emit(f"[✔] {self.label} таймер завершён!")
             self.hud_update_signal.emit({"Сдавать через": None})
-            play_beep(self)
+            SoundPool.instance().play("beep")
             self.finished_signal.emit()
 
-    def stop(self):
-        self.running = False
-
-class DemorganWorker(QtCore.QThread):
-    log_signal = QtCore.pyqtSignal(str)
+class DemorganWorker(BotWorker):
     counter_signal = QtCore.pyqtSignal(int)
     hud_update_signal = QtCore.pyqtSignal(dict)
-    
-    CONFIDENCE = 0.95
+
+    SHVEIKA_FPS = (100, 10)
+    TOKAR_FPS = (100, 5)
 
     def start_timer(self, seconds: int, label: str):
+        self.stop_timer()
         self.timer_thread = TimerWorker(seconds, label)
         self.timer_thread.log_signal.connect(self.log)
         self.timer_thread.hud_update_signal.connect(self.hud_update_signal)
         self.timer_thread.start()
 
-    def __init__(self, width_ratio=0.5, height_ratio=0.6, top_ratio=0.25, tokar_pause: float = 0.0, shveika_pause: float = 0.0, shveika_exe: float = 0.0):
+    def stop_timer(self):
+        if self.timer_thread is not None:
+            self.timer_thread.shutdown()
+
+    def __init__(self, width_ratio=0.5, height_ratio=0.6, top_ratio=0.25, tokar_pause: float = 0.0, shveika_pause: float = 0.0, shveika_exe: float = 0.0, source=None):
         super().__init__()
-        self.running = True
         self.timer_thread = None
         self._count = 0
         self.tokar_pause = tokar_pause
@@ -166,84 +171,73 @@ class DemorganWorker(QtCore.QThread):
         self.last_known_position = None
         self.template = self._load_template()
         self.monitor = auto_detect_region(width_ratio, height_ratio, top_ratio)
-        self.monitor2 = auto_detect_region(0.5, 0.8, 0.1)
-        self._stop = threading.Event()
-        self.image_paths = load_images("shveika", count=20)
-        self.shveika_templates = self._load_shveika_templates(self.image_paths)
-        self.sentinel_idx = 0
-        self.sentinel_threshold = 0.92
+        self.monitor2 = auto_detect_region(**ShveikaDetector.REGION)
+        self.source = source or CaptureService()
+        self.shveika_pacer = Pacer(*self.SHVEIKA_FPS, stop_event=self._stop)
+        self.tokar_pacer = Pacer(*self.TOKAR_FPS, stop_event=self._stop)
+        self.shveika_templates = load_images("shveika", count=20, as_cv2=True)
+        self.layout_key = "shveika_layout_%dx%d" % tuple(pyautogui.size())
+        self.shveika = ShveikaDetector(
+            self.shveika_templates,
+            layout=SettingsManager().get("demorgan", self.layout_key),
+            on_layout=self._save_layout
+        )
+        self.tokar = TokarDetector(self.template)
+        screen = pyautogui.size()
+        self.shveika_scale = ScaleCalibrator("shveika", [self.shveika_templates[0]], screen, SettingsManager(), self._stop,
+                                             ShveikaDetector.CONFIDENCE)
+        self.tokar_scale = ScaleCalibrator("tokar", [self.template], screen, SettingsManager(), self._stop,
+                                           TokarDetector.THRESHOLD)
+        self.shveika.rescale(self.shveika_scale.scale)
+        self.tokar.rescale(self.tokar_scale.scale)
+        self.shveika_gate = FrameGate()
+        self.metrics.loops = 2
+        self.metrics.track(self.shveika_gate, self.shveika_pacer, self.tokar_pacer)
         self.is_tokar_found = False
 
     def _load_template(self):
-        t = cv2.imread("assets/tokar/i3.png", cv2.IMREAD_UNCHANGED)
-        if t is None:
-            raise FileNotFoundError("Не найден шаблон токаря")
-        return t[:, :, :3]
-
-    def _load_shveika_templates(self, paths):
-        templates = []
-        for p in paths:
-            img = cv2.imread(p, cv2.IMREAD_UNCHANGED)
-            if img is None:
-                raise FileNotFoundError(f"Не найден шаблон: {p}")
-            if img.shape[2] == 4:
-                img = img[:, :, :3]
-            templates.append(img)
-        return templates
-
-    def log(self, message: str):
-        CommonLogger.log(message, self.log_signal)
-
-    def run(self):
+        return TemplateRegistry().get("tokar/i3.png").bgr
+
+    def _save_layout(self, layout):
+        SettingsManager().set("demorgan", self.layout_key, layout)
+        self.log("[✓] Раскладка швейки сохранена.")
+
+    def work(self):
         self.log(f"[→] Скрипт Деморган запущен")
-        tokar_thread = threading.Thread(target=self.run_tokar, args=(self.template, self.monitor))
-        script_thread = threading.Thread(target=self.run_shveika) 
-        tokar_thread.start()
-        script_thread.start()
+        self.on_teardown(self.stop_timer)
+        self.on_teardown(self.shveika_scale.close)
+        self.on_teardown(self.tokar_scale.close)
+        tokar_thread = self.spawn(self.run_tokar, self.template, self.monitor, name="Tokar")
+        script_thread = self.spawn(self.run_shveika, name="Shveika")
         tokar_thread.join()
         script_thread.join()
 
-    def _locate_one(self, image_bgr, templ_bgr, threshold):
-        res = cv2.matchTemplate(image_bgr, templ_bgr, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
-        if max_val >= threshold:
-            h, w = templ_bgr.shape[:2]
-            center = (max_loc[0] + w // 2 + self.monitor2["left"],
-                      max_loc[1] + h // 2 + self.monitor2["top"])
-            return center, max_val
-        return None, max_val
-        
-    def _locate_all_20(self, image_bgr, threshold):
-        coords = []
-        for templ in self.shveika_templates:
-            c, score = self._locate_one(image_bgr, templ, threshold)
-            coords.append(c)
-        return coords
-
     def run_shveika(self):
         last_wait_logged = 0.0
-        sentinel_tem = self.shveika_templates[self.sentinel_idx]
         try:
-            with mss.mss() as sct:
+            with self.source.subscribe(self.monitor2) as roi:
                 while self.running:
                     if self.is_tokar_found:
-                        self._stop.wait(0.05)
+                        self.pause(0.05)
                         continue
 
-                    frame = np.array(sct.grab(self.monitor2))
-                    image_bgr = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-                    sentinel_center, sentinel_score = self._locate_one(image_bgr, sentinel_tem, self.sentinel_threshold)
+                    with self.metrics.timed("capture"):
+                        image = roi.read().image
+                    with self.metrics.timed("match"):
+                        coords = self.shveika_gate.run(image, lambda image: self.shveika.detect(image, roi.region))
+                    if self.shveika_scale.apply(self.shveika, image, coords is not None):
+                        self.shveika_gate.reset()
 
-                    if sentinel_center is None:
+                    if coords is None:
                         now = time.time()
                         if now - last_wait_logged > 1.5:
                             last_wait_logged = now
-                        self._stop.wait(0.01)
+                        self.shveika_pacer.wait()
+                        self.publish_metrics()
                         continue
 
-                    coords = self._locate_all_20(image_bgr, self.CONFIDENCE)
-
                     if all(coords):
+                        self.metrics.detected()
                         self.start_timer(self.shveika_pause, "Швейка")
                         self._count += 1
                         self.counter_signal.emit(self._count)
@@ -253,45 +247,39 @@ class DemorganWorker(QtCore.QThread):
                             "Действий": self.current_actions,
                             "Сейчас": "Швейка",
                         })
-                        for i, pos in enumerate(coords):
-                            if not self.running:
-                                break
-                            if i == 0:
-                                pyautogui.click(pos)
-                                self.log(f"[Клик] {i+1}/20: {pos} (1 раз)")
-                            else:
-                                pyautogui.click(pos)
-                                self._stop.wait(self.shveika_exe)
-                                pyautogui.click(pos)
-                                self.log(f"[Клик] {i+1}/20: {pos} (2 раза)")
-                        self._stop.wait(0.03)
+                        targets = [ClickTarget(x, y, 1 if i == 0 else 2) for i, (x, y) in enumerate(coords)]
+                        with span("input"):
+                            report = self.pointer.run(targets, interval=self.shveika_exe)
+                        self.metrics.acted(report.clicks)
+                        self.log(f"[Клик] {report.summary()}")
+                        self.pause(0.03)
                     else:
                         now = time.time()
                         if now - last_wait_logged > 1.5:
                             missing = [i+1 for i, c in enumerate(coords) if c is None]
                             self.log(f"[~] Ожидание элементов... отсутствуют: {missing[:6]}{'...' if len(missing) > 6 else ''}")
                             last_wait_logged = now
-                        self._stop.wait(0.03)
+                        self.shveika_pacer.wait(active=True)
+                        self.publish_metrics()
         except Exception as exc:
             self.log(f"[Ошибка потока Швейки] {str(exc)}")
         finally:
+            self.log(f"[i] Швейка: {self.shveika_gate.summary()}")
             self.running = False
 
 
-    def _search_in_region(self, sct, region):
-        h, w = self.template.shape[:2]
-        screenshot = np.array(sct.grab(region))
-        screenshot_bgr = cv2.cvtColor(screenshot, cv2.COLOR_BGRA2BGR)
+    def _search_in_region(self, roi, image, region):
+        with self.metrics.timed("match"):
+            position = self.tokar.search(image, roi.region, region)
 
-        result = cv2.matchTemplate(screenshot_bgr, self.template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
-
-        if max_val > 0.9:
-            found_x = region["left"] + max_loc[0] + w // 2
-            found_y_bottom = region["top"] + max_loc[1] + h
+        if position:
+            self.metrics.detected()
+            found_x, found_y_bottom = position
             self.last_known_position = (found_x, found_y_bottom)
             self.is_tokar_found = True
-            pyautogui.moveTo(found_x, found_y_bottom + 30)
+            with span("input"):
+                self.pointer.move(found_x, found_y_bottom + 30)
+            self.metrics.acted()
             self.log(f"[✓] токарь найден (#{self._count})")
             self._stop.wait(0.01)
             self.is_tokar_found = False
@@ -306,10 +294,13 @@ class DemorganWorker(QtCore.QThread):
         self.last_known_position = None
         self.is_tracking = False
 
-        with mss.mss() as sct:
+        with self.source.subscribe(self.monitor) as roi:
             try:
                 while self.running:
                     found = False
+                    h = self.tokar.template.shape[0]
+                    with self.metrics.timed("capture"):
+                        image = roi.read().image
 
                     if self.last_known_position:
                         cx, cy_bottom = self.last_known_position
@@ -319,10 +310,12 @@ class DemorganWorker(QtCore.QThread):
                             "width": min(cx + 100, self.monitor["left"] + self.monitor["width"]) - max(cx - 100, self.monitor["left"]),
                             "height": min(cy_bottom + 100 - h // 2, self.monitor["top"] + self.monitor["height"]) - max(cy_bottom - 100 - h // 2, self.monitor["top"]),
                         }
-                        found = self._search_in_region(sct, small_monitor)
+                        found = self._search_in_region(roi, image, small_monitor)
 
                     if not found:
-                        found = self._search_in_region(sct, self.monitor)
+                        found = self._search_in_region(roi, image, self.monitor)
+
+                    self.tokar_scale.apply(self.tokar, image, bool(found))
 
                     if found and not self.is_tracking:
                         print("Элемент найден. Работа начата!")
@@ -334,7 +327,9 @@ class DemorganWorker(QtCore.QThread):
                         if self.is_tracking:
                             print("Элемент потерян. Отслеживание остановлено.")
                             self.is_tracking = False
-                        self._stop.wait(0.05)
+
+                    self.tokar_pacer.wait(active=found)
+                    self.publish_metrics()
                             
             except Exception as exc:
                 self.log(f"[Ошибка потока токаря] {str(exc)}")
@@ -1,8 +1,11 @@
 from PyQt5 import QtWidgets, QtCore
-import pyautogui
 import os
-from widgets.common import CommonLogger, ScriptController, CommonUI
-import threading
+from widgets.common import ScriptController, CommonUI, auto_detect_region
+from widgets.capture import FULL_SCREEN
+from widgets.locator import Locator
+from widgets.focus import FocusWatcher
+from widgets.tracing import span
+from widgets.worker import BotWorker
 
 BASE_ASSETS_PATH = "assets/cook/"
 RECIPES = {
@@ -57,6 +60,8 @@ class GotovkaPage(QtWidgets.QWidget):
 
         dish_layout, self.dish_combo = CommonUI.create_combo("Выберите блюдо:", list(RECIPES.keys()))
         settings_layout.addLayout(dish_layout)
+        self.metrics_label = CommonUI.create_metrics_label()
+        settings_layout.addWidget(self.metrics_label)
 
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
@@ -70,34 +75,42 @@ class GotovkaPage(QtWidgets.QWidget):
         ScriptController.toggle_script(
             widget=self,
             worker_factory=lambda: GotovkaWorker(selected_dish),
-            log_output=self.log_output
+            log_output=self.log_output,
+            extra_signals={"metrics_signal": self.metrics_label.update_metrics}
         )
 
-class GotovkaWorker(QtCore.QThread):
-    log_signal = QtCore.pyqtSignal(str)
-
+class GotovkaWorker(BotWorker):
     def __init__(self, dish_name: str):
         super().__init__()
-        self._stop = threading.Event()
-        self.running = True
+        self.focus = FocusWatcher()
         self.dish_name = dish_name
         self.confidence = 0.85
         self.cycles_count = 0
-
-    def log(self, message: str):
-        CommonLogger.log(message, self.log_signal)
+        self.locator = Locator.from_files(
+            {image_filename: os.path.join(BASE_ASSETS_PATH, image_filename) for image_filename, _ in RECIPES[dish_name]},
+            self.confidence
+        )
+        self.screen = auto_detect_region(**FULL_SCREEN)
+        self.roi = None
 
     def _find_and_perform_action(self, image_filename: str, click_type: str) -> bool:
-        full_image_path = os.path.join(BASE_ASSETS_PATH, image_filename)
         try:
-            location = pyautogui.locateCenterOnScreen(full_image_path, confidence=self.confidence)
-            if location:
+            with self.metrics.timed("capture"):
+                frame = self.roi.read()
+            with self.metrics.timed("match"):
+                match = self.locator.locate(frame.image, self.roi.region, image_filename)
+            if match:
+                self.metrics.detected()
+                location = match.center
                 if click_type == "right":
-                    pyautogui.rightClick(location)
+                    with span("input"):
+                        self.pointer.click(*location, button="right")
                     self.log(f"[✓] Использован/перетащен: {image_filename}.")
                 elif click_type == "left":
-                    pyautogui.click(location)
+                    with span("input"):
+                        self.pointer.click(*location)
                     self.log(f"[✓] Клик по кнопке: {image_filename}.")
+                self.metrics.acted()
                 return True
             else:
                 self.log(f"[!] Изображение не найдено: {image_filename}.")
@@ -112,23 +125,25 @@ class GotovkaWorker(QtCore.QThread):
                 return False
             if not self._find_and_perform_action(image_filename, action_type):
                 return False
-            self._stop.wait(0.1)
+            self.pause(0.1)
 
         self.log(f"[✓] Все шаги для приготовления '{self.dish_name}' выполнены.")
         return True
 
-    def run(self):
+    def work(self):
         self.log(f"[→] Скрипт готовки запущен для блюда: {self.dish_name}")
         rage_window_missing = True
         waiting_for_recipe_elements = False
+        self.roi = self.subscribe(self.screen)
+        self.watch_focus()
 
         try:
             while self.running:
-                if not CommonLogger.is_rage_mp_active():
+                if not self.focus.active:
                     if not rage_window_missing:
                         self.log("[!] Окно RAGE Multiplayer не активно. Ожидание...")
                         rage_window_missing = True
-                    self._stop.wait(1)
+                    self.pause(FocusWatcher.POLL_INTERVAL)
                     continue
                 else:
                     if rage_window_missing:
@@ -140,16 +155,12 @@ class GotovkaWorker(QtCore.QThread):
                     self.log(f"[✓] Цикл готовки №{self.cycles_count} для '{self.dish_name}' завершён.")
                     self.log("Ожидание перезарядки (5.5 секунд)...")
                     waiting_for_recipe_elements = False
-                    self._stop.wait(5.5)
+                    self.pause(5.5)
                 else:
                     if not waiting_for_recipe_elements:
                         self.log(f"[!] Ожидание появления всех элементов для '{self.dish_name}'...")
                         waiting_for_recipe_elements = True
-                    self._stop.wait(1)
-
-        except Exception as exc:
-            self.log(f"[Ошибка потока] {exc}")
+                    self.pause(1)
         finally:
             if self.running:
                 self.log("[■] Скрипт готовки завершён.")
-
@@ -1,10 +1,11 @@
 from PyQt5 import QtWidgets, QtCore
 import time
-import cv2
-import numpy as np
-from pynput.keyboard import Key, Controller
-import mss
-from widgets.common import CommonLogger, ScriptController, HotkeyManager, SettingsManager, auto_detect_region,CommonUI
+from widgets.capture import CaptureService, FrameGate
+from widgets.detectors import GymDetector
+from widgets.pacing import Pacer
+from widgets.tracing import span
+from widgets.worker import BotWorker
+from widgets.common import ScriptController, HotkeyManager, SettingsManager, auto_detect_region,CommonUI
 
 class GymPage(QtWidgets.QWidget):
     statusChanged = QtCore.pyqtSignal(bool)
@@ -32,11 +33,13 @@ class GymPage(QtWidgets.QWidget):
         food_pause_layout, self.pause_slider, self.get_pause_slider = CommonUI.create_slider_row("Время паузы еды:", 1, 3600, 50, step=1)
 
         self.counter_label = CommonUI.create_counter()
+        self.metrics_label = CommonUI.create_metrics_label()
 
         settings_layout.addLayout(hotkey_layout)
         settings_layout.addLayout(food_bind)
         settings_layout.addLayout(food_pause_layout)
         settings_layout.addWidget(self.counter_label)
+        settings_layout.addWidget(self.metrics_label)
 
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
@@ -63,51 +66,32 @@ class GymPage(QtWidgets.QWidget):
             widget=self,
             worker_factory=GymWorker,
             log_output=self.log_output,
-            extra_signals={"counter_signal": self._update_counter},
+            extra_signals={"counter_signal": self._update_counter, "metrics_signal": self.metrics_label.update_metrics},
             worker_kwargs={"hotkey": self.hotkey_input.text().strip() or 'f5', "pause_delay": self.pause_slider.value(),"key_food": self.food_bind.text().strip() or 'k'}
         )
 
     def _update_counter(self, value: int):
         self.counter_label.setText(f"Счётчик: {value}")
 
-class GymWorker(QtCore.QThread):
-    log_signal = QtCore.pyqtSignal(str)
+class GymWorker(BotWorker):
     counter_signal = QtCore.pyqtSignal(int)
 
-    TARGET_RGB = (120, 255, 166)
+    MAX_FPS = 60
+    IDLE_FPS = 20
 
-    H_TOL = 0   #оттенок 10
-    S_TOL = 0   #насыщенность 15
-    V_TOL = 0   #яркость
-
-    MIN_AREA = 50
-
-
-    eng_to_rus = {
-        'q': 'й', 'w': 'ц', 'e': 'у', 'r': 'к', 't': 'е', 'y': 'н', 'u': 'г',
-        'i': 'ш', 'o': 'щ', 'p': 'з', '[': 'х', ']': 'ъ',
-        'a': 'ф', 's': 'ы', 'd': 'в', 'f': 'а', 'g': 'п', 'h': 'р', 'j': 'о',
-        'k': 'л', 'l': 'д', ';': 'ж', "'": 'э',
-        'z': 'я', 'x': 'ч', 'c': 'с', 'v': 'м', 'b': 'и', 'n': 'т', 'm': 'ь',
-        ',': 'б', '.': 'ю', '/': '.'
-    }
-
-    def __init__(self, monitor: dict = None, hotkey: str = 'f5', pause_delay: float = 0.0, key_food: str = 'k'):
+    def __init__(self, monitor: dict = None, hotkey: str = 'f5', pause_delay: float = 0.0, key_food: str = 'k', source=None):
         super().__init__()
-        self.running = True
         self._count = 0
         self.pause_delay = pause_delay
         self.key_food = key_food
-        lower = self.key_food.lower()
-        self.rus_key = self.eng_to_rus.get(lower, self.key_food)
-        if self.key_food.isupper():
-            self.rus_key = self.rus_key.upper()
-        self.monitor = monitor or auto_detect_region(reference_height=1440, reference_top=560)
-        self._hotkey = (hotkey or 'f5').lower().strip()
-        self._hotkey_id = None
+        self.monitor = monitor or auto_detect_region(**GymDetector.REGION)
+        self.detector = GymDetector()
+        self.gate = FrameGate()
+        self.pacer = Pacer(self.MAX_FPS, self.IDLE_FPS, stop_event=self._stop)
+        self.metrics.track(self.gate, self.pacer)
+        self.source = source or CaptureService()
         self._auto_e_enabled = False
         self._last_e_time = 0.0
-        self.keyboard_controller = Controller()
         self.hotkey_manager = HotkeyManager(
             hotkey=hotkey,
             toggle_callback=self._on_toggle_auto_e,
@@ -117,77 +101,47 @@ class GymWorker(QtCore.QThread):
     def _on_toggle_auto_e(self, enabled: bool):
         self._auto_e_enabled = enabled
         
-    def rgb_to_hsv_bounds(self, rgb, h_tol, s_tol, v_tol):
-        bgr = np.uint8([[[rgb[2], rgb[1], rgb[0]]]])
-        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)[0, 0]
-        h, s, v = int(hsv[0]), int(hsv[1]), int(hsv[2])
-
-        lower = np.array([max(0,   h - h_tol), max(0,   s - s_tol), max(0,   v - v_tol)], dtype=np.uint8)
-        upper = np.array([min(179, h + h_tol), min(255, s + s_tol), min(255, v + v_tol)], dtype=np.uint8)
-        return lower, upper
-
-    def found_circle_by_color(self, frame_bgr, lower, upper):
-        hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv, lower, upper)
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        for cnt in contours:
-            area = cv2.contourArea(cnt)
-            if area < self.MIN_AREA:
-                continue
-
-            perim = cv2.arcLength(cnt, True)
-            if perim == 0:
-                continue
-
-            '''circularity = 4 * math.pi * area / (perim * perim)
-            if circularity < MIN_CIRCULARITY:
-                continue'''
-
-            return True
-        return False
-
-    def log(self, message: str):
-        CommonLogger.log(message, self.log_signal)
-
-    def run(self):
-        lower, upper = self.rgb_to_hsv_bounds(self.TARGET_RGB, self.H_TOL, self.S_TOL, self.V_TOL)
+    def work(self):
         was_found = False
         self._last_e_time = time.time()
 
         self.log(f"Запуск. Область поиска: {self.monitor}")
         self.hotkey_manager.register()
+        self.on_teardown(self.hotkey_manager.unregister)
+        roi = self.subscribe(self.monitor)
         try:
-            with mss.mss() as sct:
-                while self.running:
-                    img = np.array(sct.grab(self.monitor))
-                    frame_bgr = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-
-                    found = self.found_circle_by_color(frame_bgr, lower, upper)
-
-                    if found and not was_found:
-                        self.log(f"Круг найден, нажимаем пробел")
-                        self.keyboard_controller.tap(Key.space)
-
-                    if not found:
+            while self.running:
+                with self.metrics.timed("capture"):
+                    image = roi.read().image
+                with self.metrics.timed("match"):
+                    found = self.gate.run(image, self.detector.detect)
+
+                if found and not was_found:
+                    with span("input"):
+                        self.tap("space")
+                    self.log(f"Круг найден, нажимаем пробел")
+                    self.metrics.detected()
+                    self.metrics.acted()
+
+                if not found:
+                    now = time.time()
+                    if now - getattr(self, "_last_k_time", 0) >= self.pause_delay:
+                        with span("input"):
+                            self.tap(self.key_food)
+                        self.metrics.acted()
+                        self._last_k_time = now
+                        self.log(f"Нажата {self.key_food} (еда)")
+                    if self._auto_e_enabled:
                         now = time.time()
-                        if now - getattr(self, "_last_k_time", 0) >= self.pause_delay:
-                            self.keyboard_controller.tap(self.key_food)
-                            self.keyboard_controller.tap(self.rus_key)
-                            self._last_k_time = now
-                            self.log(f"Нажата {self.key_food} (еда)")
-                        if self._auto_e_enabled:
-                            now = time.time()
-                            if now - self._last_e_time >= 5.0:
-                                self.keyboard_controller.tap('e')
-                                self.keyboard_controller.tap('у')
-                                self._last_e_time = now
-                                self.log("Нажата 'E' (авто)")
-
-                    was_found = found
-
-        except Exception as exc:
-            self.log(f"[Ошибка потока] {exc}")
+                        if now - self._last_e_time >= 5.0:
+                            with span("input"):
+                                self.tap('e')
+                            self.metrics.acted()
+                            self._last_e_time = now
+                            self.log("Нажата 'E' (авто)")
+
+                was_found = found
+                self.pacer.wait(active=found)
+                self.publish_metrics()
         finally:
-            self.hotkey_manager.unregister()
-            self.running = False
\ No newline at end of file
+            self.log(f"[i] {self.gate.summary()}")
\ No newline at end of file
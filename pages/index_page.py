@@ -1,5 +1,6 @@
 from PyQt5 import QtWidgets, QtCore, QtGui, QtNetwork
 from PyQt5.QtCore import QUrl
+from widgets.startup_profile import StartupProfiler
 
 GLOBAL_NETWORK_MANAGER = QtNetwork.QNetworkAccessManager()
 
@@ -104,9 +105,11 @@ class IndexPage(QtWidgets.QWidget):
     def load_online_count(self):
         request = QtNetwork.QNetworkRequest(QUrl("https://dornode.ru/online.php"))
         GLOBAL_NETWORK_MANAGER.finished.connect(self._on_response)
+        StartupProfiler().begin("IndexPage.load_online_count")
         GLOBAL_NETWORK_MANAGER.get(request)
 
     def _on_response(self, reply):
+        StartupProfiler().end("IndexPage.load_online_count")
         if reply.error() == QtNetwork.QNetworkReply.NoError:
             data = reply.readAll().data().decode("utf-8").strip()
             if data.isdigit():
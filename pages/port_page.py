@@ -1,9 +1,11 @@
 from PyQt5 import QtWidgets, QtCore
-import keyboard
-import pyautogui
-from pynput.keyboard import Controller
-from widgets.common import CommonLogger, ScriptController, SettingsManager, auto_detect_region, CommonUI
-import threading
+from widgets.capture import CaptureService
+from widgets.detectors import PortDetector
+from widgets.pacing import Pacer
+from widgets.focus import FocusWatcher
+from widgets.tracing import span
+from widgets.worker import BotWorker
+from widgets.common import ScriptController, SettingsManager, auto_detect_region, CommonUI
 
 class PortPage(QtWidgets.QWidget):
     statusChanged = QtCore.pyqtSignal(bool)
@@ -27,9 +29,11 @@ class PortPage(QtWidgets.QWidget):
 
         hotkey_layout, self.hotkey_input = CommonUI.create_hotkey_input(default="f5", description="— вкл/выкл автонажатие Shift+W")
         self.counter_label = CommonUI.create_counter()
+        self.metrics_label = CommonUI.create_metrics_label()
 
         settings_layout.addLayout(hotkey_layout)
         settings_layout.addWidget(self.counter_label)
+        settings_layout.addWidget(self.metrics_label)
 
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
@@ -52,70 +56,60 @@ class PortPage(QtWidgets.QWidget):
             worker_factory=lambda: PortWorker(self.hotkey_input.text()),
             log_output=self.log_output,
             extra_signals={
-                "counter_signal": self._update_counter
+                "counter_signal": self._update_counter,
+                "metrics_signal": self.metrics_label.update_metrics
             }
         )
 
     def _update_counter(self, value: int):
         self.counter_label.setText(f"Счётчик: {value}")
 
-class PortWorker(QtCore.QThread):
-    log_signal = QtCore.pyqtSignal(str)
+class PortWorker(BotWorker):
     counter_signal = QtCore.pyqtSignal(int)
 
-    GREEN = (126, 211, 33)
-    RED = (231, 33, 57)
-    TOLERANCE = 20
-    STEP_X = 4
-    STEP_Y = 10
-    SEARCH_DELAY = 0.01
+    MAX_FPS = 100
+    IDLE_FPS = 20
 
-    def __init__(self, hotkey: str = "f5"):
+    def __init__(self, hotkey: str = "f5", source=None):
         super().__init__()
-        self.running = True
         self._count = 0
         self._move_enabled = False
         self._toggle_requested = False
         self.hotkey = hotkey or "f5"
-        self.monitor = auto_detect_region()
-        self._stop = threading.Event()
-        self.keyboard_controller = Controller()
-
-        keyboard.add_hotkey(self.hotkey, self._request_toggle_move)
-
-    def log(self, message: str):
-        CommonLogger.log(message, self.log_signal)
-
-    def stop(self):
-        keyboard.unhook_all_hotkeys()
-        if self._move_enabled:
-            keyboard.release("shift")
-            keyboard.release("w")
-            self._move_enabled = False
-            self.log("[■] Движение отключено (Shift+W отпущены)")
+        self.monitor = auto_detect_region(**PortDetector.REGION)
+        self.detector = PortDetector()
+        self.source = source or CaptureService()
+        self.focus = FocusWatcher()
+        self.pacer = Pacer(self.MAX_FPS, self.IDLE_FPS, stop_event=self._stop)
+        self.metrics.track(self.pacer)
 
     def _request_toggle_move(self):
         self._toggle_requested = True
 
-    @staticmethod
-    def _is_color_close(c1: tuple[int, int, int], c2: tuple[int, int, int], tol: int) -> bool:
-        return all(abs(a - b) <= tol for a, b in zip(c1, c2))
+    def _set_move(self, enabled: bool):
+        self._move_enabled = enabled
+        if enabled:
+            self.hold("shift", "w")
+            self.log("[→] Движение включено (Shift+W зажаты)")
+        else:
+            self.release("shift", "w")
+            self.log("[■] Движение отключено (Shift+W отпущены)")
 
-    def run(self):
+    def work(self):
         self.log("[→] Скрипт порта запущен.")
         rage_window_missing = True
+        roi = self.subscribe(self.monitor)
+        self.watch_focus()
+        self.add_hotkey(self.hotkey, self._request_toggle_move)
         try:
             while self.running:
-                if not CommonLogger.is_rage_mp_active():
+                if not self.focus.active:
                     if self._move_enabled:
-                        keyboard.release("shift")
-                        keyboard.release("w")
-                        self._move_enabled = False
-                        self.log("[■] Движение отключено (Shift+W отпущены)")
+                        self._set_move(False)
                     if rage_window_missing:
                         self.log("Окно RAGE Multiplayer не активно. Ожидание...")
                         rage_window_missing = False
-                    self._stop.wait(1)
+                    self.pause(FocusWatcher.POLL_INTERVAL)
                     continue
 
                 if not rage_window_missing:
@@ -123,46 +117,28 @@ class PortWorker(QtCore.QThread):
                     rage_window_missing = True
 
                 if self._toggle_requested:
-                    self._move_enabled = not self._move_enabled
-                    if self._move_enabled:
-                        keyboard.press("shift")
-                        keyboard.press("w")
-                        self.log("[→] Движение включено (Shift+W зажаты)")
-                    else:
-                        keyboard.release("shift")
-                        keyboard.release("w")
-                        self.log("[■] Движение отключено (Shift+W отпущены)")
+                    self._set_move(not self._move_enabled)
                     self._toggle_requested = False
 
-                screenshot = pyautogui.screenshot(region=tuple(self.monitor.values()))
-                pixels = screenshot.load()
-                width, height = screenshot.size
-                found = False
-
-                for y in range(0, height, self.STEP_Y):
-                    for x in range(0, width, self.STEP_X):
-                        if self._is_color_close(pixels[x, y], self.RED, self.TOLERANCE):
-                            for dx in range(-10, 11):
-                                nx = x + dx
-                                if 0 <= nx < width and self._is_color_close(pixels[nx, y], self.GREEN, self.TOLERANCE):
-                                    found = True
-                                    break
-                        if found:
-                            break
-                    if found:
-                        break
+                with self.metrics.timed("capture"):
+                    image = roi.read().image
+                with self.metrics.timed("match"):
+                    found = self.detector.detect(image)
 
                 if found:
-                    self._count += 1
-                    self.log(f"[✓] Найдена мини-игра — нажимаем E (#{self._count})")
-                    self.counter_signal.emit(self._count)
-                    self.current_actions = self._count
-                    self.keyboard_controller.tap('e')
-                    self.keyboard_controller.tap('у')
-                    self._stop.wait(0.5)
-
-                self._stop.wait(self.SEARCH_DELAY)
-
-        except Exception as exc:
-            self.log(f"[Ошибка потока] {exc}")
-            self.stop()
+                    with span("decision"):
+                        self.metrics.detected()
+                        self._count += 1
+                        self.log(f"[✓] Найдена мини-игра — нажимаем E (#{self._count})")
+                        self.counter_signal.emit(self._count)
+                        self.current_actions = self._count
+                    with span("input"):
+                        self.tap('e')
+                    self.metrics.acted()
+                    self.pacer.sleep(0.5)
+
+                self.pacer.wait(active=found or self.detector.seen)
+                self.publish_metrics()
+        finally:
+            if self._move_enabled:
+                self._set_move(False)
@@ -1,6 +1,7 @@
 from PyQt5 import QtWidgets, QtCore
 from widgets.common import CommonLogger, ScriptController, SettingsManager, auto_detect_region, CommonUI
 from PyQt5.QtCore import QPropertyAnimation, QEasingCurve
+from widgets.theme import COLORS
 
 class SettingsPage(QtWidgets.QWidget):
     statusChanged = QtCore.pyqtSignal(bool)
@@ -54,6 +55,21 @@ class SettingsPage(QtWidgets.QWidget):
         settings_layout.addLayout(click_off_on)
         settings_layout.addWidget(self.volume_click_container)
 
+        self.reset_scale_button = QtWidgets.QPushButton("📐 Сбросить калибровку масштаба")
+        self.reset_scale_button.setCursor(QtCore.Qt.PointingHandCursor)
+        self.reset_scale_button.setStyleSheet(f"""
+            QPushButton {{
+                color: {COLORS["text"]};
+                background: {COLORS["surface"]};
+                border: 1px solid {COLORS["border"]};
+                border-radius: 4px;
+                padding: 6px;
+            }}
+            QPushButton:hover {{ background: {COLORS["surface_hover"]}; }}
+            QPushButton:pressed {{ background: {COLORS["surface_press"]}; }}
+        """)
+        settings_layout.addWidget(self.reset_scale_button)
+
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
 
@@ -65,6 +81,7 @@ class SettingsPage(QtWidgets.QWidget):
         self.switch_click.clicked.connect(self.handle_toggle)
         self.volume_hover.valueChanged.connect(self.handle_toggle_slider)
         self.volume_click.valueChanged.connect(self.handle_toggle_slider)
+        self.reset_scale_button.clicked.connect(self.reset_scale_calibration)
 
     def handle_toggle(self):
         self._save_settings()
@@ -80,6 +97,11 @@ class SettingsPage(QtWidgets.QWidget):
         self.switch_hover.setChecked(hover_state)
         self.switch_click.setChecked(click_state)
 
+    def reset_scale_calibration(self):
+        from widgets.templates import ScaleCalibrator
+        self.settings.clear_section(ScaleCalibrator.SECTION)
+        self.reset_scale_button.setText("✔ Калибровка сброшена — перезапустите модули")
+
     def handle_toggle_slider(self):
         self.settings.save_group("settings", {
             "volume_hover": self.volume_hover_get(),
@@ -1,9 +1,13 @@
 from PyQt5 import QtWidgets, QtCore
-from widgets.common import CommonLogger, ScriptController, load_images, CommonUI, SettingsManager
-from pynput.keyboard import Controller
-import time
-import threading
-import keyboard
+from widgets.common import CommonLogger, ScriptController, load_images, CommonUI, SettingsManager, auto_detect_region
+from widgets.capture import CaptureService, FrameGate, FULL_SCREEN
+from widgets.locator import Locator
+from widgets.pacing import Pacer
+from widgets.templates import ScaleCalibrator
+import pyautogui
+from widgets.focus import FocusWatcher
+from widgets.tracing import span
+from widgets.worker import BotWorker
 
 class StroykaPage(QtWidgets.QWidget):
     statusChanged = QtCore.pyqtSignal(bool)
@@ -27,9 +31,11 @@ class StroykaPage(QtWidgets.QWidget):
         settings_group, settings_layout = CommonUI.create_settings_group()
         hotkey_layout, self.hotkey_input = CommonUI.create_hotkey_input(default="f5", description="— вкл/выкл автонажатие Shift+W")
         self.counter = CommonUI.create_counter()
+        self.metrics_label = CommonUI.create_metrics_label()
 
         settings_layout.addLayout(hotkey_layout)
         settings_layout.addWidget(self.counter)
+        settings_layout.addWidget(self.metrics_label)
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
         layout.addStretch()
@@ -48,7 +54,8 @@ class StroykaPage(QtWidgets.QWidget):
         self._save_settings()
         worker_factory = lambda: StroykaWorker(self.hotkey_input.text())
         extra_signals = {
-            "counter_signal": self._update_counter
+            "counter_signal": self._update_counter,
+            "metrics_signal": self.metrics_label.update_metrics
         }
         ScriptController.toggle_script(
             widget=self,
@@ -60,64 +67,79 @@ class StroykaPage(QtWidgets.QWidget):
     def _update_counter(self, value: int):
         self.counter.setText(f"Счётчик: {value}")
 
-class StroykaWorker(QtCore.QThread):
-    log_signal = QtCore.pyqtSignal(str)
+class StroykaWorker(BotWorker):
     counter_signal = QtCore.pyqtSignal(int)
     CONFIDENCE = 0.95
+    MAX_FPS = 100
+    IDLE_FPS = 10
 
-    def __init__(self, hotkey: str = "f5"):
+    def __init__(self, hotkey: str = "f5", source=None):
         super().__init__()
-        self.running = False
         self.count = 0
         self.current_actions = 0
         self.img_key = load_images("stroyka", mapping={
-            "image1.png": {"en": "e", "ru": "у"},
-            "image2.png": {"en": "y", "ru": "н"},
-            "image3.png": {"en": "f", "ru": "а"},
-            "image4.png": {"en": "h", "ru": "р"},
+            "image1.png": "e",
+            "image2.png": "y",
+            "image3.png": "f",
+            "image4.png": "h",
         })
-        self._stop = threading.Event()
+        self.focus = FocusWatcher()
+        self.pacer = Pacer(self.MAX_FPS, self.IDLE_FPS, stop_event=self._stop)
         self._shown = {p: False for p in self.img_key}
         self._visible = {p: False for p in self.img_key}
-        self.keyboard_controller = Controller()
-        self.detection_cache = {}
+        self.locator = Locator.from_files(list(self.img_key), self.CONFIDENCE)
+        self.calibrator = ScaleCalibrator("stroyka", list(self.locator.templates.values()), pyautogui.size(), SettingsManager(), self._stop,
+                                          self.CONFIDENCE)
+        self.locator.rescale(self.calibrator.scale)
+        self.screen = auto_detect_region(**FULL_SCREEN)
+        self.source = source or CaptureService()
+        self.gate = FrameGate()
+        self.metrics.track(self.gate, self.pacer)
+        self.roi = None
         self._toggle_requested = False
         self._move_enabled = False
         self.hotkey = hotkey or "f5"
 
-        keyboard.add_hotkey(self.hotkey, self._request_toggle_move)
-
-    def log(self, message: str):
-        self.log_signal.emit(message)
-
     def _request_toggle_move(self):
         self._toggle_requested = True
 
+    def _set_move(self, enabled: bool):
+        self._move_enabled = enabled
+        if enabled:
+            self.hold("shift", "w")
+            self.log("[→] Движение включено (Shift+W зажаты)")
+        else:
+            self.release("shift", "w")
+            self.log("[■] Движение отключено (Shift+W отпущены)")
+
+    def _locate(self, image, keys=None):
+        return CommonLogger.safe_locate(self.locator, image, self.roi.region, keys, self.log_signal)
+
+    def detect(self, keys=None):
+        with self.metrics.timed("capture"):
+            image = self.roi.read().image
+        with self.metrics.timed("match"):
+            return self._locate(image, keys)
+
     def safe_locate(self, path: str):
-        current_time = time.time()
-        if path in self.detection_cache and current_time - self.detection_cache[path]['time'] < 0.1:
-            return self.detection_cache[path]['result']
-        
-        result = CommonLogger.safe_locate(path, self.CONFIDENCE, self.log_signal)
-        self.detection_cache[path] = {'result': result, 'time': current_time}
-        return result
-
-    def run(self):
-        self.running = True
+        return self.detect((path,)).get(path)
+
+    def work(self):
         self.log("Поиск начат.")
         rage_window_missing = True
+        self.on_teardown(self.calibrator.close)
+        self.roi = self.subscribe(self.screen)
+        self.watch_focus()
+        self.add_hotkey(self.hotkey, self._request_toggle_move)
         try:
             while self.running:
-                if not CommonLogger.is_rage_mp_active():
+                if not self.focus.active:
                     if self._move_enabled:
-                        keyboard.release("shift")
-                        keyboard.release("w")
-                        self._move_enabled = False
-                        self.log("[■] Движение отключено (Shift+W отпущены)")
+                        self._set_move(False)
                     if rage_window_missing:
                         self.log("Окно RAGE Multiplayer не активно. Ожидание...")
                         rage_window_missing = False
-                    self._stop.wait(1)
+                    self.pause(FocusWatcher.POLL_INTERVAL)
                     continue
 
                 if not rage_window_missing:
@@ -125,48 +147,45 @@ class StroykaWorker(QtCore.QThread):
                     rage_window_missing = True
 
                 if self._toggle_requested:
-                    self._move_enabled = not self._move_enabled
-                    if self._move_enabled:
-                        keyboard.press("shift")
-                        keyboard.press("w")
-                        self.log("[→] Движение включено (Shift+W зажаты)")
-                    else:
-                        keyboard.release("shift")
-                        keyboard.release("w")
-                        self.log("[■] Движение отключено (Shift+W отпущены)")
+                    self._set_move(not self._move_enabled)
                     self._toggle_requested = False
-                start_time = time.time()
-                for path, keys in self.img_key.items():
-                    if self.safe_locate(path):
-                        self._handle_visible_image(path, keys)
+                with self.metrics.timed("capture"):
+                    image = self.roi.read().image
+                with self.metrics.timed("match"):
+                    hits = self.gate.run(image, self._locate)
+                if self.calibrator.apply(self.locator, image, any(hits.values())):
+                    self.gate.reset()
+                for path, key in self.img_key.items():
+                    if hits.get(path):
+                        self.metrics.detected()
+                        self._handle_visible_image(path, key)
                         break
-                
-                elapsed = time.time() - start_time
-                if elapsed < 0.02:
-                    self._stop.wait(0.01)
+
+                self.pacer.wait(active=any(hits.values()))
+                self.publish_metrics()
         except Exception as e:
             self.log(f"[Критическая ошибка]\n{str(e)}")
         finally:
-            self.running = False
+            if self._move_enabled:
+                self._set_move(False)
+            self.log(f"[i] {self.gate.summary()}")
 
-    def _handle_visible_image(self, path: str, keys: dict):
+    def _handle_visible_image(self, path: str, key: str):
         if not self._visible[path]:
             self._visible[path] = True
             self._shown[path] = False
             self.count += 1
             self.counter_signal.emit(self.count)
-            self.log(f"[✓] Найдено → спам '{keys['en']}' и '{keys['ru']}'")
+            self.log(f"[✓] Найдено → спам '{key}'")
             
             self.current_actions = self.count
 
-        press_count = 0
         max_presses = 45
-        while self.running and press_count < max_presses:
-            self.keyboard_controller.tap(keys['en'])
-            self.keyboard_controller.tap(keys['ru'])
-            press_count += 1
-            if press_count % 5 == 0:
-                self._stop.wait(0.001)
+        with span("input", presses=max_presses):
+            done = self.tap(key, max_presses)
+            while self.running and not done.wait(0.05):
+                pass
+        self.metrics.acted(max_presses)
 
 
         if not self.safe_locate(path):
@@ -0,0 +1,198 @@
+import cv2
+import numpy as np
+import pytest
+
+from widgets.detectors import GymDetector, ShveikaDetector
+
+WIDTH, HEIGHT = 160, 120
+TILE = 12
+SHVEIKA_REGION = {"left": 100, "top": 50}
+
+
+def found_circle_by_color(frame_bgr, lower, upper):
+    hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv, lower, upper)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    for cnt in contours:
+        area = cv2.contourArea(cnt)
+        if area < GymDetector.MIN_AREA:
+            continue
+
+        perim = cv2.arcLength(cnt, True)
+        if perim == 0:
+            continue
+
+        return True
+    return False
+
+
+def reference(image):
+    lower, upper = GymDetector.rgb_to_hsv_bounds(GymDetector.TARGET_RGB, GymDetector.H_TOL, GymDetector.S_TOL, GymDetector.V_TOL)
+    return found_circle_by_color(cv2.cvtColor(image, cv2.COLOR_BGRA2BGR), lower, upper)
+
+
+def bgra(rgb):
+    return (rgb[2], rgb[1], rgb[0], 255)
+
+
+def noisy_frame(seed):
+    rng = np.random.default_rng(seed)
+    image = np.empty((HEIGHT, WIDTH, 4), np.uint8)
+    target = np.array(bgra(GymDetector.TARGET_RGB)[:3], np.int16)
+    near = target + rng.integers(-3, 4, (HEIGHT, WIDTH, 3))
+    image[:, :, :3] = np.clip(near, 0, 255)
+    image[:, :, 3] = rng.integers(0, 256, (HEIGHT, WIDTH))
+    return image
+
+
+def circle_frame(radius=12):
+    image = np.zeros((HEIGHT, WIDTH, 4), np.uint8)
+    cv2.circle(image, (WIDTH // 2, HEIGHT // 2), radius, bgra(GymDetector.TARGET_RGB), -1)
+    return image
+
+
+def frames():
+    tiny = circle_frame(radius=2)
+    shifted = np.zeros((HEIGHT, WIDTH, 4), np.uint8)
+    shifted[:] = bgra((121, 255, 166))
+    blob = np.zeros((HEIGHT, WIDTH, 4), np.uint8)
+    cv2.rectangle(blob, (10, 10), (90, 14), bgra(GymDetector.TARGET_RGB), -1)
+    return {
+        "circle": circle_frame(),
+        "empty": np.zeros((HEIGHT, WIDTH, 4), np.uint8),
+        "tiny": tiny,
+        "near_miss": shifted,
+        "blob": blob,
+        "noise": noisy_frame(1),
+        "noise_circle": cv2.circle(noisy_frame(2), (40, 40), 10, bgra(GymDetector.TARGET_RGB), -1),
+    }
+
+
+@pytest.fixture
+def detector():
+    detector = GymDetector()
+    assert detector.runs is not None
+    return detector
+
+
+@pytest.mark.parametrize("name", sorted(frames()))
+def test_fast_path_matches_reference(detector, name):
+    image = frames()[name]
+    assert detector.detect(image) == reference(image)
+
+
+@pytest.mark.parametrize("name", sorted(frames()))
+def test_fast_path_matches_reference_on_cropped_views(detector, name):
+    image = frames()[name]
+    for view in (image[:, 10:-10], image[5:-5, 20:], image[::2, ::2]):
+        assert not view.flags["C_CONTIGUOUS"]
+        assert detector.detect(view) == reference(view)
+
+
+def test_expected_outcomes(detector):
+    cases = frames()
+    assert detector.detect(cases["circle"])
+    assert detector.detect(cases["circle"][:, 10:-10])
+    assert not detector.detect(cases["empty"])
+    assert not detector.detect(cases["near_miss"])
+
+
+def test_bgr_frames_take_the_reference_path(detector):
+    image = circle_frame()
+    assert detector.detect(np.ascontiguousarray(image[:, :, :3])) == reference(image)
+
+
+def shveika_templates():
+    rng = np.random.default_rng(3)
+    return [rng.integers(0, 256, (TILE, TILE, 3), dtype=np.uint8) for _ in range(20)]
+
+
+def grid(step, origin=(10, 10)):
+    return [(origin[0] + (i % 5) * step, origin[1] + (i // 5) * step) for i in range(20)]
+
+
+def shveika_frame(templates, positions, missing=()):
+    image = np.zeros((200, 260, 4), np.uint8)
+    image[:, :, :3] = np.random.default_rng(4).integers(0, 64, (200, 260, 3), dtype=np.uint8)
+    image[:, :, 3] = 255
+    for i, (templ, (x, y)) in enumerate(zip(templates, positions)):
+        if i not in missing:
+            image[y:y + TILE, x:x + TILE, :3] = templ
+    return image
+
+
+def centers(positions):
+    return [(x + TILE // 2 + SHVEIKA_REGION["left"], y + TILE // 2 + SHVEIKA_REGION["top"]) for x, y in positions]
+
+
+@pytest.fixture
+def shveika():
+    saved = []
+    detector = ShveikaDetector(shveika_templates(), on_layout=saved.append)
+    return detector, saved
+
+
+def test_shveika_learns_layout_from_full_match(shveika):
+    detector, saved = shveika
+    positions = grid(30)
+    coords = detector.detect(shveika_frame(detector.templates, positions), SHVEIKA_REGION)
+    assert coords == centers(positions)
+    sx, sy = coords[0]
+    assert detector.layout == [[x - sx, y - sy] for x, y in coords]
+    assert saved == [detector.layout]
+
+
+def test_shveika_predicts_from_saved_layout(monkeypatch, shveika):
+    detector, saved = shveika
+    detector.detect(shveika_frame(detector.templates, grid(30)), SHVEIKA_REGION)
+    layout = detector.layout
+    restored = ShveikaDetector(shveika_templates(), layout=layout, on_layout=saved.append)
+
+    def full_search(*args, **kwargs):
+        raise AssertionError("полный поиск при сохранённой раскладке")
+    monkeypatch.setattr(restored, "locate_all", full_search)
+
+    positions = grid(30, origin=(40, 25))
+    assert restored.detect(shveika_frame(restored.templates, positions), SHVEIKA_REGION) == centers(positions)
+    assert restored.layout == layout
+    assert len(saved) == 1
+
+
+def test_shveika_relearns_stale_layout(shveika):
+    detector, saved = shveika
+    detector.detect(shveika_frame(detector.templates, grid(30)), SHVEIKA_REGION)
+    old = detector.layout
+    positions = grid(36)
+    image = shveika_frame(detector.templates, positions)
+    for _ in range(ShveikaDetector.RELEARN_AFTER - 1):
+        coords = detector.detect(image, SHVEIKA_REGION)
+        assert not all(coords)
+        assert detector.layout == old
+    assert detector.detect(image, SHVEIKA_REGION) == centers(positions)
+    assert detector.layout != old
+    assert saved == [old, detector.layout]
+    assert detector.detect(image, SHVEIKA_REGION) == centers(positions)
+
+
+def test_shveika_partial_match_keeps_saved_layout(shveika):
+    detector, saved = shveika
+    image = shveika_frame(detector.templates, grid(30), missing=(7,))
+    coords = detector.detect(image, SHVEIKA_REGION)
+    assert coords[7] is None and coords[0] is not None
+    assert detector.layout is None
+    assert not saved
+
+    detector.detect(shveika_frame(detector.templates, grid(30)), SHVEIKA_REGION)
+    layout = list(detector.layout)
+    for _ in range(ShveikaDetector.RELEARN_AFTER + 1):
+        coords = detector.detect(image, SHVEIKA_REGION)
+        assert coords[7] is None
+    assert detector.layout == layout
+    assert saved == [layout]
+
+
+def test_shveika_without_sentinel_returns_none(shveika):
+    detector, saved = shveika
+    assert detector.detect(shveika_frame(detector.templates, grid(30), missing=(0,)), SHVEIKA_REGION) is None
+    assert not saved
@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("keyboard")
+
+from widgets.input import UNKNOWN_LAYOUT, candidates
+
+
+@pytest.mark.parametrize("layout, key, expected", [
+    ("en", "e", ("e",)),
+    ("ru", "e", ("у",)),
+    ("uk", "e", ("у",)),
+    ("be", "e", ("у",)),
+    ("uk", "s", ("і",)),
+    ("be", "o", ("ў",)),
+    ("ru", "K", ("Л",)),
+])
+def test_known_layouts_send_one_character(layout, key, expected):
+    assert candidates(key, layout) == expected
+
+
+def test_unknown_layout_sends_latin_and_cyrillic():
+    assert candidates("e", UNKNOWN_LAYOUT) == ("e", "у")
+    assert candidates("1", UNKNOWN_LAYOUT) == ("1",)
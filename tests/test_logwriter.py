@@ -0,0 +1,68 @@
+import atexit
+import os
+
+import pytest
+
+from widgets.logwriter import LogWriter
+
+MAX_BYTES = 120
+
+
+@pytest.fixture
+def writer(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(LogWriter, "_instance", None)
+    monkeypatch.setattr(LogWriter, "MAX_BYTES", MAX_BYTES)
+    monkeypatch.setattr(LogWriter, "BACKUPS", 2)
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    writer = LogWriter()
+    writer.registered = registered
+    yield writer
+    writer.close()
+
+
+def read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_rotation_keeps_files_under_limit(writer, monkeypatch):
+    monkeypatch.setattr(LogWriter, "BATCH_SIZE", 1)
+    lines = [f"строка {i:03d}" for i in range(60)]
+    for line in lines:
+        writer.write(line)
+    assert writer.flush()
+
+    files = ["logs.txt.2", "logs.txt.1", "logs.txt"]
+    assert sorted(os.listdir(".")) == sorted(files)
+    for path in files:
+        assert 0 < os.path.getsize(path) <= MAX_BYTES
+    kept = [line for path in files for line in read_lines(path)]
+    assert kept == lines[-len(kept):]
+    assert writer.written == len(lines)
+
+
+def test_close_flushes_pending_lines(writer, monkeypatch):
+    monkeypatch.setattr(LogWriter, "FLUSH_INTERVAL", 60.0)
+    lines = [f"line {i}" for i in range(5)]
+    for line in lines:
+        writer.write(line)
+    writer.write("other", "other.txt")
+
+    assert writer.registered == [writer.close]
+    for callback in writer.registered:
+        callback()
+
+    assert read_lines("logs.txt") == lines
+    assert read_lines("other.txt") == ["other"]
+    assert writer._thread is None and not writer._files
+
+
+def test_write_after_close_restarts_writer(writer):
+    writer.write("first")
+    writer.close()
+    writer.write("second")
+    assert writer.flush()
+
+    assert read_lines("logs.txt") == ["first", "second"]
@@ -0,0 +1,33 @@
+import pytest
+from PyQt5 import QtCore
+
+pytest.importorskip("PyQt5.QtMultimedia", exc_type=ImportError)
+
+from widgets.module_button import ModuleButton
+
+
+@pytest.fixture
+def cache(qapp, monkeypatch):
+    monkeypatch.setattr(ModuleButton, "_chrome_cache", {})
+    monkeypatch.setattr(ModuleButton, "CHROME_CACHE_SIZE", 6)
+    return ModuleButton._chrome_cache
+
+
+def test_chrome_is_cached_per_size_and_state(cache):
+    size = QtCore.QSize(200, 87)
+    first = ModuleButton.chrome(size, "normal", 1.0)
+    assert ModuleButton.chrome(QtCore.QSize(200, 87), "normal", 1.0) is first
+    assert ModuleButton.chrome(size, "hover", 1.0) is not first
+    assert len(cache) == 2
+
+
+def test_resizing_keeps_cache_bounded(cache):
+    kept = ModuleButton.chrome(QtCore.QSize(200, 87), "normal", 1.0)
+    for width in range(201, 260):
+        for state in ModuleButton.STATES:
+            ModuleButton.chrome(QtCore.QSize(width, 87), state, 1.0)
+        assert ModuleButton.chrome(QtCore.QSize(200, 87), "normal", 1.0) is kept
+        assert len(cache) <= ModuleButton.CHROME_CACHE_SIZE
+
+    assert (259, 87, "pressed", 1.0) in cache
+    assert (201, 87, "normal", 1.0) not in cache
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from widgets.capture import Frame
+from widgets.recorder import FrameRecorder, Recording, ReplayFinished, ReplaySource
+
+REGION = {"left": 100, "top": 50, "width": 32, "height": 24}
+FRAMES = 12
+
+
+def make_frames(count=FRAMES):
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 256, (REGION["height"], REGION["width"], 4), dtype=np.uint8) for _ in range(count)]
+    if count > 3:
+        images[3] = images[2].copy()
+    return [Frame(index, 10.0 + index * 0.05, image) for index, image in enumerate(images)]
+
+
+def record(path, frames, region=REGION):
+    with FrameRecorder(str(path)) as recorder:
+        for frame in frames:
+            recorder(frame, region)
+    assert recorder.dropped == 0
+    assert recorder.frames == len(frames)
+    return str(path)
+
+
+def test_replay_round_trip(tmp_path):
+    frames = make_frames()
+    sub = ReplaySource(record(tmp_path / "rec", frames)).subscribe(REGION)
+
+    for expected in frames:
+        frame = sub.read()
+        assert frame.index == expected.index
+        assert frame.timestamp == expected.timestamp
+        np.testing.assert_array_equal(frame.image, expected.image)
+
+    with pytest.raises(ReplayFinished):
+        sub.read()
+
+
+def test_duplicate_frames_are_stored_once(tmp_path):
+    frames = make_frames()
+    recording = Recording(record(tmp_path / "rec", frames))
+    assert len(recording) == FRAMES
+    assert len(recording.segments[0][1]) == FRAMES - 1
+
+
+def test_replay_crops_to_subscriber_region(tmp_path):
+    frames = make_frames()
+    region = {"left": REGION["left"] + 4, "top": REGION["top"] + 2, "width": 10, "height": 8}
+    sub = ReplaySource(record(tmp_path / "rec", frames)).subscribe(region)
+
+    for expected in frames:
+        np.testing.assert_array_equal(sub.read().image, expected.image[2:10, 4:14])
+    with pytest.raises(ReplayFinished):
+        sub.read()
+
+
+def test_replay_loops_back_to_start(tmp_path):
+    frames = make_frames(3)
+    sub = ReplaySource(record(tmp_path / "rec", frames), loop=True).subscribe(REGION)
+
+    assert [sub.read().index for _ in range(7)] == [0, 1, 2, 0, 1, 2, 0]
+
+
+def test_replay_skips_segments_outside_region(tmp_path):
+    other = dict(REGION, left=0)
+    frames = make_frames(6)
+    with FrameRecorder(str(tmp_path / "rec")) as recorder:
+        for frame in frames:
+            recorder(frame, REGION if frame.index % 2 else other)
+    sub = ReplaySource(str(tmp_path / "rec")).subscribe(REGION)
+
+    for expected in frames[1::2]:
+        frame = sub.read()
+        assert frame.index == expected.index
+        np.testing.assert_array_equal(frame.image, expected.image)
+    with pytest.raises(ReplayFinished):
+        sub.read()
@@ -0,0 +1,111 @@
+import atexit
+import json
+import os
+import time
+
+import pytest
+
+from widgets.settings_manager import SettingsManager
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(SettingsManager, "_instance", None)
+    monkeypatch.setattr(SettingsManager, "SAVE_DELAY", 0.1)
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    writes = []
+    replace = os.replace
+
+    def counting_replace(src, dst):
+        writes.append(dst)
+        replace(src, dst)
+    monkeypatch.setattr(os, "replace", counting_replace)
+
+    manager = SettingsManager()
+    manager.registered = registered
+    manager.writes = writes
+    yield manager
+    manager.flush()
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_quick_sets_are_written_once(manager):
+    for value in range(20):
+        manager.set("gym", "delay", value)
+    manager.set("port", "hotkey", "f6")
+    manager.save_group("gym", {"food": "k", "delay": 19})
+
+    assert not manager.writes
+    assert wait_for(lambda: manager.writes)
+    time.sleep(SettingsManager.SAVE_DELAY * 2)
+    assert manager.writes == ["settings.json"]
+    assert read("settings.json") == {"gym": {"delay": 19, "food": "k"}, "port": {"hotkey": "f6"}}
+
+
+def test_unchanged_values_do_not_schedule_a_write(manager):
+    manager.set("gym", "delay", 1)
+    manager.flush()
+    manager.set("gym", "delay", 1)
+    manager.save_group("gym", {"delay": 1})
+
+    assert manager._timer is None
+    manager.flush()
+    assert manager.writes == ["settings.json"]
+
+
+def test_write_replaces_file_atomically(manager):
+    manager.set("gym", "delay", 1)
+    manager.flush()
+    manager.set("gym", "delay", 2)
+    manager.flush()
+
+    assert read("settings.json") == {"gym": {"delay": 2}}
+    assert not os.path.exists("settings.json.tmp")
+    assert manager.writes == ["settings.json", "settings.json"]
+
+
+def test_failed_replace_keeps_previous_file(manager, monkeypatch):
+    manager.set("gym", "delay", 1)
+    manager.flush()
+
+    def broken_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", broken_replace)
+    manager.set("gym", "delay", 2)
+    manager.flush()
+
+    assert read("settings.json") == {"gym": {"delay": 1}}
+    assert manager._dirty
+
+
+def test_pending_changes_are_flushed_at_exit(manager):
+    assert manager.registered == [manager.flush]
+    manager.set("gym", "delay", 5)
+    assert not os.path.exists("settings.json")
+
+    for callback in manager.registered:
+        callback()
+
+    assert read("settings.json") == {"gym": {"delay": 5}}
+    assert manager._timer is None
+
+
+def test_saved_settings_are_loaded(manager, monkeypatch):
+    manager.set("gym", "delay", 7)
+    manager.flush()
+    monkeypatch.setattr(SettingsManager, "_instance", None)
+
+    assert SettingsManager().get("gym", "delay") == 7
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from PyQt5 import QtCore
+
+keyboard = pytest.importorskip("keyboard")
+
+from widgets.capture import CaptureService, Frame
+from widgets.common import auto_detect_region
+from widgets.detectors import GymDetector, PortDetector
+from widgets.focus import FakeFocusBackend, FocusWatcher
+from widgets.input import FixedLayoutBackend, InputDispatcher
+from widgets.recorder import FrameRecorder, ReplaySource
+from widgets.worker import BotWorker
+
+TOGGLES = 100
+
+
+class FakeKeyboard:
+    def __init__(self):
+        self.hooks = {}
+        self.held = set()
+        self._next = 0
+
+    def add_hotkey(self, hotkey, callback):
+        self._next += 1
+        self.hooks[self._next] = hotkey
+        return self._next
+
+    def remove_hotkey(self, handle):
+        del self.hooks[handle]
+
+    def press(self, key):
+        self.held.add(key)
+
+    def release(self, key):
+        self.held.discard(key)
+
+
+class FakeController:
+    def __init__(self):
+        self.sent = []
+
+    def tap(self, key):
+        self.sent.append(key)
+
+
+@pytest.fixture
+def fake_keyboard(monkeypatch):
+    fake = FakeKeyboard()
+    for name in ("add_hotkey", "remove_hotkey", "press", "release"):
+        monkeypatch.setattr(keyboard, name, getattr(fake, name))
+    return fake
+
+
+@pytest.fixture
+def make_replay(tmp_path):
+    def make(region):
+        path = str(tmp_path / "recording")
+        image = np.zeros((region["height"], region["width"], 4), np.uint8)
+        with FrameRecorder(path) as recorder:
+            for index in range(2):
+                recorder(Frame(index, float(index), image), region)
+        return ReplaySource(path, loop=True)
+    return make
+
+
+@pytest.fixture
+def environment(qapp, monkeypatch, tmp_path, fake_keyboard):
+    monkeypatch.chdir(tmp_path)
+    FocusWatcher().set_backend(FakeFocusBackend("RAGE Multiplayer"))
+    dispatcher = InputDispatcher()
+    dispatcher.set_backend(FixedLayoutBackend("en"))
+    dispatcher.set_controller(FakeController())
+    return fake_keyboard
+
+
+def start(worker, errors):
+    def collect(text):
+        if "Ошибка" in text:
+            errors.append(text)
+    worker.log_signal.connect(collect, QtCore.Qt.DirectConnection)
+    worker.start()
+    return worker
+
+
+def assert_released(fake_keyboard):
+    assert not BotWorker._live
+    assert not fake_keyboard.hooks
+    assert not fake_keyboard.held
+    assert not CaptureService()._subs
+    assert FocusWatcher()._users == 0
+    assert InputDispatcher()._users == 0
+
+
+def test_worker_is_abstract():
+    with pytest.raises(TypeError):
+        BotWorker()
+
+
+def test_port_worker_toggles_leave_nothing_behind(environment, make_replay):
+    from pages.port_page import PortWorker
+
+    replay = make_replay(auto_detect_region(**PortDetector.REGION))
+    errors = []
+    for index in range(TOGGLES):
+        worker = start(PortWorker(source=replay), errors)
+        if index == 0:
+            worker._request_toggle_move()
+            worker.msleep(300)
+            assert environment.held == {"shift", "w"}
+        assert worker.shutdown()
+    assert not errors
+    assert_released(environment)
+
+
+def test_gym_worker_toggles_leave_nothing_behind(environment, make_replay):
+    from pages.gym_page import GymWorker
+
+    region = auto_detect_region(**GymDetector.REGION)
+    replay = make_replay(region)
+    errors = []
+    for _ in range(TOGGLES):
+        assert start(GymWorker(region, source=replay), errors).shutdown()
+    assert not errors
+    assert_released(environment)
@@ -1,18 +1,22 @@
-from .theme import COLORS
-from .module_button import ModuleButton
-from .titlebar import TitleBar
-from .status_dot import StatusPulseDot
-from .switch_button import SwitchButton
-from .modern_window import ModernWindow
-from .common import CommonLogger, ScriptController
+import importlib
 
-__all__ = [
-    "COLORS",
-    "ModernWindow",
-    "ModuleButton",
-    "TitleBar",
-    "StatusPulseDot",
-    "SwitchButton",
-    "CommonLogger",
-    "ScriptController",
-]
\ No newline at end of file
+_EXPORTS = {
+    "COLORS": ".theme",
+    "ModernWindow": ".modern_window",
+    "ModuleButton": ".module_button",
+    "TitleBar": ".titlebar",
+    "StatusPulseDot": ".status_dot",
+    "SwitchButton": ".switch_button",
+    "CommonLogger": ".common",
+    "ScriptController": ".common",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,302 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, NamedTuple, Optional
+import cv2
+import numpy as np
+import mss
+from widgets.tracing import span
+
+
+FULL_SCREEN = {"width_ratio": 1.0, "height_ratio": 1.0, "top_ratio": 0.0}
+
+
+class Frame(NamedTuple):
+    index: int
+    timestamp: float
+    image: np.ndarray
+
+
+def screen_region(screen_size, width_ratio=None, height_ratio=None, top_ratio=None, reference_height=None, reference_top=None) -> Dict[str, int]:
+    screen_width, screen_height = screen_size
+
+    if width_ratio is None:
+        width_ratio = 0.5
+    if height_ratio is None:
+        height_ratio = 0.7
+    if top_ratio is None:
+        top_ratio = 0.25
+
+    if reference_height is not None and reference_top is not None:
+        top_ratio = reference_top / reference_height
+
+    region_width = int(screen_width * width_ratio)
+    region_height = int(screen_height * height_ratio)
+
+    return {
+        "left": int((screen_width - region_width) / 2),
+        "top": int(screen_height * top_ratio),
+        "width": region_width,
+        "height": region_height,
+    }
+
+
+def union_region(regions) -> Optional[Dict[str, int]]:
+    regions = list(regions)
+    if not regions:
+        return None
+    left = min(r["left"] for r in regions)
+    top = min(r["top"] for r in regions)
+    right = max(r["left"] + r["width"] for r in regions)
+    bottom = max(r["top"] + r["height"] for r in regions)
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+
+def region_contains(outer: Dict[str, int], inner: Dict[str, int]) -> bool:
+    return (
+        outer["left"] <= inner["left"]
+        and outer["top"] <= inner["top"]
+        and inner["left"] + inner["width"] <= outer["left"] + outer["width"]
+        and inner["top"] + inner["height"] <= outer["top"] + outer["height"]
+    )
+
+
+def crop_view(image: np.ndarray, image_region: Dict[str, int], region: Dict[str, int]) -> np.ndarray:
+    x = region["left"] - image_region["left"]
+    y = region["top"] - image_region["top"]
+    return image[y:y + region["height"], x:x + region["width"]]
+
+
+class FrameGate:
+    BLOCK = 8
+    THRESHOLD = 1.0
+
+    def __init__(self, block: Optional[int] = None, threshold: Optional[float] = None):
+        self.block = block or self.BLOCK
+        self.threshold = self.THRESHOLD if threshold is None else threshold
+        self.frames = 0
+        self.skipped = 0
+        self._reference = None
+        self._result = None
+
+    @property
+    def hit_rate(self) -> float:
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def signature(self, image: np.ndarray) -> np.ndarray:
+        h, w = image.shape[:2]
+        size = (max(1, w // self.block), max(1, h // self.block))
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+    def changed(self, signature: np.ndarray) -> bool:
+        if self._reference is None or self._reference.shape != signature.shape:
+            return True
+        return float(cv2.absdiff(self._reference, signature).max()) > self.threshold
+
+    def fresh(self, image: np.ndarray) -> bool:
+        self.frames += 1
+        with span("frame_gate", "cv"):
+            signature = self.signature(image)
+            changed = self.changed(signature)
+        if not changed:
+            self.skipped += 1
+            return False
+        self._reference = signature
+        return True
+
+    def run(self, image: np.ndarray, detect: Callable[[np.ndarray], Any]) -> Any:
+        if not self.fresh(image):
+            return self._result
+        try:
+            self._result = detect(image)
+        except Exception:
+            self._reference = None
+            raise
+        return self._result
+
+    def reset(self):
+        self._reference = None
+        self._result = None
+
+    def summary(self) -> str:
+        return f"кадров без изменений пропущено {self.skipped}/{self.frames} ({self.hit_rate:.0%})"
+
+
+class CaptureSubscription:
+    def __init__(self, source, region: Dict[str, int]):
+        self.source = source
+        self.region = {k: int(region[k]) for k in ("left", "top", "width", "height")}
+        self.last_index = -1
+
+    def read(self, max_age: Optional[float] = None) -> Frame:
+        frame = self.source.read(self, max_age)
+        self.last_index = frame.index
+        return frame
+
+    def crop(self, image: np.ndarray, region: Dict[str, int]) -> np.ndarray:
+        return crop_view(image, self.region, region)
+
+    def close(self):
+        self.source.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CaptureService:
+    _instance = None
+
+    RING_SIZE = 4
+    MAX_AGE = 0.005
+    READ_TIMEOUT = 2.0
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(CaptureService, cls).__new__(cls)
+            cls._instance._init_state()
+        return cls._instance
+
+    def _init_state(self):
+        self._cond = threading.Condition()
+        self._subs = []
+        self._union = None
+        self._ring = deque(maxlen=self.RING_SIZE)
+        self._ring_region = None
+        self._index = -1
+        self._pending = False
+        self._error = None
+        self._fatal = None
+        self._thread = None
+        self._thread_stop = None
+        self._listeners = []
+
+    @property
+    def union(self) -> Optional[Dict[str, int]]:
+        with self._cond:
+            return dict(self._union) if self._union else None
+
+    def add_listener(self, listener: Callable[[Frame, Dict[str, int]], None]):
+        with self._cond:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Frame, Dict[str, int]], None]):
+        with self._cond:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def subscribe(self, region: Dict[str, int]) -> CaptureSubscription:
+        sub = CaptureSubscription(self, region)
+        with self._cond:
+            self._subs.append(sub)
+            self._union = union_region(s.region for s in self._subs)
+            if self._thread is None:
+                self._fatal = None
+                self._thread_stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._thread_stop,), name="CaptureService", daemon=True)
+                self._thread.start()
+        return sub
+
+    def unsubscribe(self, sub: CaptureSubscription):
+        thread = None
+        with self._cond:
+            if sub in self._subs:
+                self._subs.remove(sub)
+            self._union = union_region(s.region for s in self._subs)
+            if not self._subs and self._thread is not None:
+                thread = self._thread
+                self._thread_stop.set()
+                self._thread = None
+                self._ring.clear()
+                self._ring_region = None
+                self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.READ_TIMEOUT)
+
+    def _usable(self, sub: CaptureSubscription, max_age: float) -> bool:
+        if not self._ring or self._index <= sub.last_index:
+            return False
+        if not region_contains(self._ring_region, sub.region):
+            return False
+        return time.perf_counter() - self._ring[-1].timestamp <= max_age
+
+    def _fresh_or_request(self, sub: CaptureSubscription) -> bool:
+        if self._error is not None or self._fatal is not None or self._usable(sub, float("inf")):
+            return True
+        if not self._pending:
+            self._pending = True
+            self._cond.notify_all()
+        return False
+
+    def read(self, sub: CaptureSubscription, max_age: Optional[float] = None) -> Frame:
+        max_age = self.MAX_AGE if max_age is None else max_age
+        with self._cond:
+            self._raise_fatal()
+            if not self._usable(sub, max_age):
+                self._pending = True
+                self._cond.notify_all()
+                if not self._cond.wait_for(lambda: self._fresh_or_request(sub), self.READ_TIMEOUT):
+                    raise TimeoutError("Захват экрана не отвечает")
+                self._raise_fatal()
+                if self._error is not None:
+                    error, self._error = self._error, None
+                    raise error
+            latest = self._ring[-1]
+            return Frame(latest.index, latest.timestamp, crop_view(latest.image, self._ring_region, sub.region))
+
+    def _raise_fatal(self):
+        if self._fatal is not None:
+            raise RuntimeError(f"Захват экрана остановлен: {self._fatal}") from self._fatal
+
+    def _run(self, stop: threading.Event):
+        try:
+            self._capture(stop)
+        except Exception as exc:
+            print(f"[CaptureService] Поток захвата остановлен: {exc}")
+            with self._cond:
+                self._fatal = exc
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                self._pending = False
+                self._cond.notify_all()
+
+    def _capture(self, stop: threading.Event):
+        with mss.mss() as sct:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._pending or stop.is_set())
+                    if stop.is_set():
+                        return
+                    region = dict(self._union)
+                try:
+                    with span("grab", "capture"):
+                        shot = sct.grab(region)
+                except Exception as exc:
+                    with self._cond:
+                        self._error = exc
+                        self._pending = False
+                        self._cond.notify_all()
+                    continue
+                image = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+                timestamp = time.perf_counter()
+                with self._cond:
+                    if stop.is_set():
+                        return
+                    if region != self._union:
+                        continue
+                    if region != self._ring_region:
+                        self._ring.clear()
+                        self._ring_region = region
+                    self._index += 1
+                    frame = Frame(self._index, timestamp, image)
+                    self._ring.append(frame)
+                    self._pending = False
+                    self._cond.notify_all()
+                    listeners = list(self._listeners)
+                for listener in listeners:
+                    try:
+                        listener(frame, region)
+                    except Exception:
+                        pass
@@ -2,40 +2,40 @@ import time
 import traceback
 import os
 import pyautogui
-from pyautogui import ImageNotFoundException
-import pygetwindow as gw
 from typing import Optional, Union, Callable, Any, Dict, List
 from PyQt5.QtCore import pyqtSignal, QRect
 from PyQt5 import QtWidgets, QtCore,QtGui
 from PyQt5.QtWidgets import QTextEdit
 import keyboard
-import json
-import types
-import cv2
-from PyQt5.QtCore import Qt, QSize, QTimer
+from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QFont, QColor
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QGridLayout, QLabel, QGraphicsDropShadowEffect, QFrame
 )
 from widgets.switch_button import SwitchButton
+from widgets.log_view import LogView
+from widgets.settings_manager import SettingsManager
+from widgets.capture import screen_region
+from widgets.focus import FocusWatcher
+from widgets.logwriter import LogWriter
+from widgets.metrics import format_metrics
+from widgets.tracing import connect_traced
+from widgets.templates import TemplateRegistry
 
 class CommonLogger:
     @staticmethod
-    def log(message: str,log_target: Optional[Union[pyqtSignal, Callable, QTextEdit]] = None,log_file: str = "logs.txt") -> str:
+    def log(message: str,log_target: Optional[Union[pyqtSignal, Callable, QTextEdit]] = None,log_file: Optional[str] = "logs.txt") -> str:
         timestamp = time.strftime("[%H:%M:%S]")
         full_message = f"{timestamp} {message}"
-        
-        try:
-            with open(log_file, "a", encoding="utf-8") as fp:
-                fp.write(full_message + "\n")
-        except OSError:
-            pass
+
+        if log_file:
+            LogWriter().write(full_message, log_file)
 
         if log_target:
             if hasattr(log_target, 'emit'): 
                 log_target.emit(message)
-            elif isinstance(log_target, QTextEdit):
+            elif isinstance(log_target, (QTextEdit, LogView)):
                 log_target.append(full_message)
             elif callable(log_target):
                 log_target(full_message)
@@ -43,55 +43,44 @@ class CommonLogger:
         return full_message
 
     @staticmethod
-    def safe_locate(path: str, confidence: float = 0.95,log_signal: Optional[Union[pyqtSignal, Callable]] = None) -> Any:
+    def safe_locate(locator, image, image_region: dict, keys=None, log_signal: Optional[Union[pyqtSignal, Callable]] = None) -> Dict[Any, Any]:
         try:
-            return pyautogui.locateOnScreen(path, confidence=confidence)
-        except ImageNotFoundException:
-            return None
-        except Exception as e:
-            CommonLogger.log(f"[Ошибка] locate {os.path.basename(path)}: {traceback.format_exc()}",log_signal)
-            return None
+            return locator.locate_all(image, image_region, keys)
+        except Exception:
+            CommonLogger.log(f"[Ошибка] locate: {traceback.format_exc()}",log_signal)
+            return {}
 
     @staticmethod
     def is_rage_mp_active() -> bool:
-        active = gw.getActiveWindow()
-        if not active:
-            return False
-            
-        replacements = {
-            "а": "a", "е": "e", "о": "o", "р": "p", "с": "c", "у": "y", "х": "x", "м": "m", "т": "t", "н": "h", "в": "b", "к": "k",
-        }
-        normalized = "".join(replacements.get(ch, ch) for ch in active.title.casefold())
-        return "multi" in normalized
+        return FocusWatcher().active
         
 class ScriptController:
     @staticmethod
     def toggle_script(widget, worker_factory, log_output, extra_signals=None, status_signal=None, worker_args=None, worker_kwargs=None):
         checked = widget.switch.isChecked()
         if checked:
+            previous = getattr(widget, "worker", None)
+            if previous is not None:
+                previous.shutdown()
             log_output.clear()
             worker_args = worker_args or ()
             worker_kwargs = worker_kwargs or {}
             widget.worker = worker_factory(*worker_args, **worker_kwargs)
 
-            def stop(self):
-                self.running = False
-                if hasattr(self, "_stop"):
-                    self._stop.set()
-            widget.worker.stop = types.MethodType(stop, widget.worker)
-            widget.worker.log_signal.connect(lambda text: CommonLogger.log(text, log_output))
+            connection = QtCore.Qt.DirectConnection if isinstance(log_output, LogView) else QtCore.Qt.AutoConnection
+            widget.worker.log_signal.connect(lambda text: CommonLogger.log(text, log_output, log_file=None), connection)
 
             if extra_signals:
                 for signal_name, slot in extra_signals.items():
                     signal = getattr(widget.worker, signal_name, None)
                     if signal:
-                        signal.connect(slot)
+                        connect_traced(signal, slot, f"{type(widget.worker).__name__}.{signal_name}")
 
             widget.worker.finished.connect(lambda: CommonLogger.log("[■] Скрипт остановлен.", log_output))
             widget.worker.start()
         else:
-            if widget.worker:
-                widget.worker.stop()
+            if widget.worker and not widget.worker.shutdown():
+                CommonLogger.log("[!] Скрипт не остановился вовремя и завершится в фоне.", log_output)
 
         if status_signal:
             status_signal.emit(checked)
@@ -125,69 +114,8 @@ class HotkeyManager:
                 pass
             self._hotkey_id = None
 
-class SettingsManager:
-    _instance = None
-
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(SettingsManager, cls).__new__(cls)
-            cls._instance.filename = "settings.json"
-            cls._instance.settings = {}
-            cls._instance.load()
-        return cls._instance
-
-    def load(self):
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, "r", encoding="utf-8") as f:
-                    self.settings = json.load(f)
-            except Exception:
-                self.settings = {}
-        else:
-            self.settings = {}
-
-    def save(self):
-        with open(self.filename, "w", encoding="utf-8") as f:
-            json.dump(self.settings, f, ensure_ascii=False, indent=4)
-
-    def get(self, section: str, key: str, default=None):
-        return self.settings.get(section, {}).get(key, default)
-
-    def set(self, section: str, key: str, value):
-        if section not in self.settings:
-            self.settings[section] = {}
-        self.settings[section][key] = value
-        self.save()
-
-    def save_group(self, section: str, values: dict):
-        if section not in self.settings:
-            self.settings[section] = {}
-        self.settings[section].update(values)
-        self.save()
-
 def auto_detect_region(width_ratio=None, height_ratio=None, top_ratio=None, reference_height=None, reference_top=None):
-    screen_width, screen_height = pyautogui.size()
-
-    if width_ratio is None:
-        width_ratio = 0.5
-    if height_ratio is None:
-        height_ratio = 0.7
-    if top_ratio is None:
-        top_ratio = 0.25
-
-    if reference_height is not None and reference_top is not None:
-        top_ratio = reference_top / reference_height
-
-    region_width = int(screen_width * width_ratio)
-    region_height = int(screen_height * height_ratio)
-
-    region = {
-        "left": int((screen_width - region_width) / 2),
-        "top": int(screen_height * top_ratio),
-        "width": region_width,
-        "height": region_height,
-    }
-    return region
+    return screen_region(pyautogui.size(), width_ratio, height_ratio, top_ratio, reference_height, reference_top)
 
 def load_images(folder: str, mapping: Dict[str, str] = None, count: int = None, as_cv2: bool = False) -> Union[Dict[str, str], Dict[str, 'np.ndarray'], List[str]]:
     base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -195,31 +123,23 @@ def load_images(folder: str, mapping: Dict[str, str] = None, count: int = None,
 
     if mapping:
         if as_cv2:
-            result = {}
-            for filename, key in mapping.items():
-                img = cv2.imread(os.path.join(folder_path, filename), cv2.IMREAD_UNCHANGED)
-                if img is None:
-                    raise FileNotFoundError(f"Файл {filename} не найден")
-                result[key] = img[:, :, :3]
-            return result
+            registry = TemplateRegistry()
+            return {key: registry.get(f"{folder}/{filename}").bgr for filename, key in mapping.items()}
         else:
             return {os.path.join(folder_path, filename): value for filename, value in mapping.items()}
 
     if count:
         if as_cv2:
-            result = []
-            for i in range(1, count + 1):
-                img = cv2.imread(os.path.join(folder_path, f"{i}.png"), cv2.IMREAD_UNCHANGED)
-                if img is None:
-                    raise FileNotFoundError(f"Файл {i}.png не найден")
-                result.append(img[:, :, :3])
-            return result
+            registry = TemplateRegistry()
+            return [registry.get(f"{folder}/{i}.png").bgr for i in range(1, count + 1)]
         else:
             return [os.path.join(folder_path, f"{i}.png") for i in range(1, count + 1)]
 
     raise ValueError("mapping count")
 
 class OverlayWindow(QWidget):
+    focus_changed = pyqtSignal(bool)
+
     def __init__(self, title="HUD", fields=None, f_keys=None, auto_monitor=True):
         super().__init__()
         self.setWindowFlags(
@@ -346,7 +266,8 @@ class OverlayWindow(QWidget):
         """)
 
         self.move_to_bottom_right()
-        self._hud_timer = None
+        self._focus = None
+        self.focus_changed.connect(self._apply_focus)
         if auto_monitor:
             self.start_monitor()
 
@@ -432,20 +353,24 @@ class OverlayWindow(QWidget):
         self.move(x, y)
 
     def start_monitor(self):
-        if self._hud_timer is not None:
+        if self._focus is not None:
             return
-        self._hud_timer = QTimer(self)
-        self._hud_timer.timeout.connect(self._check_game_focus)
-        self._hud_timer.start(1000)
+        self._focus = FocusWatcher().acquire()
+        self._focus.add_listener(self._on_focus)
+        self._apply_focus(self._focus.active)
 
     def stop_monitor(self):
-        if self._hud_timer is not None:
-            self._hud_timer.stop()
-            self._hud_timer = None
+        if self._focus is not None:
+            self._focus.remove_listener(self._on_focus)
+            self._focus.release()
+            self._focus = None
         self.close()
 
-    def _check_game_focus(self):
-        if CommonLogger.is_rage_mp_active():
+    def _on_focus(self, active: bool):
+        self.focus_changed.emit(active)
+
+    def _apply_focus(self, active: bool):
+        if active:
             if not self.isVisible():
                 self.show()
                 self.move_to_bottom_right()
@@ -527,6 +452,16 @@ class CheckWithTooltip(QtWidgets.QWidget):
     def isChecked(self) -> bool:
         return self.Check.isChecked()
     
+class MetricsLabel(QtWidgets.QLabel):
+    def __init__(self, font_size: int = 11, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet(f"color: rgba(255,255,255,0.55); font-size: {font_size}px; background: none;")
+        self.hide()
+
+    def update_metrics(self, record: dict):
+        self.setText(format_metrics(record))
+        self.show()
+
 class CommonUI:
     @staticmethod
     def create_settings_group(title: str = "", spacing: int = 10, margins=(10, 10, 10, 10)):
@@ -573,6 +508,10 @@ class CommonUI:
         label.setStyleSheet(f"color: white; font-size: {font_size}px; background: none;")
         return label
 
+    @staticmethod
+    def create_metrics_label(font_size: int = 11):
+        return MetricsLabel(font_size)
+
     @staticmethod
     def create_combo(label_text: str, items: list[str]):
         layout = QtWidgets.QHBoxLayout()
@@ -588,8 +527,7 @@ class CommonUI:
 
     @staticmethod
     def add_log_field(parent_layout):
-        log_field = QtWidgets.QTextEdit()
-        log_field.setReadOnly(True)
+        log_field = LogView()
         log_field.setObjectName("logField")
         log_field.setStyleSheet("background-color: black; color: white; font-family: monospace;")
         log_field.setMinimumHeight(100)
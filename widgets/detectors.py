@@ -0,0 +1,283 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+from widgets.capture import crop_view
+from widgets.templates import TemplateScales
+from widgets.tracing import span
+
+
+class PortDetector:
+    REGION = {}
+
+    GREEN = (126, 211, 33)
+    RED = (231, 33, 57)
+    TOLERANCE = 20
+    NEIGHBOURHOOD = 10
+
+    def __init__(self):
+        self.red_bounds = self.rgb_to_bgra_bounds(self.RED, self.TOLERANCE)
+        self.green_bounds = self.rgb_to_bgra_bounds(self.GREEN, self.TOLERANCE)
+        self.kernel = np.ones((1, 2 * self.NEIGHBOURHOOD + 1), np.uint8)
+        self.seen = False
+
+    @staticmethod
+    def rgb_to_bgra_bounds(rgb, tol):
+        lower = np.array([max(0, c - tol) for c in rgb[::-1]] + [0], dtype=np.uint8)
+        upper = np.array([min(255, c + tol) for c in rgb[::-1]] + [255], dtype=np.uint8)
+        return lower, upper
+
+    def detect(self, image: np.ndarray) -> bool:
+        with span("inRange", "cv"):
+            red = cv2.inRange(image, *self.red_bounds)
+            self.seen = cv2.countNonZero(red) > 0
+            if not self.seen:
+                return False
+            green = cv2.dilate(cv2.inRange(image, *self.green_bounds), self.kernel)
+            return cv2.countNonZero(cv2.bitwise_and(red, green)) > 0
+
+
+class GymDetector:
+    REGION = {"reference_height": 1440, "reference_top": 560}
+
+    TARGET_RGB = (120, 255, 166)
+
+    H_TOL = 0   #оттенок 10
+    S_TOL = 0   #насыщенность 15
+    V_TOL = 0   #яркость
+
+    MIN_AREA = 50
+
+    FAST_PATH_RADIUS = 16
+    MAX_RUNS = 4
+
+    def __init__(self):
+        self.lower, self.upper = self.rgb_to_hsv_bounds(self.TARGET_RGB, self.H_TOL, self.S_TOL, self.V_TOL)
+        self.runs = self.packed_runs(self.matching_colours(self.TARGET_RGB, self.lower, self.upper, self.FAST_PATH_RADIUS), self.MAX_RUNS)
+        self._buffers = None
+
+    @staticmethod
+    def rgb_to_hsv_bounds(rgb, h_tol, s_tol, v_tol):
+        bgr = np.uint8([[[rgb[2], rgb[1], rgb[0]]]])
+        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)[0, 0]
+        h, s, v = int(hsv[0]), int(hsv[1]), int(hsv[2])
+
+        lower = np.array([max(0,   h - h_tol), max(0,   s - s_tol), max(0,   v - v_tol)], dtype=np.uint8)
+        upper = np.array([min(179, h + h_tol), min(255, s + s_tol), min(255, v + v_tol)], dtype=np.uint8)
+        return lower, upper
+
+    @staticmethod
+    def matching_colours(rgb, lower, upper, radius) -> Optional[np.ndarray]:
+        axes = [np.arange(max(0, c - radius), min(255, c + radius) + 1) for c in rgb[::-1]]
+        grid = np.stack(np.meshgrid(*axes, indexing="ij"), -1).reshape(-1, 1, 3).astype(np.uint8)
+        hit = cv2.inRange(cv2.cvtColor(grid, cv2.COLOR_BGR2HSV), lower, upper).reshape(-1) > 0
+        colours = grid.reshape(-1, 3)[hit].astype(np.uint32)
+        for ch, axis in enumerate(axes):
+            if (axis[0] > 0 and (colours[:, ch] == axis[0]).any()) or (axis[-1] < 255 and (colours[:, ch] == axis[-1]).any()):
+                return None
+        return np.sort(colours[:, 0] | colours[:, 1] << 8 | colours[:, 2] << 16)
+
+    @staticmethod
+    def packed_runs(packed: Optional[np.ndarray], max_runs: int) -> Optional[List[Tuple[int, int]]]:
+        if packed is None or not len(packed):
+            return None
+        breaks = np.flatnonzero(np.diff(packed) > 1)
+        starts = np.concatenate(([0], breaks + 1))
+        ends = np.concatenate((breaks, [len(packed) - 1]))
+        if len(starts) > max_runs:
+            return None
+        return [(int(packed[a]), int(packed[b] - packed[a])) for a, b in zip(starts, ends)]
+
+    def has_circle(self, mask) -> bool:
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        for cnt in contours:
+            area = cv2.contourArea(cnt)
+            if area < self.MIN_AREA:
+                continue
+
+            perim = cv2.arcLength(cnt, True)
+            if perim == 0:
+                continue
+
+            '''circularity = 4 * math.pi * area / (perim * perim)
+            if circularity < MIN_CIRCULARITY:
+                continue'''
+
+            return True
+        return False
+
+    def found_circle_by_color(self, frame_bgr, lower, upper):
+        hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
+        return self.has_circle(cv2.inRange(hsv, lower, upper))
+
+    def colour_mask(self, image: np.ndarray) -> np.ndarray:
+        shape = image.shape[:2]
+        if self._buffers is None or self._buffers[0].shape != shape:
+            self._buffers = (np.empty(shape, np.uint32), np.empty(shape, np.uint32), np.empty(shape, bool), np.empty(shape, bool))
+        packed, work, mask, hit = self._buffers
+        np.bitwise_and(image.view(np.uint32)[:, :, 0], np.uint32(0xFFFFFF), out=packed)
+        for i, (lo, width) in enumerate(self.runs):
+            np.subtract(packed, np.uint32(lo), out=work)
+            np.less_equal(work, np.uint32(width), out=mask if i == 0 else hit)
+            if i:
+                np.logical_or(mask, hit, out=mask)
+        return mask.view(np.uint8)
+
+    def detect(self, image: np.ndarray) -> bool:
+        if self.runs is None or image.shape[2] != 4:
+            with span("cvtColor", "cv"):
+                frame_bgr = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+            return self.found_circle_by_color(frame_bgr, self.lower, self.upper)
+        with span("colour_mask", "cv"):
+            mask = self.colour_mask(image)
+        if cv2.countNonZero(mask) < self.MIN_AREA:
+            return False
+        with span("has_circle", "cv"):
+            return self.has_circle(mask)
+
+
+class CowDetector:
+    REGION = {"width_ratio": 1.0, "height_ratio": 0.65, "top_ratio": 0.35}
+    THRESHOLD = 0.91
+
+    def __init__(self, templates: Dict[str, np.ndarray]):
+        self.templates = templates
+        self.scales = TemplateScales(templates)
+        self.scale = 1.0
+
+    def rescale(self, scale: float):
+        if scale != self.scale:
+            self.templates = self.scales.get(scale)
+            self.scale = scale
+
+    def detect(self, image: np.ndarray) -> Dict[str, float]:
+        with span("cvtColor", "cv"):
+            frame_bgr = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        scores = {}
+        for key, template in self.templates.items():
+            with span("matchTemplate", "cv", template=key):
+                res = cv2.matchTemplate(frame_bgr, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, _ = cv2.minMaxLoc(res)
+            if max_val >= self.THRESHOLD:
+                scores[key] = max_val
+        return scores
+
+
+class ShveikaDetector:
+    REGION = {"width_ratio": 0.5, "height_ratio": 0.8, "top_ratio": 0.1}
+    CONFIDENCE = 0.95
+    SENTINEL_THRESHOLD = 0.92
+    LAYOUT_MARGIN = 6
+    RELEARN_AFTER = 20
+
+    def __init__(self, templates: List[np.ndarray], sentinel_idx: int = 0, layout=None, on_layout: Optional[Callable[[list], None]] = None):
+        self.templates = templates
+        self.scales = TemplateScales(templates)
+        self.scale = 1.0
+        self.sentinel_idx = sentinel_idx
+        self.layout = layout if layout and len(layout) == len(templates) else None
+        self.on_layout = on_layout
+        self._layout_misses = 0
+
+    def rescale(self, scale: float):
+        if scale != self.scale:
+            self.templates = self.scales.get(scale)
+            self.scale = scale
+
+    def locate_one(self, image_bgr, templ_bgr, threshold, region):
+        with span("matchTemplate", "cv"):
+            res = cv2.matchTemplate(image_bgr, templ_bgr, cv2.TM_CCOEFF_NORMED)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+        if max_val >= threshold:
+            h, w = templ_bgr.shape[:2]
+            center = (max_loc[0] + w // 2 + region["left"],
+                      max_loc[1] + h // 2 + region["top"])
+            return center, max_val
+        return None, max_val
+
+    def locate_near(self, image_bgr, templ_bgr, threshold, region, center):
+        h, w = templ_bgr.shape[:2]
+        x0 = center[0] - region["left"] - w // 2 - self.LAYOUT_MARGIN
+        y0 = center[1] - region["top"] - h // 2 - self.LAYOUT_MARGIN
+        x1 = min(image_bgr.shape[1], x0 + w + 2 * self.LAYOUT_MARGIN)
+        y1 = min(image_bgr.shape[0], y0 + h + 2 * self.LAYOUT_MARGIN)
+        x0, y0 = max(0, x0), max(0, y0)
+        if x1 - x0 < w or y1 - y0 < h:
+            return None
+        sub = {"left": region["left"] + x0, "top": region["top"] + y0}
+        return self.locate_one(image_bgr[y0:y1, x0:x1], templ_bgr, threshold, sub)[0]
+
+    def locate_all(self, image_bgr, region, threshold=None):
+        threshold = self.CONFIDENCE if threshold is None else threshold
+        coords = []
+        for templ in self.templates:
+            c, score = self.locate_one(image_bgr, templ, threshold, region)
+            coords.append(c)
+        return coords
+
+    def locate_predicted(self, image_bgr, region, sentinel_center, threshold=None):
+        threshold = self.CONFIDENCE if threshold is None else threshold
+        coords = []
+        for i, (templ, (dx, dy)) in enumerate(zip(self.templates, self.layout)):
+            if i == self.sentinel_idx:
+                coords.append(sentinel_center)
+                continue
+            guess = (sentinel_center[0] + dx, sentinel_center[1] + dy)
+            coords.append(self.locate_near(image_bgr, templ, threshold, region, guess))
+        return coords
+
+    def learn_layout(self, coords):
+        sx, sy = coords[self.sentinel_idx]
+        self.layout = [[x - sx, y - sy] for x, y in coords]
+        self._layout_misses = 0
+        if self.on_layout:
+            self.on_layout(self.layout)
+
+    def detect(self, image: np.ndarray, region: Dict[str, int]) -> Optional[List[Optional[Tuple[int, int]]]]:
+        with span("cvtColor", "cv"):
+            image_bgr = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        sentinel_center, _ = self.locate_one(image_bgr, self.templates[self.sentinel_idx], self.SENTINEL_THRESHOLD, region)
+        if sentinel_center is None:
+            return None
+
+        if self.layout:
+            coords = self.locate_predicted(image_bgr, region, sentinel_center)
+            if all(coords):
+                self._layout_misses = 0
+                return coords
+            self._layout_misses += 1
+            if self._layout_misses < self.RELEARN_AFTER:
+                return coords
+
+        coords = self.locate_all(image_bgr, region)
+        if all(coords):
+            self.learn_layout(coords)
+        return coords
+
+
+class TokarDetector:
+    REGION = {"width_ratio": 0.5, "height_ratio": 0.6, "top_ratio": 0.25}
+    THRESHOLD = 0.9
+
+    def __init__(self, template: np.ndarray):
+        self.template = template
+        self.scales = TemplateScales([template])
+        self.scale = 1.0
+
+    def rescale(self, scale: float):
+        if scale != self.scale:
+            self.template = self.scales.get(scale)[0]
+            self.scale = scale
+
+    def search(self, image: np.ndarray, image_region: Dict[str, int], region: Dict[str, int]) -> Optional[Tuple[int, int]]:
+        h, w = self.template.shape[:2]
+        with span("cvtColor", "cv"):
+            screenshot_bgr = cv2.cvtColor(crop_view(image, image_region, region), cv2.COLOR_BGRA2BGR)
+
+        with span("matchTemplate", "cv"):
+            result = cv2.matchTemplate(screenshot_bgr, self.template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+
+        if max_val > self.THRESHOLD:
+            return region["left"] + max_loc[0] + w // 2, region["top"] + max_loc[1] + h
+        return None
@@ -0,0 +1,135 @@
+import threading
+from typing import Callable, Optional
+
+GAME_MARKER = "multi"
+LOOKALIKES = str.maketrans({
+    "а": "a", "е": "e", "о": "o", "р": "p", "с": "c", "у": "y", "х": "x", "м": "m", "т": "t", "н": "h", "в": "b", "к": "k",
+})
+
+
+def is_game_title(title: Optional[str]) -> bool:
+    if not title:
+        return False
+    return GAME_MARKER in title.casefold().translate(LOOKALIKES)
+
+
+class PyGetWindowBackend:
+    def __init__(self):
+        import pygetwindow
+        self._gw = pygetwindow
+
+    def active_title(self) -> Optional[str]:
+        active = self._gw.getActiveWindow()
+        return active.title if active else None
+
+
+class FakeFocusBackend:
+    def __init__(self, title: Optional[str] = None):
+        self.title = title
+        self.calls = 0
+
+    def active_title(self) -> Optional[str]:
+        self.calls += 1
+        return self.title
+
+
+class FocusWatcher:
+    _instance = None
+
+    POLL_INTERVAL = 0.25
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(FocusWatcher, cls).__new__(cls)
+            cls._instance._init_state()
+        return cls._instance
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        self._backend = None
+        self._title = None
+        self._active = threading.Event()
+        self._polled = False
+        self._listeners = []
+        self._users = 0
+        self._thread = None
+        self._thread_stop = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = PyGetWindowBackend()
+        return self._backend
+
+    def set_backend(self, backend):
+        self._backend = backend
+        self._polled = False
+
+    @property
+    def active(self) -> bool:
+        if self._thread is None or not self._polled:
+            self.poll()
+        return self._active.is_set()
+
+    @property
+    def title(self) -> Optional[str]:
+        return self._title
+
+    def wait_active(self, timeout: Optional[float] = None) -> bool:
+        if not self.active:
+            return self._active.wait(timeout)
+        return True
+
+    def add_listener(self, listener: Callable[[bool], None]):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[bool], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def acquire(self) -> "FocusWatcher":
+        with self._lock:
+            self._users += 1
+            if self._thread is None:
+                self._thread_stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._thread_stop,), name="FocusWatcher", daemon=True)
+                self._thread.start()
+        return self
+
+    def release(self):
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users or self._thread is None:
+                return
+            self._thread_stop.set()
+            self._thread = None
+
+    def poll(self) -> bool:
+        try:
+            title = self.backend.active_title()
+        except Exception:
+            title = None
+        active = is_game_title(title)
+        changed = active != self._active.is_set() or not self._polled
+        self._title = title
+        self._polled = True
+        if active:
+            self._active.set()
+        else:
+            self._active.clear()
+        if changed:
+            with self._lock:
+                listeners = list(self._listeners)
+            for listener in listeners:
+                try:
+                    listener(active)
+                except Exception:
+                    pass
+        return active
+
+    def _run(self, stop: threading.Event):
+        while not stop.is_set():
+            self.poll()
+            stop.wait(self.POLL_INTERVAL)
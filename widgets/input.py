@@ -0,0 +1,238 @@
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+import keyboard
+from widgets.focus import FocusWatcher
+from widgets.tracing import record
+
+EN_TO_RU = {
+    'q': 'й', 'w': 'ц', 'e': 'у', 'r': 'к', 't': 'е', 'y': 'н', 'u': 'г',
+    'i': 'ш', 'o': 'щ', 'p': 'з', '[': 'х', ']': 'ъ',
+    'a': 'ф', 's': 'ы', 'd': 'в', 'f': 'а', 'g': 'п', 'h': 'р', 'j': 'о',
+    'k': 'л', 'l': 'д', ';': 'ж', "'": 'э',
+    'z': 'я', 'x': 'ч', 'c': 'с', 'v': 'м', 'b': 'и', 'n': 'т', 'm': 'ь',
+    ',': 'б', '.': 'ю', '/': '.'
+}
+EN_TO_UK = {**EN_TO_RU, 's': 'і', ']': 'ї', "'": 'є'}
+EN_TO_BE = {**EN_TO_RU, 'o': 'ў', 's': 'і', ']': "'"}
+LAYOUTS = {"en": {}, "ru": EN_TO_RU, "uk": EN_TO_UK, "be": EN_TO_BE}
+LANGUAGES = {0x09: "en", 0x19: "ru", 0x22: "uk", 0x23: "be"}
+UNKNOWN_LAYOUT = "unknown"
+
+
+class WindowsLayoutBackend:
+    def __init__(self):
+        import ctypes
+        self._user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+    def active_layout(self) -> Optional[str]:
+        hwnd = self._user32.GetForegroundWindow()
+        thread = self._user32.GetWindowThreadProcessId(hwnd, None)
+        hkl = self._user32.GetKeyboardLayout(thread)
+        return LANGUAGES.get(hkl & 0x3FF, UNKNOWN_LAYOUT)
+
+
+class FixedLayoutBackend:
+    def __init__(self, layout: str = "en"):
+        self.layout = layout
+        self.calls = 0
+
+    def active_layout(self) -> Optional[str]:
+        self.calls += 1
+        return self.layout
+
+
+def localise(key: str, layout: str) -> str:
+    if len(key) != 1:
+        return key
+    char = LAYOUTS.get(layout, {}).get(key.lower(), key)
+    return char.upper() if key.isupper() else char
+
+
+def candidates(key: str, layout: str) -> tuple:
+    if layout in LAYOUTS:
+        return (localise(key, layout),)
+    return tuple(dict.fromkeys((key, localise(key, "ru"))))
+
+
+class _Action:
+    __slots__ = ("key", "times", "owner", "queued", "done", "cancelled")
+
+    def __init__(self, key, times: int, owner):
+        self.key = key
+        self.times = times
+        self.owner = owner
+        self.queued = time.perf_counter()
+        self.done = threading.Event()
+        self.cancelled = False
+
+
+class InputDispatcher:
+    _instance = None
+
+    DEFAULT_LAYOUT = "en"
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(InputDispatcher, cls).__new__(cls)
+            cls._instance._init_state()
+        return cls._instance
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._send_lock = threading.Lock()
+        self._queue = deque()
+        self._current = None
+        self._backend = None
+        self._controller = None
+        self._resolved = {}
+        self._latency = {}
+        self._users = 0
+        self._thread = None
+        self._focus = None
+        self.layout = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = WindowsLayoutBackend() if sys.platform == "win32" else FixedLayoutBackend(self.DEFAULT_LAYOUT)
+        return self._backend
+
+    def set_backend(self, backend):
+        self._backend = backend
+        self.layout = None
+
+    @property
+    def controller(self):
+        if self._controller is None:
+            from pynput.keyboard import Controller
+            self._controller = Controller()
+        return self._controller
+
+    def set_controller(self, controller):
+        self._controller = controller
+        self._resolved.clear()
+
+    def detect_layout(self) -> str:
+        try:
+            layout = self.backend.active_layout()
+        except Exception:
+            layout = None
+        self.layout = layout or UNKNOWN_LAYOUT
+        return self.layout
+
+    def acquire(self) -> "InputDispatcher":
+        with self._lock:
+            self._users += 1
+            if self._focus is None:
+                self._focus = FocusWatcher().acquire()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="InputDispatcher", daemon=True)
+                self._thread.start()
+        self._sync_layout()
+        return self
+
+    def release(self, owner=None):
+        self.discard(owner)
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users:
+                return
+            focus, self._focus = self._focus, None
+            self._ready.notify_all()
+        if focus is not None:
+            focus.release()
+
+    def _sync_layout(self):
+        focus = self._focus
+        if focus is not None and focus.active:
+            self.detect_layout()
+
+    def discard(self, owner=None):
+        with self._lock:
+            kept = deque()
+            for action in self._queue:
+                if owner is None or action.owner is owner:
+                    action.cancelled = True
+                    action.done.set()
+                else:
+                    kept.append(action)
+            self._queue = kept
+            current = self._current
+            if current is not None and (owner is None or current.owner is owner):
+                current.cancelled = True
+
+    def tap(self, key: str, times: int = 1, owner=None) -> threading.Event:
+        action = _Action(key, times, owner)
+        with self._lock:
+            self._queue.append(action)
+            self._ready.notify()
+        return action.done
+
+    def press(self, key: str):
+        with self._send_lock:
+            keyboard.press(key)
+
+    def unpress(self, key: str):
+        with self._send_lock:
+            keyboard.release(key)
+
+    def resolve(self, key: str):
+        layout = self.layout or UNKNOWN_LAYOUT
+        resolved = self._resolved.get((key, layout))
+        if resolved is None:
+            if len(key) == 1:
+                resolved = candidates(key, layout)
+            else:
+                from pynput.keyboard import Key
+                resolved = (getattr(Key, key),)
+            self._resolved[(key, layout)] = resolved
+        return resolved
+
+    def latency(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            items = list(self._latency.items())
+        return {str(key): {"count": count, "avg_ms": total * 1000 / count, "max_ms": peak * 1000}
+                for key, (total, count, peak) in items}
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue and self._users:
+                    self._ready.wait()
+                if not self._queue:
+                    self._thread = None
+                    return
+                action = self._current = self._queue.popleft()
+            self._send(action)
+            with self._lock:
+                self._current = None
+
+    def _send(self, action: _Action):
+        key = action.key
+        try:
+            self._sync_layout()
+            keys = self.resolve(action.key)
+            key = "+".join(map(str, keys))
+            with self._send_lock:
+                for _ in range(action.times):
+                    if action.cancelled:
+                        break
+                    for char in keys:
+                        self.controller.tap(char)
+        except Exception as exc:
+            print(f"[InputDispatcher] Ошибка отправки {key!r}: {exc}")
+        finally:
+            now = time.perf_counter()
+            latency = now - action.queued
+            record(f"dispatch {key}", "input", action.queued, latency)
+            with self._lock:
+                total, count, peak = self._latency.get(key, (0.0, 0, 0.0))
+                self._latency[key] = (total + latency, count + 1, max(peak, latency))
+            metrics = getattr(action.owner, "metrics", None)
+            if metrics is not None:
+                metrics.dispatched(latency)
+            action.done.set()
@@ -0,0 +1,87 @@
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Union
+import cv2
+import numpy as np
+from widgets.capture import crop_view
+from widgets.templates import TemplateRegistry, TemplateScales
+from widgets.tracing import span
+
+
+class Match(NamedTuple):
+    key: Any
+    left: int
+    top: int
+    width: int
+    height: int
+    score: float
+
+    @property
+    def center(self):
+        return (self.left + self.width // 2, self.top + self.height // 2)
+
+
+def intersect_region(a: Dict[str, int], b: Dict[str, int]) -> Optional[Dict[str, int]]:
+    left = max(a["left"], b["left"])
+    top = max(a["top"], b["top"])
+    right = min(a["left"] + a["width"], b["left"] + b["width"])
+    bottom = min(a["top"] + a["height"], b["top"] + b["height"])
+    if right <= left or bottom <= top:
+        return None
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+
+def to_bgr(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 3 and image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    return image
+
+
+class Locator:
+    def __init__(self, templates: Dict[Any, np.ndarray], confidence: float = 0.95, rois: Optional[Dict[Any, Dict[str, int]]] = None):
+        self.templates = {key: to_bgr(templ) for key, templ in templates.items()}
+        self.scales = TemplateScales(self.templates)
+        self.scale = 1.0
+        self.confidence = confidence
+        self.rois = dict(rois or {})
+
+    @classmethod
+    def from_files(cls, paths: Union[Dict[Any, str], Iterable[str]], confidence: float = 0.95, rois: Optional[Dict[Any, Dict[str, int]]] = None) -> "Locator":
+        if not isinstance(paths, dict):
+            paths = {p: p for p in paths}
+        registry = TemplateRegistry()
+        return cls({key: registry.bgr(path) for key, path in paths.items()}, confidence, rois)
+
+    def rescale(self, scale: float):
+        if scale != self.scale:
+            self.templates = self.scales.get(scale)
+            self.scale = scale
+
+    def locate_all(self, image: np.ndarray, image_region: Dict[str, int], keys: Optional[Iterable[Any]] = None,
+                   confidence: Optional[float] = None, rois: Optional[Dict[Any, Dict[str, int]]] = None) -> Dict[Any, Optional[Match]]:
+        confidence = self.confidence if confidence is None else confidence
+        rois = {**self.rois, **(rois or {})}
+        with span("cvtColor", "cv"):
+            bgr = to_bgr(image)
+        hits = {}
+        for key in (self.templates if keys is None else keys):
+            templ = self.templates[key]
+            region = image_region
+            if key in rois:
+                region = intersect_region(image_region, rois[key])
+            hits[key] = None
+            if region is None:
+                continue
+            h, w = templ.shape[:2]
+            if region["height"] < h or region["width"] < w:
+                continue
+            view = crop_view(bgr, image_region, region)
+            with span("matchTemplate", "cv", template=str(key)):
+                res = cv2.matchTemplate(view, templ, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(res)
+            if max_val >= confidence:
+                hits[key] = Match(key, region["left"] + max_loc[0], region["top"] + max_loc[1], w, h, float(max_val))
+        return hits
+
+    def locate(self, image: np.ndarray, image_region: Dict[str, int], key: Any,
+               confidence: Optional[float] = None, roi: Optional[Dict[str, int]] = None) -> Optional[Match]:
+        rois = {key: roi} if roi is not None else None
+        return self.locate_all(image, image_region, keys=(key,), confidence=confidence, rois=rois)[key]
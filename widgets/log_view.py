@@ -0,0 +1,81 @@
+from collections import deque
+from PyQt5 import QtCore, QtWidgets
+
+
+class LogView(QtWidgets.QPlainTextEdit):
+    MAX_LINES = 1000
+    FLUSH_MS = 100
+
+    def __init__(self, max_lines: int = None, parent=None):
+        super().__init__(parent)
+        self.max_lines = max_lines or self.MAX_LINES
+        self._lines = deque(maxlen=self.max_lines)
+        self._incoming = deque(maxlen=self.max_lines)
+        self._paused = False
+        self._dirty = False
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(self.max_lines)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.FLUSH_MS)
+        self._timer.timeout.connect(self._flush)
+
+    def post(self, text: str):
+        self._incoming.append(text)
+
+    def append(self, text: str):
+        self.post(text)
+
+    def clear(self):
+        self._incoming.clear()
+        self._lines.clear()
+        self._dirty = False
+        super().clear()
+
+    def lines(self) -> list:
+        return list(self._lines) + list(self._incoming)
+
+    def isPaused(self) -> bool:
+        return self._paused
+
+    def setPaused(self, paused: bool):
+        self._paused = paused
+        if paused:
+            self._timer.stop()
+        elif self.isVisible():
+            self._flush()
+            self._timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._paused:
+            self._flush()
+            self._timer.start()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def _drain(self) -> list:
+        batch = []
+        while self._incoming:
+            batch.append(self._incoming.popleft())
+        if len(batch) >= self.max_lines:
+            self._dirty = True
+        self._lines.extend(batch)
+        return batch
+
+    def _flush(self):
+        batch = self._drain()
+        if not batch and not self._dirty:
+            return
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 4
+        if self._dirty:
+            self.setPlainText("\n".join(self._lines))
+            self._dirty = False
+        else:
+            self.appendPlainText("\n".join(batch))
+        if at_bottom:
+            bar.setValue(bar.maximum())
@@ -0,0 +1,118 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+
+class LogWriter:
+    _instance = None
+
+    FLUSH_INTERVAL = 0.5
+    BATCH_SIZE = 256
+    MAX_BYTES = 1024 * 1024
+    BACKUPS = 3
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(LogWriter, cls).__new__(cls)
+            cls._instance._init_state()
+        return cls._instance
+
+    def _init_state(self):
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._files = {}
+        self.written = 0
+        atexit.register(self.close)
+
+    def write(self, line: str, path: str = "logs.txt"):
+        if self._thread is None:
+            self._start()
+        self._queue.put((path, line))
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(2.0)
+        self._close_files()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch = {}
+        pending = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            if isinstance(item, tuple) and item:
+                path, line = item
+                batch.setdefault(path, []).append(line)
+                pending += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.FLUSH_INTERVAL
+                if pending < self.BATCH_SIZE:
+                    continue
+            self._write_batch(batch)
+            batch, pending, deadline = {}, 0, None
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _write_batch(self, batch):
+        for path, lines in batch.items():
+            data = "\n".join(lines) + "\n"
+            try:
+                fp = self._open(path)
+                if fp.tell() + len(data.encode("utf-8")) > self.MAX_BYTES and fp.tell():
+                    fp = self._rotate(path)
+                fp.write(data)
+                fp.flush()
+                self.written += len(lines)
+            except OSError:
+                pass
+
+    def _open(self, path: str):
+        fp = self._files.get(path)
+        if fp is None:
+            fp = open(path, "a", encoding="utf-8")
+            self._files[path] = fp
+        return fp
+
+    def _rotate(self, path: str):
+        self._files.pop(path).close()
+        for i in range(self.BACKUPS - 1, 0, -1):
+            if os.path.exists(f"{path}.{i}"):
+                os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+        if self.BACKUPS:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+        return self._open(path)
+
+    def _close_files(self):
+        for fp in self._files.values():
+            try:
+                fp.close()
+            except OSError:
+                pass
+        self._files = {}
@@ -0,0 +1,124 @@
+import contextlib
+import threading
+import time
+from collections import deque
+from typing import Dict
+from widgets.tracing import record
+
+
+class WorkerMetrics:
+    INTERVAL = 0.25
+    APM_WINDOW = 60
+
+    def __init__(self, loops: int = 1):
+        self._lock = threading.Lock()
+        self._sources = []
+        self.loops = loops
+        self.frames = 0
+        self.detections = 0
+        self.actions = 0
+        self._timings = {"capture": [0.0, 0], "match": [0.0, 0], "input": [0.0, 0]}
+        self._idle = 0.0
+        self._buckets = deque()
+        self._window_start = time.perf_counter()
+        self._window_idle = 0.0
+        self._last_publish = 0.0
+
+    def track(self, *sources):
+        self._sources.extend(sources)
+
+    @contextlib.contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            record(stage, "worker", start, elapsed)
+            with self._lock:
+                total = self._timings[stage]
+                total[0] += elapsed
+                total[1] += 1
+                if stage == "capture":
+                    self.frames += 1
+
+    def dispatched(self, seconds: float):
+        with self._lock:
+            total = self._timings["input"]
+            total[0] += seconds
+            total[1] += 1
+
+    def detected(self, count: int = 1):
+        with self._lock:
+            self.detections += count
+
+    def acted(self, count: int = 1):
+        second = int(time.monotonic())
+        with self._lock:
+            self.actions += count
+            if self._buckets and self._buckets[-1][0] == second:
+                self._buckets[-1][1] += count
+            else:
+                self._buckets.append([second, count])
+            while self._buckets[0][0] <= second - self.APM_WINDOW:
+                self._buckets.popleft()
+
+    def idle(self, seconds: float):
+        with self._lock:
+            self._idle += seconds
+
+    def due(self) -> bool:
+        return time.perf_counter() - self._last_publish >= self.INTERVAL
+
+    def _source_idle(self) -> float:
+        return self._idle + sum(getattr(s, "idle", 0.0) for s in self._sources)
+
+    def snapshot(self) -> Dict[str, float]:
+        now = time.perf_counter()
+        second = int(time.monotonic())
+        skipped = sum(getattr(s, "skipped", 0) for s in self._sources)
+        with self._lock:
+            idle = self._source_idle()
+            capacity = (now - self._window_start) * self.loops
+            busy = capacity - (idle - self._window_idle)
+            snap = {
+                "capture_ms": self._average("capture"),
+                "match_ms": self._average("match"),
+                "input_ms": self._average("input"),
+                "frames": self.frames,
+                "skipped": skipped,
+                "detections": self.detections,
+                "actions": self.actions,
+                "apm": sum(c for s, c in self._buckets if s > second - self.APM_WINDOW),
+                "utilisation": max(0.0, min(1.0, busy / capacity)) if capacity > 0 else 0.0,
+            }
+            for total in self._timings.values():
+                total[0], total[1] = 0.0, 0
+            self._window_start = now
+            self._window_idle = idle
+            self._last_publish = now
+        return snap
+
+    def _average(self, stage: str) -> float:
+        total, count = self._timings[stage]
+        return total * 1000 / count if count else 0.0
+
+
+def format_metrics(snap: dict) -> str:
+    frames = snap["frames"]
+    skipped = f" (пропущено {snap['skipped'] / frames:.0%})" if frames and snap["skipped"] else ""
+    return (f"Захват {snap['capture_ms']:.1f} мс · поиск {snap['match_ms']:.1f} мс · "
+            f"кадров {frames}{skipped}\n"
+            f"Найдено {snap['detections']} · действий {snap['actions']} ({snap['apm']}/мин, "
+            f"ввод {snap['input_ms']:.1f} мс) · "
+            f"загрузка {snap['utilisation']:.0%}")
+
+
+def hud_fields(snap: dict) -> dict:
+    return {
+        "Захват": f"{snap['capture_ms']:.1f} мс",
+        "Поиск": f"{snap['match_ms']:.1f} мс",
+        "Действий/мин": snap["apm"],
+        "Ввод": f"{snap['input_ms']:.1f} мс",
+        "Загрузка": f"{snap['utilisation']:.0%}",
+    }
@@ -1,83 +1,125 @@
 from PyQt5 import QtCore, QtGui, QtWidgets, QtNetwork
 from functools import partial
+import importlib
+import threading
 import webbrowser
 from widgets import COLORS, ModuleButton, TitleBar, StatusPulseDot
-from pages.index_page import IndexPage
-from pages.port_page import PortPage
-from pages.anti_afk_page import AntiAfkPage
-from pages.stroyka_page import StroykaPage
-from pages.gotovka_page import GotovkaPage
-from pages.cow_page import CowPage
-from pages.gym_page import GymPage
-from pages.settings import SettingsPage
-from pages.demorgan_page import DemorganPage
-import random
+from widgets.startup_profile import StartupProfiler
 import math
+import random
+
+HEAVY_MODULES = ("numpy", "cv2", "mss", "pyautogui", "pynput.keyboard", "pynput.mouse", "keyboard", "vgamepad")
+
+
+def load_page_class(spec: str):
+    module_name, _, class_name = spec.rpartition(".")
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 class SnowWidget(QtWidgets.QWidget):
+    SPRITE_RADIUS = 24
+    GLOW_SCALE = 6
+    INTERVAL_MS = 50
+
     def __init__(self, parent=None, snowflake_count=45):
         super().__init__(parent)
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
         self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
         
         self.snowflake_count = snowflake_count
-        self.snowflakes = []
+        self.rng = random.Random()
+        self.sprite = self.render_sprite(self.SPRITE_RADIUS, self.GLOW_SCALE)
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.update_snow)
-        self.timer.start(50)
+        self._watched = None
         self.init_snowflakes()
+        QtWidgets.QApplication.instance().applicationStateChanged.connect(self._update_running)
+
+    @staticmethod
+    def render_sprite(radius: int, glow_scale: int) -> QtGui.QPixmap:
+        size = radius * 2
+        sprite = QtGui.QPixmap(size, size)
+        sprite.fill(QtCore.Qt.transparent)
+        center = QtCore.QPointF(radius, radius)
+        painter = QtGui.QPainter(sprite)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+
+        glow_color = QtGui.QColor(180, 200, 255)
+        glow_color.setAlphaF(0.25)
+        gradient = QtGui.QRadialGradient(center, radius)
+        gradient.setColorAt(0.0, glow_color)
+        gradient.setColorAt(1.0, QtCore.Qt.transparent)
+        painter.setBrush(QtGui.QBrush(gradient))
+        painter.drawEllipse(center, radius, radius)
+
+        painter.setBrush(QtGui.QColor(255, 255, 255))
+        painter.drawEllipse(center, radius / glow_scale, radius / glow_scale)
+        painter.end()
+        return sprite
 
     def init_snowflakes(self):
-        self.snowflakes.clear()
-        for _ in range(self.snowflake_count):
-            self.snowflakes.append({
-                "x": random.uniform(0, self.width() or 800),
-                "y": random.uniform(0, self.height() or 600),
-                "r": random.uniform(1.5, 3.5),
-                "speed": random.uniform(0.3, 1.0),
-                "drift": random.uniform(-0.25, 0.25),
-                "phase": random.uniform(0, 2 * math.pi),
-                "opacity": random.uniform(0.5, 1.0),
-                "twinkle_speed": random.uniform(0.005, 0.015),
-                "rotation": random.uniform(0, 360)
-            })
+        uniform = self.rng.uniform
+        width, height = self.width() or 800, self.height() or 600
+        self.flakes = [
+            [uniform(0, width), uniform(0, height), uniform(1.5, 3.5), uniform(0.3, 1.0),
+             uniform(-0.25, 0.25), uniform(0, 2 * math.pi), uniform(0.5, 1.0)]
+            for _ in range(self.snowflake_count)
+        ]
 
     def resizeEvent(self, event):
         self.init_snowflakes()
         super().resizeEvent(event)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        window = self.window()
+        if window is not self._watched:
+            if self._watched is not None:
+                self._watched.removeEventFilter(self)
+            window.installEventFilter(self)
+            self._watched = window
+        self._update_running()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_running()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QtCore.QEvent.WindowStateChange, QtCore.QEvent.ActivationChange,
+                            QtCore.QEvent.Show, QtCore.QEvent.Hide):
+            QtCore.QTimer.singleShot(0, self._update_running)
+        return super().eventFilter(obj, event)
+
+    def _update_running(self, *args):
+        window = self.window()
+        running = self.isVisible() and not window.isMinimized() and window.isActiveWindow()
+        if running and not self.timer.isActive():
+            self.timer.start(self.INTERVAL_MS)
+        elif not running and self.timer.isActive():
+            self.timer.stop()
+
     def update_snow(self):
-        for flake in self.snowflakes:
-            flake["y"] += flake["speed"]
-            flake["x"] += math.sin(flake["phase"]) * 0.3 + flake["drift"]
-            flake["phase"] += 0.05
-            flake["rotation"] += 0.5
-            flake["opacity"] = 0.6 + math.sin(flake["phase"]) * 0.4
-            if flake["y"] > self.height():
-                flake["y"] = -flake["r"]
-                flake["x"] = random.uniform(0, self.width())
+        width, height = self.width(), self.height()
+        for flake in self.flakes:
+            x, y, r, speed, drift, phase, _ = flake
+            y += speed
+            x += math.sin(phase) * 0.3 + drift
+            phase += 0.05
+            if y > height:
+                x, y = self.rng.uniform(0, width), -r
+            flake[0], flake[1], flake[5], flake[6] = x, y, phase, 0.6 + math.sin(phase) * 0.4
         self.update()
 
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
 
-        for flake in self.snowflakes:
-            alpha = max(0.1, min(1.0, flake["opacity"]))
-            color = QtGui.QColor(255, 255, 255)
-            color.setAlphaF(alpha)
-
-            glow_color = QtGui.QColor(180, 200, 255)
-            glow_color.setAlphaF(alpha * 0.25)
-            gradient = QtGui.QRadialGradient(QtCore.QPointF(flake["x"], flake["y"]), flake["r"] * 6)
-            gradient.setColorAt(0.0, glow_color)
-            gradient.setColorAt(1.0, QtCore.Qt.transparent)
-            painter.setBrush(QtGui.QBrush(gradient))
-            painter.setPen(QtCore.Qt.NoPen)
-            painter.drawEllipse(QtCore.QPointF(flake["x"], flake["y"]), flake["r"] * 6, flake["r"] * 6)
-
-            painter.setBrush(color)
-            painter.drawEllipse(QtCore.QPointF(flake["x"], flake["y"]), flake["r"], flake["r"])
+        source = QtCore.QRectF(self.sprite.rect())
+        for x, y, r, _, _, _, opacity in self.flakes:
+            g = r * self.GLOW_SCALE
+            painter.setOpacity(min(1.0, max(0.1, opacity)))
+            painter.drawPixmap(QtCore.QRectF(x - g, y - g, 2 * g, 2 * g), self.sprite, source)
 
 
 class UpdateChecker(QtCore.QObject):
@@ -92,9 +134,11 @@ class UpdateChecker(QtCore.QObject):
     def check(self):
         url = QtCore.QUrl("https://raw.githubusercontent.com/DornodeXXX/bot-gta/main/version.txt")
         request = QtNetwork.QNetworkRequest(url)
+        StartupProfiler().begin("UpdateChecker.check")
         self.manager.get(request)
 
     def _on_response(self, reply):
+        StartupProfiler().end("UpdateChecker.check")
         if reply.error() == QtNetwork.QNetworkReply.NoError:
             latest_version_str = bytes(reply.readAll()).decode().strip()
             from packaging import version
@@ -104,9 +148,12 @@ class UpdateChecker(QtCore.QObject):
 
 class ModernWindow(QtWidgets.QMainWindow):
     CURRENT_VERSION = "3.7"
+    PREWARM_DELAY_MS = 300
 
-    def __init__(self):
+    def __init__(self, prewarm: bool = True):
         super().__init__()
+        self.prewarm = prewarm
+        self._prewarm_queue = None
         self.setWindowFlags(QtCore.Qt.FramelessWindowHint | QtCore.Qt.Window)
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
         self.resize(720, 600)
@@ -166,6 +213,7 @@ class ModernWindow(QtWidgets.QMainWindow):
 
         self._buttons = []
         self._page_map = {}
+        self._page_specs = []
         self._module_states = {}
 
         grid_widget = self._create_module_grid()
@@ -175,10 +223,7 @@ class ModernWindow(QtWidgets.QMainWindow):
         main_layout.addWidget(content_widget, 1)
 
         if self._buttons:
-            modules = self._get_modules()
-            first_button = self._buttons[0]
-            first_page_cls = modules[0][2]
-            self.on_module_clicked(first_button, first_page_cls)
+            self.on_module_clicked(self._buttons[0], self._page_specs[0])
 
         self._start_update_check()
 
@@ -190,13 +235,13 @@ class ModernWindow(QtWidgets.QMainWindow):
     def _create_module_grid(self):
         grid_widget = QtWidgets.QWidget()
         grid_layout = QtWidgets.QGridLayout(grid_widget)
-        grid_layout.setContentsMargins(0, 0, 0, 15)
-        grid_layout.setSpacing(14)
+        grid_layout.setContentsMargins(0, 0, 0, 15 - ModuleButton.SHADOW_MARGIN)
+        grid_layout.setSpacing(14 - 2 * ModuleButton.SHADOW_MARGIN)
 
         modules = self._get_modules()
         max_columns = 3
 
-        for i, (title, emoji, page_cls, enabled) in enumerate(modules):
+        for i, (title, emoji, page_spec, enabled) in enumerate(modules):
             if not enabled:
                 continue
 
@@ -205,35 +250,85 @@ class ModernWindow(QtWidgets.QMainWindow):
             is_settings = (title == "Настройки")
 
             button = ModuleButton(title, emoji, indicator, is_settings_button=is_settings)
-            button.clicked.connect(partial(self.on_module_clicked, button, page_cls))
+            button.clicked.connect(partial(self.on_module_clicked, button, page_spec))
             
             row, col = divmod(i, max_columns)
             grid_layout.addWidget(button, row, col)
 
-            page = page_cls(version=self.CURRENT_VERSION) if page_cls is IndexPage else page_cls()
-            page_index = self.stack.addWidget(page)
-            
-            if hasattr(page, 'statusChanged'):
-                page.statusChanged.connect(lambda status, idx=page_index: self._handle_status_change(idx, status))
-            
+            self._module_states[len(self._buttons)] = False
             self._buttons.append(button)
-            self._page_map[page_cls] = page
-            self._module_states[page_index] = False
+            self._page_specs.append(page_spec)
         
         return grid_widget
 
+    def _ensure_page(self, page_spec: str):
+        page = self._page_map.get(page_spec)
+        if page is not None:
+            return page
+
+        with StartupProfiler().span(page_spec, "page"):
+            page_cls = load_page_class(page_spec)
+            page = page_cls(version=self.CURRENT_VERSION) if page_cls.__name__ == "IndexPage" else page_cls()
+        self.stack.addWidget(page)
+
+        if hasattr(page, 'statusChanged'):
+            idx = self._page_specs.index(page_spec)
+            page.statusChanged.connect(lambda status, idx=idx: self._handle_status_change(idx, status))
+
+        self._page_map[page_spec] = page
+        return page
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        profiler = StartupProfiler()
+        if profiler.enabled and profiler.first_paint is None:
+            profiler.mark("first paint")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.prewarm and self._prewarm_queue is None:
+            self._prewarm_queue = [spec for spec in self._page_specs if spec not in self._page_map]
+            QtCore.QTimer.singleShot(self.PREWARM_DELAY_MS, self._start_prewarm)
+
+    def _start_prewarm(self):
+        thread = threading.Thread(target=self._prewarm_imports, name="PagePrewarm", daemon=True)
+        thread.start()
+        self._prewarm_timer = QtCore.QTimer(self)
+        self._prewarm_timer.timeout.connect(partial(self._prewarm_next, thread))
+        self._prewarm_timer.start(50)
+
+    @staticmethod
+    def _prewarm_imports():
+        for name in HEAVY_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+
+    def _prewarm_next(self, thread: threading.Thread):
+        if thread.is_alive():
+            return
+        if not self._prewarm_queue:
+            self._prewarm_timer.stop()
+            return
+        spec = self._prewarm_queue.pop(0)
+        try:
+            importlib.import_module(spec.rpartition(".")[0])
+        except Exception:
+            pass
+
 
     def _get_modules(self):
         return [
-            ("Главная", "🏠", IndexPage, True),
-            ("Деморган", "⛓️", DemorganPage, True),
-            ("Стройка\nШахта", "⛏️", StroykaPage, True),
-            ("Порт", "⚓", PortPage, True),
-            ("Коровы", "🐄", CowPage, True),
-            ("Качалка", "🏋️", GymPage, True),
-            ("Кулинария", "🍜", GotovkaPage, True),
-            ("Анти-АФК", "🕹️", AntiAfkPage, True),
-            ("Настройки", "⚙️", SettingsPage, True),
+            ("Главная", "🏠", "pages.index_page.IndexPage", True),
+            ("Деморган", "⛓️", "pages.demorgan_page.DemorganPage", True),
+            ("Стройка\nШахта", "⛏️", "pages.stroyka_page.StroykaPage", True),
+            ("Порт", "⚓", "pages.port_page.PortPage", True),
+            ("Коровы", "🐄", "pages.cow_page.CowPage", True),
+            ("Качалка", "🏋️", "pages.gym_page.GymPage", True),
+            ("Кулинария", "🍜", "pages.gotovka_page.GotovkaPage", True),
+            ("Анти-АФК", "🕹️", "pages.anti_afk_page.AntiAfkPage", True),
+            ("Настройки", "⚙️", "pages.settings.SettingsPage", True),
         ]
 
     def _handle_status_change(self, page_index: int, status: bool):
@@ -241,12 +336,11 @@ class ModernWindow(QtWidgets.QMainWindow):
         if 0 <= page_index < len(self._buttons):
             self._buttons[page_index].setModuleActive(status)
 
-    def on_module_clicked(self, clicked_btn: ModuleButton, page_cls):
+    def on_module_clicked(self, clicked_btn: ModuleButton, page_spec: str):
         for btn in self._buttons:
             btn.setActive(btn is clicked_btn)
         
-        if page_cls in self._page_map:
-            self.stack.setCurrentWidget(self._page_map[page_cls])
+        self.stack.setCurrentWidget(self._ensure_page(page_spec))
 
     def _start_update_check(self):
         self.checker = UpdateChecker(self.CURRENT_VERSION)
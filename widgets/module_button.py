@@ -1,43 +1,9 @@
 from PyQt5 import QtCore, QtGui, QtWidgets
-from PyQt5.QtMultimedia import QSoundEffect
 from .theme import COLORS
-from widgets.common import SettingsManager
+from widgets.settings_manager import SettingsManager
 from .status_dot import StatusPulseDot
-import os, time, sys
-from PyQt5 import QtMultimedia
-
-def resource_path(relative_path: str) -> str:
-    if getattr(sys, 'frozen', False):
-        base_path = os.path.dirname(sys.executable)
-    else:
-        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    return os.path.join(base_path, relative_path)
-
-
-class SoundPlayer(QtCore.QObject):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.players = []
-
-    def play(self, file_path: str, volume: float = 1.0):
-        abs_path = resource_path(file_path)
-        if not os.path.exists(abs_path):
-            print(f"[⚠️] Файл звука не найден: {abs_path}")
-            return
-        player = QtMultimedia.QMediaPlayer()
-        content = QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(abs_path))
-        player.setMedia(content)
-        player.setVolume(int(volume * 100))
-        player.play()
-        self.players.append(player)
-        player.mediaStatusChanged.connect(
-            lambda status, p=player: self._cleanup(p, status)
-        )
-
-    def _cleanup(self, player, status):
-        if status == QtMultimedia.QMediaPlayer.EndOfMedia:
-            self.players.remove(player)
-            player.deleteLater()
+from .sound import SoundPool
+import time
 
 class ModuleButton(QtWidgets.QFrame):
     clicked = QtCore.pyqtSignal()
@@ -48,18 +14,71 @@ class ModuleButton(QtWidgets.QFrame):
     _sound_loaded_hover = False
     _sound_loaded_click = False
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        painter = QtGui.QPainter(self)
+    SHADOW_MARGIN = 7
+    RADIUS = 14
+    SNOW_HEIGHT = 15
+    STATES = {
+        "normal": ("surface", 18),
+        "hover": ("surface_hover", 28),
+        "pressed": ("surface_press", 28),
+    }
+    CHROME_CACHE_SIZE = 24
+    _chrome_cache = {}
+
+    @classmethod
+    def chrome(cls, size: QtCore.QSize, state: str, dpr: float) -> QtGui.QPixmap:
+        key = (size.width(), size.height(), state, dpr)
+        pixmap = cls._chrome_cache.pop(key, None)
+        if pixmap is not None:
+            cls._chrome_cache[key] = pixmap
+            return pixmap
+
+        pixmap = QtGui.QPixmap(int(size.width() * dpr), int(size.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pixmap)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        snow_height = 15
-        path = QtGui.QPainterPath()
-        path.addRoundedRect(QtCore.QRectF(0, 0, self.width(), snow_height), 14, 14)
-        gradient = QtGui.QLinearGradient(0, 0, 0, snow_height)
+        painter.setPen(QtCore.Qt.NoPen)
+
+        m = cls.SHADOW_MARGIN
+        card = QtCore.QRectF(m, m, size.width() - 2 * m, size.height() - 2 * m)
+        background, blur = cls.STATES[state]
+
+        shadow = QtGui.QColor(COLORS["shadow"])
+        steps = blur // 2
+        base_alpha = shadow.alphaF()
+        for i in range(steps, 0, -1):
+            spread = i * m / steps
+            shadow.setAlphaF(base_alpha * (1.0 - i / (steps + 1)) ** 2 / steps * 2)
+            painter.setBrush(shadow)
+            painter.drawRoundedRect(card.adjusted(-spread, -spread + 4, spread, spread + 4), cls.RADIUS + spread, cls.RADIUS + spread)
+
+        painter.setBrush(QtGui.QColor(COLORS[background]))
+        painter.setPen(QtGui.QPen(QtGui.QColor(COLORS["border"]), 1))
+        painter.drawRoundedRect(card.adjusted(0.5, 0.5, -0.5, -0.5), cls.RADIUS, cls.RADIUS)
+
+        snow = QtGui.QPainterPath()
+        snow.addRoundedRect(QtCore.QRectF(card.left(), card.top(), card.width(), cls.SNOW_HEIGHT), cls.RADIUS, cls.RADIUS)
+        gradient = QtGui.QLinearGradient(0, card.top(), 0, card.top() + cls.SNOW_HEIGHT)
         gradient.setColorAt(0.0, QtGui.QColor(255, 255, 255, 230))
         gradient.setColorAt(0.6, QtGui.QColor(255, 255, 255, 60))
         gradient.setColorAt(1.0, QtCore.Qt.transparent)
-        painter.fillPath(path, gradient)
+        painter.fillPath(snow, gradient)
+        painter.end()
+
+        cls._chrome_cache[key] = pixmap
+        while len(cls._chrome_cache) > cls.CHROME_CACHE_SIZE:
+            cls._chrome_cache.pop(next(iter(cls._chrome_cache)))
+        return pixmap
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self.chrome(self.size(), self.property("state") or "normal", self.devicePixelRatioF()))
+
+    def _set_state(self, state: str):
+        if self.property("state") != state:
+            self.setProperty("state", state)
+            self.update()
 
     def __init__(self, title: str, emoji: str, right_indicator: StatusPulseDot, is_settings_button=False):
         super().__init__()
@@ -68,40 +87,16 @@ class ModuleButton(QtWidgets.QFrame):
         self._module_active = False
         self.setMouseTracking(True)
         self.setCursor(QtCore.Qt.PointingHandCursor)
-        self.setFixedHeight(73)
-        self.setMinimumWidth(100)
+        self.setFixedHeight(73 + 2 * self.SHADOW_MARGIN)
+        self.setMinimumWidth(100 + 2 * self.SHADOW_MARGIN)
         self.settings = SettingsManager()
         self.is_settings_button = is_settings_button
         self.setObjectName("moduleCard")
-        self.setStyleSheet("""
-            QFrame#moduleCard {
-                background-color: %(surface)s;
-                border: 1px solid %(border)s;
-                border-radius: 14px;
-            }
-        """ % COLORS)
-        self.setAttribute(QtCore.Qt.WA_StyledBackground, True)
-
-        self.shadow = QtWidgets.QGraphicsDropShadowEffect(self)
-        self.shadow.setBlurRadius(18)
-        self.shadow.setOffset(0, 4)
-        self.shadow.setColor(COLORS["shadow"])
-        self.setGraphicsEffect(self.shadow)
-
-        self.anim_shadow = QtCore.QPropertyAnimation(self.shadow, b"blurRadius", self)
-        self.anim_shadow.setDuration(180)
-        self.anim_shadow.setStartValue(18)
-        self.anim_shadow.setEndValue(28)
-        self.anim_shadow.setEasingCurve(QtCore.QEasingCurve.OutCubic)
-
-        self.anim_shadow_off = QtCore.QPropertyAnimation(self.shadow, b"blurRadius", self)
-        self.anim_shadow_off.setDuration(220)
-        self.anim_shadow_off.setStartValue(28)
-        self.anim_shadow_off.setEndValue(18)
-        self.anim_shadow_off.setEasingCurve(QtCore.QEasingCurve.OutCubic)
+        self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
+        self.setProperty("state", "normal")
 
         h = QtWidgets.QHBoxLayout(self)
-        h.setContentsMargins(14, 10, 14, 10)
+        h.setContentsMargins(14 + self.SHADOW_MARGIN, 10 + self.SHADOW_MARGIN, 14 + self.SHADOW_MARGIN, 10 + self.SHADOW_MARGIN)
         h.setSpacing(12)
 
         icon_wrap = QtWidgets.QLabel(emoji)
@@ -142,110 +137,42 @@ class ModuleButton(QtWidgets.QFrame):
         h.addWidget(text_widget, 1)
         h.addWidget(self.ind_holder, 0)
 
-        hover_path = resource_path(os.path.join("assets", "hover.wav"))
-        click_path = resource_path(os.path.join("assets", "click.wav"))
-        settings_click_path = resource_path(os.path.join("assets", "settings.wav"))
-        hover_state = self.settings.get("settings", "switch_hover", True)
-        click_state = self.settings.get("settings", "switch_click", True)
-        volume_hover = self.settings.get("settings", "volume_hover", 35)
-        volume_click = self.settings.get("settings", "volume_click", 45)
-
-        ModuleButton._hover_sound_enabled = hover_state
-        ModuleButton._click_sound_enabled = click_state
-
-        self.hover_sound_player = None
-        if hover_state and os.path.exists(hover_path):
-            self.hover_sound_player = QtMultimedia.QMediaPlayer()
-            self.hover_sound_player.setMedia(
-                QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(hover_path))
-            )
-            self.hover_sound_player.setVolume(int(volume_hover))
-        else:
-            if not hover_state:
-                print("[ℹ️] Звук наведения отключён.")
-            elif not os.path.exists(hover_path):
-                print(f"[⚠️] Файл {hover_path} не найден.")
-
-        self.click_sound_player = None
-        if click_state:
-            sound_file = settings_click_path if self.is_settings_button else click_path
-            if os.path.exists(sound_file):
-                self.click_sound_player = QtMultimedia.QMediaPlayer()
-                self.click_sound_player.setMedia(
-                    QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(sound_file))
-                )
-                self.click_sound_player.setVolume(int(volume_click))
-            else:
-                print(f"[⚠️] Файл {sound_file} не найден.")
+        self.hover_sound_enabled = self.settings.get("settings", "switch_hover", True)
+        self.click_sound_enabled = self.settings.get("settings", "switch_click", True)
+        self.volume_hover = self.settings.get("settings", "volume_hover", 35) / 100
+        self.volume_click = self.settings.get("settings", "volume_click", 45) / 100
+
+        ModuleButton._hover_sound_enabled = self.hover_sound_enabled
+        ModuleButton._click_sound_enabled = self.click_sound_enabled
+        SoundPool.instance()
 
 
     def enterEvent(self, e: QtCore.QEvent):
-        self.anim_shadow.stop()
-        self.anim_shadow_off.stop()
-        self.anim_shadow.start()
-        self.setStyleSheet("""
-            QFrame#moduleCard {
-                background-color: %(surface_hover)s;
-                border: 1px solid %(border)s;
-                border-radius: 14px;
-            }
-        """ % COLORS)
+        self._set_state("hover")
 
         now = time.time()
-        if self.hover_sound_player is not None and now - getattr(self, "_last_hover_time", 0) > 0.15:
+        if self.hover_sound_enabled and now - getattr(self, "_last_hover_time", 0) > 0.15:
             self._last_hover_time = now
-            self.hover_sound_player.stop()
-            self.hover_sound_player.play()
+            SoundPool.instance().play("hover", self.volume_hover)
 
         super().enterEvent(e)
 
 
     def leaveEvent(self, e: QtCore.QEvent):
-        self.anim_shadow.stop()
-        self.anim_shadow_off.stop()
-        self.anim_shadow_off.start()
-        self.setStyleSheet("""
-            QFrame#moduleCard {
-                background-color: %(surface)s;
-                border: 1px solid %(border)s;
-                border-radius: 14px;
-            }
-        """ % COLORS)
+        self._set_state("normal")
 
     def mousePressEvent(self, e: QtGui.QMouseEvent):
         if e.button() == QtCore.Qt.LeftButton:
-            self.setStyleSheet("""
-                QFrame#moduleCard {
-                    background-color: %(surface_press)s;
-                    border: 1px solid %(border)s;
-                    border-radius: 14px;
-                }
-            """ % COLORS)
+            self._set_state("pressed")
         super().mousePressEvent(e)
 
     def mouseReleaseEvent(self, e: QtGui.QMouseEvent):
         if e.button() == QtCore.Qt.LeftButton:
-            if self.click_sound_player is not None:
-                self.click_sound_player.stop()
-                self.click_sound_player.play()
+            if self.click_sound_enabled:
+                SoundPool.instance().play("settings" if self.is_settings_button else "click", self.volume_click)
 
             self.clicked.emit()
-            if self.rect().contains(e.pos()):
-                self.setStyleSheet("""
-                    QFrame#moduleCard {
-                        background-color: %(surface_hover)s;
-                        border: 1px solid %(border)s;
-                        border-radius: 14px;
-                    }
-                """ % COLORS)
-            else:
-                self.setStyleSheet("""
-                    QFrame#moduleCard {
-                        background-color: %(surface)s;
-                        border: 1px solid %(border)s;
-                        border-radius: 14px;
-                    }
-                """ % COLORS)
+            self._set_state("hover" if self.rect().contains(e.pos()) else "normal")
         super().mouseReleaseEvent(e)
 
 
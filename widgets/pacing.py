@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Optional
+
+
+class Pacer:
+    def __init__(self, max_fps: float = 100.0, idle_fps: float = 10.0, hold: float = 2.0, decay: float = 1.5,
+                 stop_event: Optional[threading.Event] = None):
+        self.min_interval = 1.0 / max_fps
+        self.max_interval = max(self.min_interval, 1.0 / idle_fps)
+        self.hold = hold
+        self.decay = decay
+        self.stop_event = stop_event or threading.Event()
+        self._interval = self.min_interval
+        self._last_active = time.perf_counter()
+        self._last_tick = time.perf_counter()
+        self.idle = 0.0
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def rate(self) -> float:
+        return 1.0 / self._interval
+
+    def mark_active(self):
+        self._last_active = time.perf_counter()
+        self._interval = self.min_interval
+
+    def wait(self, active: bool = False) -> bool:
+        now = time.perf_counter()
+        if active:
+            self.mark_active()
+        elif now - self._last_active > self.hold:
+            self._interval = min(self.max_interval, self._interval * self.decay)
+        delay = self._interval - (now - self._last_tick)
+        stopped = self.stop_event.wait(delay) if delay > 0 else self.stop_event.is_set()
+        self._last_tick = time.perf_counter()
+        self.idle += self._last_tick - now
+        return stopped
+
+    def sleep(self, seconds: float) -> bool:
+        start = time.perf_counter()
+        stopped = self.stop_event.wait(seconds)
+        self._last_tick = time.perf_counter()
+        self.idle += self._last_tick - start
+        return stopped
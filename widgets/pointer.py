@@ -0,0 +1,96 @@
+import sys
+import threading
+import time
+from typing import Iterable, NamedTuple, Optional, Sequence, Union
+from widgets.tracing import span
+
+
+class WindowsPointerBackend:
+    BUTTONS = {"left": (0x0002, 0x0004), "right": (0x0008, 0x0010)}
+
+    def __init__(self):
+        import ctypes
+        self._user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+    def move(self, x: int, y: int):
+        self._user32.SetCursorPos(int(x), int(y))
+
+    def click(self, button: str = "left"):
+        down, up = self.BUTTONS[button]
+        self._user32.mouse_event(down, 0, 0, 0, 0)
+        self._user32.mouse_event(up, 0, 0, 0, 0)
+
+
+class PynputPointerBackend:
+    def __init__(self):
+        from pynput.mouse import Button, Controller
+        self._mouse = Controller()
+        self._buttons = {"left": Button.left, "right": Button.right}
+
+    def move(self, x: int, y: int):
+        self._mouse.position = (int(x), int(y))
+
+    def click(self, button: str = "left"):
+        self._mouse.click(self._buttons[button])
+
+
+class ClickTarget(NamedTuple):
+    x: int
+    y: int
+    clicks: int = 1
+    button: str = "left"
+
+
+class ClickReport(NamedTuple):
+    clicks: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        return self.clicks / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return f"{self.clicks} кликов за {self.elapsed * 1000:.0f} мс ({self.rate:.0f} кл/с)"
+
+
+class PointerExecutor:
+    _backend = None
+    _lock = threading.Lock()
+
+    def __init__(self, stop_event: Optional[threading.Event] = None, backend=None):
+        self.stop_event = stop_event or threading.Event()
+        if backend is not None:
+            self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            PointerExecutor._backend = WindowsPointerBackend() if sys.platform == "win32" else PynputPointerBackend()
+        return self._backend
+
+    def move(self, x: int, y: int):
+        with PointerExecutor._lock:
+            self.backend.move(x, y)
+
+    def click(self, x: int, y: int, clicks: int = 1, button: str = "left", interval: float = 0.0) -> ClickReport:
+        return self.run([ClickTarget(x, y, clicks, button)], interval)
+
+    def run(self, targets: Iterable[Union[ClickTarget, Sequence[int]]], interval: float = 0.0, gap: float = 0.0) -> ClickReport:
+        backend = self.backend
+        clicks = 0
+        start = time.perf_counter()
+        with span("click_batch", "input") as batch:
+            for index, target in enumerate(targets):
+                target = ClickTarget(*target)
+                if self.stop_event.is_set() or (index and gap and self.stop_event.wait(gap)):
+                    break
+                for n in range(target.clicks):
+                    if n and interval and self.stop_event.wait(interval):
+                        break
+                    with PointerExecutor._lock:
+                        backend.move(target.x, target.y)
+                        backend.click(target.button)
+                    clicks += 1
+            if getattr(batch, "args", None) is not None:
+                batch.args["clicks"] = clicks
+        return ClickReport(clicks, time.perf_counter() - start)
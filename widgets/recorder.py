@@ -0,0 +1,176 @@
+import bisect
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional
+import numpy as np
+from widgets.capture import CaptureService, CaptureSubscription, Frame, crop_view, region_contains
+
+INDEX_FILE = "index.json"
+TS_DTYPE = np.dtype([("timestamp", "<f8"), ("frame", "<i8")])
+
+
+class ReplayFinished(Exception):
+    pass
+
+
+class FrameRecorder:
+    QUEUE_SIZE = 64
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.frames = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._segments = []
+        self._region = None
+        self._bin = None
+        self._ts = None
+        self._prev = None
+        self._unique = 0
+        self._service = None
+        self._thread = threading.Thread(target=self._run, name="FrameRecorder", daemon=True)
+        self._thread.start()
+
+    def attach(self, service: Optional[CaptureService] = None) -> "FrameRecorder":
+        self._service = service or CaptureService()
+        self._service.add_listener(self)
+        return self
+
+    def __call__(self, frame: Frame, region: Dict[str, int]):
+        try:
+            self._queue.put_nowait((frame, region))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self._service is not None:
+            self._service.remove_listener(self)
+            self._service = None
+        self._queue.put(None)
+        self._thread.join()
+        self._close_segment()
+        self._write_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            self._write(*item)
+
+    def _write(self, frame: Frame, region: Dict[str, int]):
+        if region != self._region:
+            self._open_segment(region, frame.image.shape)
+        if self._prev is None or not np.array_equal(self._prev, frame.image):
+            self._bin.write(np.ascontiguousarray(frame.image).data)
+            self._prev = frame.image
+            self._unique += 1
+        np.array([(frame.timestamp, self._unique - 1)], dtype=TS_DTYPE).tofile(self._ts)
+        self.frames += 1
+
+    def _open_segment(self, region: Dict[str, int], shape):
+        self._close_segment()
+        name = f"seg{len(self._segments):03d}"
+        self._segments.append({"name": name, "region": dict(region), "shape": list(shape)})
+        self._bin = open(os.path.join(self.path, name + ".bin"), "wb")
+        self._ts = open(os.path.join(self.path, name + ".ts"), "wb")
+        self._region = dict(region)
+        self._prev = None
+        self._unique = 0
+        self._write_index()
+
+    def _close_segment(self):
+        for fp in (self._bin, self._ts):
+            if fp is not None:
+                fp.close()
+        self._bin = self._ts = None
+
+    def _write_index(self):
+        with open(os.path.join(self.path, INDEX_FILE), "w", encoding="utf-8") as fp:
+            json.dump({"version": 1, "segments": self._segments}, fp, ensure_ascii=False, indent=4)
+
+
+class Recording:
+    def __init__(self, path: str):
+        with open(os.path.join(path, INDEX_FILE), "r", encoding="utf-8") as fp:
+            meta = json.load(fp)
+        self.path = path
+        self.segments = []
+        self._starts = []
+        total = 0
+        for seg in meta["segments"]:
+            shape = tuple(seg["shape"])
+            bin_path = os.path.join(path, seg["name"] + ".bin")
+            count = os.path.getsize(bin_path) // int(np.prod(shape))
+            pixels = np.memmap(bin_path, dtype=np.uint8, mode="r", shape=(count,) + shape) if count else np.empty((0,) + shape, np.uint8)
+            ts = np.fromfile(os.path.join(path, seg["name"] + ".ts"), dtype=TS_DTYPE)
+            ts = ts[ts["frame"] < count]
+            self.segments.append((seg["region"], pixels, ts))
+            self._starts.append(total)
+            total += len(ts)
+        self._total = total
+
+    def __len__(self) -> int:
+        return self._total
+
+    def locate(self, index: int):
+        seg = bisect.bisect_right(self._starts, index) - 1
+        return self.segments[seg], index - self._starts[seg]
+
+    def region(self, index: int) -> Dict[str, int]:
+        return self.locate(index)[0][0]
+
+    def __getitem__(self, index: int) -> Frame:
+        if not 0 <= index < self._total:
+            raise IndexError(index)
+        (region, pixels, ts), row = self.locate(index)
+        return Frame(index, float(ts["timestamp"][row]), pixels[ts["frame"][row]])
+
+
+class ReplaySource:
+    def __init__(self, recording, loop: bool = False, realtime: bool = False):
+        self.recording = recording if isinstance(recording, Recording) else Recording(recording)
+        self.loop = loop
+        self.realtime = realtime
+        self._clock = None
+
+    def subscribe(self, region: Dict[str, int]) -> CaptureSubscription:
+        return CaptureSubscription(self, region)
+
+    def unsubscribe(self, sub: CaptureSubscription):
+        pass
+
+    def read(self, sub: CaptureSubscription, max_age: Optional[float] = None) -> Frame:
+        index = sub.last_index + 1
+        wrapped = False
+        while True:
+            if index >= len(self.recording):
+                if not self.loop or wrapped:
+                    raise ReplayFinished("Запись закончилась")
+                index, wrapped = 0, True
+            region = self.recording.region(index)
+            if region_contains(region, sub.region):
+                break
+            index += 1
+        frame = self.recording[index]
+        if self.realtime:
+            self._wait_until(frame.timestamp)
+        return Frame(frame.index, frame.timestamp, crop_view(frame.image, region, sub.region))
+
+    def _wait_until(self, timestamp: float):
+        if self._clock is None:
+            self._clock = (time.perf_counter(), timestamp)
+        start, origin = self._clock
+        delay = start + (timestamp - origin) - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
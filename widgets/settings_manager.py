@@ -0,0 +1,85 @@
+import atexit
+import json
+import os
+import threading
+
+
+class SettingsManager:
+    _instance = None
+
+    SAVE_DELAY = 0.5
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(SettingsManager, cls).__new__(cls)
+            cls._instance.filename = "settings.json"
+            cls._instance.settings = {}
+            cls._instance._lock = threading.RLock()
+            cls._instance._dirty = False
+            cls._instance._timer = None
+            cls._instance.load()
+            atexit.register(cls._instance.flush)
+        return cls._instance
+
+    def load(self):
+        with self._lock:
+            if os.path.exists(self.filename):
+                try:
+                    with open(self.filename, "r", encoding="utf-8") as f:
+                        self.settings = json.load(f)
+                except Exception:
+                    self.settings = {}
+            else:
+                self.settings = {}
+            self._dirty = False
+
+    def save(self):
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            tmp = self.filename + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.settings, f, ensure_ascii=False, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.filename)
+                self._dirty = False
+            except OSError:
+                pass
+
+    def get(self, section: str, key: str, default=None):
+        with self._lock:
+            return self.settings.get(section, {}).get(key, default)
+
+    def set(self, section: str, key: str, value):
+        with self._lock:
+            group = self.settings.setdefault(section, {})
+            if key in group and group[key] == value:
+                return
+            group[key] = value
+            self.save()
+
+    def clear_section(self, section: str):
+        with self._lock:
+            if self.settings.pop(section, None):
+                self.save()
+
+    def save_group(self, section: str, values: dict):
+        with self._lock:
+            group = self.settings.setdefault(section, {})
+            if all(k in group and group[k] == v for k, v in values.items()):
+                return
+            group.update(values)
+            self.save()
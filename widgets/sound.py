@@ -0,0 +1,83 @@
+import os
+import sys
+import threading
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtMultimedia import QSoundEffect
+
+
+def resource_path(relative_path: str) -> str:
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    return os.path.join(base_path, relative_path)
+
+
+class SoundPool(QtCore.QObject):
+    _instance = None
+    _lock = threading.Lock()
+
+    SOUNDS = {
+        "hover": os.path.join("assets", "hover.wav"),
+        "click": os.path.join("assets", "click.wav"),
+        "settings": os.path.join("assets", "settings.wav"),
+        "beep": os.path.join("assets", "beep.wav"),
+    }
+    VOICES = 3
+
+    _play_requested = QtCore.pyqtSignal(str, float)
+
+    @classmethod
+    def instance(cls) -> "SoundPool":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        app = QtWidgets.QApplication.instance()
+        if app is not None and self.thread() is not app.thread():
+            self.moveToThread(app.thread())
+        self._voices = None
+        self._next = {}
+        self._play_requested.connect(self._play)
+        if app is not None and QtCore.QThread.currentThread() is app.thread():
+            self.preload()
+
+    def preload(self):
+        if self._voices is not None:
+            return
+        self._voices = {}
+        for name, path in self.SOUNDS.items():
+            abs_path = resource_path(path)
+            if not os.path.exists(abs_path):
+                print(f"[⚠️] Файл звука не найден: {abs_path}")
+                continue
+            voices = []
+            for _ in range(self.VOICES):
+                effect = QSoundEffect(self)
+                effect.setSource(QtCore.QUrl.fromLocalFile(abs_path))
+                voices.append(effect)
+            self._voices[name] = voices
+            self._next[name] = 0
+
+    def play(self, name: str, volume: float = 1.0):
+        if QtCore.QThread.currentThread() is self.thread():
+            self._play(name, volume)
+        else:
+            self._play_requested.emit(name, volume)
+
+    @QtCore.pyqtSlot(str, float)
+    def _play(self, name: str, volume: float):
+        self.preload()
+        voices = self._voices.get(name)
+        if not voices:
+            return
+        voice = next((v for v in voices if not v.isPlaying()), None)
+        if voice is None:
+            voice = voices[self._next[name]]
+            self._next[name] = (self._next[name] + 1) % len(voices)
+            voice.stop()
+        voice.setVolume(max(0.0, min(1.0, volume)))
+        voice.play()
@@ -0,0 +1,174 @@
+import contextlib
+import importlib.abc
+import json
+import sys
+import threading
+import time
+
+
+class _TimedImports(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.busy = False
+
+        loader = spec.loader
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+        profiler = self.profiler
+
+        def timed_exec_module(module):
+            with profiler.span(fullname, "import"):
+                exec_module(module)
+
+        try:
+            loader.exec_module = timed_exec_module
+        except AttributeError:
+            pass
+        return spec
+
+
+class StartupProfiler:
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(StartupProfiler, cls).__new__(cls)
+            cls._instance._init_state()
+        return cls._instance
+
+    def _init_state(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = []
+        self.first_paint = None
+        self._pending = {}
+        self._stack = []
+        self._finder = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._finder = _TimedImports(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def disable(self):
+        self.enabled = False
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def _now(self) -> float:
+        return time.perf_counter() - self.origin
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str = "init"):
+        if not self.enabled:
+            yield
+            return
+        main = threading.current_thread() is threading.main_thread()
+        entry = [0.0]
+        if main:
+            self._stack.append(entry)
+        start = self._now()
+        try:
+            yield
+        finally:
+            dur = self._now() - start
+            if main:
+                self._stack.pop()
+                if self._stack:
+                    self._stack[-1][0] += dur
+            with self._lock:
+                self.events.append({"name": name, "cat": cat, "ph": "X", "start": start, "dur": dur,
+                                    "self": dur - entry[0], "tid": threading.get_ident()})
+
+    def begin(self, key: str, name: str = None, cat: str = "network"):
+        if self.enabled:
+            self._pending[key] = (name or key, cat, self._now())
+
+    def end(self, key: str):
+        item = self._pending.pop(key, None)
+        if item is None:
+            return
+        name, cat, start = item
+        dur = self._now() - start
+        with self._lock:
+            self.events.append({"name": name, "cat": cat, "ph": "async", "start": start, "dur": dur,
+                                "self": dur, "tid": threading.get_ident()})
+
+    def mark(self, name: str, cat: str = "mark"):
+        if not self.enabled:
+            return
+        now = self._now()
+        if name == "first paint" and self.first_paint is None:
+            self.first_paint = now
+        with self._lock:
+            self.events.append({"name": name, "cat": cat, "ph": "i", "start": now, "dur": 0.0,
+                                "self": 0.0, "tid": threading.get_ident()})
+
+    def report(self) -> str:
+        with self._lock:
+            events = [e for e in self.events if e["ph"] != "i"]
+            marks = [e for e in self.events if e["ph"] == "i"]
+        totals = {}
+        for e in events:
+            if e["ph"] == "X":
+                totals[e["cat"]] = totals.get(e["cat"], 0.0) + e["self"]
+        lines = []
+        if self.first_paint is not None:
+            lines.append(f"Первая отрисовка окна: {self.first_paint * 1000:.1f} мс от старта")
+        for m in marks:
+            lines.append(f"  отметка {m['name']}: {m['start'] * 1000:.1f} мс")
+        lines.append("Итого по категориям (собственное время): " +
+                     ", ".join(f"{cat} {sec * 1000:.1f} мс" for cat, sec in sorted(totals.items(), key=lambda kv: -kv[1])))
+        lines.append("")
+        lines.append(f"{'собств. мс':>11}{'всего мс':>11}{'старт мс':>11}  {'категория':<10} имя")
+        for e in sorted(events, key=lambda e: -e["self"]):
+            lines.append(f"{e['self'] * 1000:>11.2f}{e['dur'] * 1000:>11.2f}{e['start'] * 1000:>11.1f}  {e['cat']:<10} {e['name']}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        trace = []
+        with self._lock:
+            events = list(self.events)
+        for i, e in enumerate(events):
+            base = {"name": e["name"], "cat": e["cat"], "pid": 1, "tid": e["tid"], "ts": e["start"] * 1e6}
+            if e["ph"] == "X":
+                trace.append({**base, "ph": "X", "dur": e["dur"] * 1e6})
+            elif e["ph"] == "async":
+                trace.append({**base, "ph": "b", "id": i})
+                trace.append({**base, "ph": "e", "id": i, "ts": (e["start"] + e["dur"]) * 1e6})
+            else:
+                trace.append({**base, "ph": "i", "s": "g"})
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def write(self, prefix: str = "startup_profile") -> str:
+        report = self.report()
+        with open(prefix + ".txt", "w", encoding="utf-8") as fp:
+            fp.write(report + "\n")
+        with open(prefix + ".json", "w", encoding="utf-8") as fp:
+            json.dump(self.chrome_trace(), fp, ensure_ascii=False)
+        return report
@@ -1,7 +1,55 @@
 from PyQt5 import QtCore, QtGui, QtWidgets
+import math
 from .theme import COLORS
 
+
+class PulseClock(QtCore.QObject):
+    _instance = None
+
+    PERIOD_MS = 1200
+    INTERVAL_MS = 33
+
+    @classmethod
+    def instance(cls) -> "PulseClock":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._dots = []
+        self._elapsed = QtCore.QElapsedTimer()
+        self._elapsed.start()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def progress(self) -> float:
+        t = (self._elapsed.elapsed() % self.PERIOD_MS) / self.PERIOD_MS
+        return (1.0 - math.cos(math.pi * t)) / 2.0
+
+    def register(self, dot):
+        if dot not in self._dots:
+            self._dots.append(dot)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def unregister(self, dot):
+        if dot in self._dots:
+            self._dots.remove(dot)
+        if not self._dots:
+            self._timer.stop()
+
+    def _tick(self):
+        progress = self.progress()
+        for dot in self._dots:
+            dot.advance(progress)
+
+
 class StatusPulseDot(QtWidgets.QWidget):
+    RADIUS = (12.0, 22.0)
+    OPACITY = (0.50, 0.05)
+
     def __init__(self, color=QtGui.QColor(COLORS["accent"])):
         super().__init__()
         self._halo_radius = 18.0
@@ -11,19 +59,10 @@ class StatusPulseDot(QtWidgets.QWidget):
         self.setFixedSize(35, 35)
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
 
-        self.anim_radius = QtCore.QPropertyAnimation(self, b"haloRadius", self)
-        self.anim_radius.setDuration(1200)
-        self.anim_radius.setStartValue(12.0)
-        self.anim_radius.setEndValue(22.0)
-        self.anim_radius.setEasingCurve(QtCore.QEasingCurve.InOutSine)
-        self.anim_radius.setLoopCount(-1)
-
-        self.anim_opacity = QtCore.QPropertyAnimation(self, b"haloOpacity", self)
-        self.anim_opacity.setDuration(1200)
-        self.anim_opacity.setStartValue(0.50)
-        self.anim_opacity.setEndValue(0.05)
-        self.anim_opacity.setEasingCurve(QtCore.QEasingCurve.InOutSine)
-        self.anim_opacity.setLoopCount(-1)
+    def advance(self, progress: float):
+        self._halo_radius = self.RADIUS[0] + (self.RADIUS[1] - self.RADIUS[0]) * progress
+        self._halo_opacity = self.OPACITY[0] + (self.OPACITY[1] - self.OPACITY[0]) * progress
+        self.update()
 
     def sizeHint(self):
         return QtCore.QSize(22, 22)
@@ -49,16 +88,14 @@ class StatusPulseDot(QtWidgets.QWidget):
     def start(self):
         if not self._active:
             self._active = True
-            self.anim_radius.start()
-            self.anim_opacity.start()
+            PulseClock.instance().register(self)
             self.show()
             self.update()
 
     def stop(self):
         if self._active:
             self._active = False
-            self.anim_radius.stop()
-            self.anim_opacity.stop()
+            PulseClock.instance().unregister(self)
             self.hide()
             self.update()
 
@@ -0,0 +1,277 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from widgets.capture import FrameGate
+from widgets.tracing import span
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+BUNDLE_VERSION = 1
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+class Template(NamedTuple):
+    bgr: np.ndarray
+    gray: np.ndarray
+    mask: Optional[np.ndarray]
+
+
+def scan_sources(root: str) -> Dict[str, list]:
+    sources = {}
+    for folder, _, files in os.walk(root):
+        for filename in files:
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(folder, filename)
+            st = os.stat(path)
+            sources[os.path.relpath(path, root).replace(os.sep, "/")] = [st.st_mtime_ns, st.st_size]
+    return dict(sorted(sources.items()))
+
+
+def build_bundle(root: str, blob_path: str, index_path: str, sources: Dict[str, list]) -> dict:
+    chunks = []
+    entries = {}
+    offset = 0
+
+    def put(image: np.ndarray) -> list:
+        nonlocal offset
+        image = np.ascontiguousarray(image)
+        chunks.append(image.reshape(-1))
+        entry = [offset, list(image.shape)]
+        offset += image.size
+        return entry
+
+    for name in sources:
+        img = cv2.imread(os.path.join(root, name), cv2.IMREAD_UNCHANGED)
+        if img is None:
+            continue
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        bgr = img[:, :, :3]
+        entries[name] = {
+            "bgr": put(bgr),
+            "gray": put(cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)),
+            "mask": put(img[:, :, 3]) if img.shape[2] == 4 else None,
+        }
+
+    os.makedirs(os.path.dirname(blob_path) or ".", exist_ok=True)
+    blob = np.concatenate(chunks) if chunks else np.empty(0, np.uint8)
+    tmp = blob_path + ".tmp"
+    with open(tmp, "wb") as fp:
+        np.save(fp, blob)
+    os.replace(tmp, blob_path)
+
+    index = {"version": BUNDLE_VERSION, "sources": sources, "templates": entries}
+    tmp = index_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(index, fp, ensure_ascii=False)
+    os.replace(tmp, index_path)
+    return index
+
+
+class TemplateRegistry:
+    _instance = None
+
+    CACHE_DIR = "cache"
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(TemplateRegistry, cls).__new__(cls)
+            cls._instance._init_state()
+        return cls._instance
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        self.root = ASSETS_DIR
+        self.blob_path = os.path.join(self.CACHE_DIR, "templates.npy")
+        self.index_path = os.path.join(self.CACHE_DIR, "templates.json")
+        self._blob = None
+        self._index = None
+        self._cache = {}
+
+    def load(self, force: bool = False):
+        with self._lock:
+            sources = scan_sources(self.root)
+            index = None
+            if not force and os.path.exists(self.blob_path) and os.path.exists(self.index_path):
+                try:
+                    with open(self.index_path, "r", encoding="utf-8") as fp:
+                        index = json.load(fp)
+                except (OSError, ValueError):
+                    index = None
+            if not index or index.get("version") != BUNDLE_VERSION or index.get("sources") != sources:
+                index = build_bundle(self.root, self.blob_path, self.index_path, sources)
+            self._blob = np.load(self.blob_path, mmap_mode="r")
+            self._index = index
+            self._cache = {}
+
+    def name_of(self, path: str) -> Optional[str]:
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel.startswith(".."):
+            return None
+        return rel.replace(os.sep, "/")
+
+    def _view(self, entry) -> Optional[np.ndarray]:
+        if entry is None:
+            return None
+        offset, shape = entry
+        return self._blob[offset:offset + int(np.prod(shape))].reshape(shape)
+
+    def get(self, name: str) -> Template:
+        if self._index is None:
+            self.load()
+        name = name.replace(os.sep, "/")
+        template = self._cache.get(name)
+        if template is None:
+            entry = self._index["templates"].get(name)
+            if entry is None:
+                raise FileNotFoundError(f"Файл {name} не найден")
+            template = Template(self._view(entry["bgr"]), self._view(entry["gray"]), self._view(entry["mask"]))
+            self._cache[name] = template
+        return template
+
+    def bgr(self, path: str) -> np.ndarray:
+        name = self.name_of(path)
+        if name is None:
+            img = cv2.imread(path, cv2.IMREAD_COLOR)
+            if img is None:
+                raise FileNotFoundError(f"Файл {os.path.basename(path)} не найден")
+            return img
+        return self.get(name).bgr
+
+
+def scale_template(templ: np.ndarray, scale: float) -> np.ndarray:
+    if scale == 1.0:
+        return templ
+    h, w = templ.shape[:2]
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+    return cv2.resize(np.ascontiguousarray(templ), size, interpolation=interpolation)
+
+
+class TemplateScales:
+    def __init__(self, templates):
+        self.base = templates
+        self._variants = {1.0: templates}
+
+    def get(self, scale: float):
+        variant = self._variants.get(scale)
+        if variant is None:
+            if isinstance(self.base, dict):
+                variant = {key: scale_template(templ, scale) for key, templ in self.base.items()}
+            else:
+                variant = [scale_template(templ, scale) for templ in self.base]
+            self._variants[scale] = variant
+        return variant
+
+
+class ScaleCalibrator:
+    SECTION = "template_scale"
+    SCALES = tuple(round(0.5 + 0.1 * i, 2) for i in range(11))
+    REFINE = (-0.05, -0.025, 0.025, 0.05)
+    THRESHOLD = 0.9
+    FRAMES = 3
+    INTERVAL = 1.0
+    MAX_INTERVAL = 30.0
+    MAX_SWEEPS = 12
+
+    def __init__(self, group: str, probes: Sequence[np.ndarray], screen_size, store=None, stop_event=None,
+                 threshold: Optional[float] = None):
+        self.key = "%s_%dx%d" % (group, screen_size[0], screen_size[1])
+        self.probes = list(probes)
+        self.store = store
+        self.stop_event = stop_event
+        self.threshold = self.THRESHOLD if threshold is None else threshold
+        saved = store.get(self.SECTION, self.key) if store is not None else None
+        self.scale = float(saved) if saved else 1.0
+        self.done = bool(saved)
+        self.sweeps = 0
+        self._gate = FrameGate()
+        self._votes = []
+        self._interval = self.INTERVAL
+        self._last = 0.0
+        self._lock = threading.Lock()
+        self._sweep = None
+        self._result = None
+
+    def best_scale(self, image_bgr: np.ndarray, scales: Sequence[float]) -> Tuple[Optional[float], float]:
+        best, best_score = None, -1.0
+        for scale in scales:
+            for probe in self.probes:
+                if self.stop_event is not None and self.stop_event.is_set():
+                    return None, -1.0
+                templ = scale_template(probe, scale)
+                if templ.shape[0] > image_bgr.shape[0] or templ.shape[1] > image_bgr.shape[1]:
+                    continue
+                res = cv2.matchTemplate(image_bgr, templ, cv2.TM_CCOEFF_NORMED)
+                score = cv2.minMaxLoc(res)[1]
+                if score > best_score:
+                    best, best_score = scale, score
+        return best, best_score
+
+    def update(self, image: np.ndarray, hit: bool) -> float:
+        if self.done:
+            return self.scale
+        self._collect()
+        if hit:
+            self._vote(self.scale)
+            return self.scale
+        if self.done or self._sweep is not None or self.sweeps >= self.MAX_SWEEPS:
+            return self.scale
+        if time.perf_counter() - self._last < self._interval or not self._gate.fresh(image):
+            return self.scale
+        self.sweeps += 1
+        if image.ndim == 3 and image.shape[2] == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        else:
+            image = image.copy()
+        self._sweep = threading.Thread(target=self._run_sweep, args=(image,), name=f"ScaleCalibrator-{self.key}", daemon=True)
+        self._sweep.start()
+        return self.scale
+
+    def _run_sweep(self, image: np.ndarray):
+        with span("calibrate", "cv"):
+            scale, score = self.best_scale(image, self.SCALES)
+            if scale is not None and score >= self.threshold:
+                scale, score = self.best_scale(image, [scale] + [round(scale + d, 3) for d in self.REFINE])
+        with self._lock:
+            self._result = (scale, score)
+
+    def _collect(self):
+        if self._sweep is None or self._sweep.is_alive():
+            return
+        self._sweep = None
+        with self._lock:
+            result, self._result = self._result, None
+        self._last = time.perf_counter()
+        scale, score = result or (None, -1.0)
+        if scale is None or score < self.threshold:
+            self._interval = min(self._interval * 2, self.MAX_INTERVAL)
+            return
+        self._interval = self.INTERVAL
+        self.scale = scale
+        self._vote(scale)
+
+    def close(self, timeout: float = 2.0):
+        sweep = self._sweep
+        if sweep is not None:
+            sweep.join(timeout)
+
+    def _vote(self, scale: float):
+        self._votes.append(scale)
+        if len(self._votes) < self.FRAMES:
+            return
+        self.scale = float(np.median(self._votes))
+        self.done = True
+        if self.store is not None:
+            self.store.set(self.SECTION, self.key, self.scale)
+
+    def apply(self, target, image: np.ndarray, hit: bool) -> bool:
+        scale = self.update(image, hit)
+        if scale == target.scale:
+            return False
+        target.rescale(scale)
+        return True
@@ -0,0 +1,159 @@
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from PyQt5 import QtCore
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.cat, self.start, time.perf_counter() - self.start, self.args)
+        return False
+
+
+class Tracer:
+    _instance = None
+
+    CAPACITY = 200000
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(Tracer, cls).__new__(cls)
+            cls._instance._init_state()
+        return cls._instance
+
+    def _init_state(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=self.CAPACITY)
+        self._threads = {}
+        self._ids = itertools.count(1)
+
+    def enable(self, capacity: int = None):
+        if capacity and capacity != self.events.maxlen:
+            self.events = deque(self.events, maxlen=capacity)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events.clear()
+
+    def _tid(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        return tid
+
+    def span(self, name: str, cat: str = "worker", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def complete(self, name: str, cat: str, start: float, dur: float, args: dict = None):
+        if self.enabled:
+            self.events.append(("X", name, cat, start, dur, self._tid(), args or None))
+
+    def instant(self, name: str, cat: str = "mark", **args):
+        if self.enabled:
+            self.events.append(("i", name, cat, time.perf_counter(), 0.0, self._tid(), args or None))
+
+    def flow_start(self, name: str, cat: str = "signal") -> int:
+        flow = next(self._ids)
+        now = time.perf_counter()
+        tid = self._tid()
+        self.events.append(("X", "emit " + name, cat, now, 0.0, tid, None))
+        self.events.append(("s", name, cat, now, flow, tid, None))
+        return flow
+
+    def flow_end(self, name: str, flow: int, cat: str = "signal"):
+        self.events.append(("f", name, cat, time.perf_counter(), flow, self._tid(), None))
+
+    def chrome_trace(self) -> dict:
+        trace = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+                 for tid, name in list(self._threads.items())]
+        for ph, name, cat, start, value, tid, args in list(self.events):
+            event = {"name": name, "cat": cat, "ph": ph, "pid": 1, "tid": tid, "ts": (start - self.origin) * 1e6}
+            if ph == "X":
+                event["dur"] = value * 1e6
+            elif ph == "i":
+                event["s"] = "t"
+            else:
+                event["id"] = value
+                if ph == "f":
+                    event["bp"] = "e"
+            if args:
+                event["args"] = args
+            trace.append(event)
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def dump(self, prefix: str = "trace") -> str:
+        path = f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(self.chrome_trace(), fp, ensure_ascii=False)
+        return path
+
+
+def span(name: str, cat: str = "worker", **args):
+    tracer = Tracer._instance
+    if tracer is None or not tracer.enabled:
+        return _NULL_SPAN
+    return _Span(tracer, name, cat, args)
+
+
+def record(name: str, cat: str, start: float, dur: float):
+    tracer = Tracer._instance
+    if tracer is not None and tracer.enabled:
+        tracer.complete(name, cat, start, dur)
+
+
+def connect_traced(signal, slot, name: str):
+    tracer = Tracer._instance
+    if tracer is None or not tracer.enabled:
+        signal.connect(slot)
+        return
+    pending = deque()
+
+    def emitted(*args):
+        pending.append((tracer.flow_start(name), time.perf_counter()))
+
+    def delivered(*args):
+        flow, sent = pending.popleft() if pending else (None, None)
+        start = time.perf_counter()
+        if flow is not None:
+            tracer.flow_end(name, flow)
+        try:
+            slot(*args)
+        finally:
+            latency = {"latency_ms": round((start - sent) * 1000, 3)} if sent is not None else None
+            tracer.complete(name, "signal", start, time.perf_counter() - start, latency)
+
+    signal.connect(emitted, QtCore.Qt.DirectConnection)
+    signal.connect(delivered)
@@ -0,0 +1,189 @@
+import abc
+import threading
+import time
+from typing import Callable, List, Optional
+import keyboard
+from PyQt5 import QtCore
+from widgets.capture import CaptureService
+from widgets.common import CommonLogger
+from widgets.focus import FocusWatcher
+from widgets.input import InputDispatcher
+from widgets.metrics import WorkerMetrics
+from widgets.pointer import PointerExecutor
+
+
+class _WorkerMeta(type(QtCore.QThread), abc.ABCMeta):
+    pass
+
+
+class BotWorker(QtCore.QThread, metaclass=_WorkerMeta):
+    log_signal = QtCore.pyqtSignal(str)
+    metrics_signal = QtCore.pyqtSignal(dict)
+
+    JOIN_TIMEOUT = 2.0
+
+    _live = set()
+    _live_lock = threading.Lock()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._stop = threading.Event()
+        self._teardown = []
+        self._threads: List[threading.Thread] = []
+        self._held: List[str] = []
+        self._held_lock = threading.Lock()
+        self._input = None
+        self.pointer = PointerExecutor(self._stop)
+        self.metrics = WorkerMetrics()
+
+    @property
+    def running(self) -> bool:
+        return not self._stop.is_set()
+
+    @running.setter
+    def running(self, value: bool):
+        if value:
+            self._stop.clear()
+        else:
+            self._stop.set()
+
+    def log(self, message: str):
+        CommonLogger.log(message, self.log_signal)
+
+    @abc.abstractmethod
+    def work(self):
+        ...
+
+    def run(self):
+        with BotWorker._live_lock:
+            BotWorker._live.add(self)
+        try:
+            self.work()
+        except Exception as exc:
+            self.log(f"[Ошибка потока] {exc}")
+        finally:
+            self._stop.set()
+            self._teardown_all()
+            self.publish_metrics(force=True)
+            with BotWorker._live_lock:
+                BotWorker._live.discard(self)
+
+    def stop(self):
+        self._stop.set()
+
+    def pause(self, seconds: float) -> bool:
+        start = time.perf_counter()
+        stopped = self._stop.wait(seconds)
+        self.metrics.idle(time.perf_counter() - start)
+        self.publish_metrics()
+        return stopped
+
+    def publish_metrics(self, force: bool = False):
+        if force or self.metrics.due():
+            self.metrics_signal.emit(self.metrics.snapshot())
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        self.stop()
+        if QtCore.QThread.currentThread() is self or not self.isRunning():
+            return True
+        timeout = self.JOIN_TIMEOUT if timeout is None else timeout
+        if self.wait(int(timeout * 1000)):
+            return True
+        self.release_keys()
+        return False
+
+    @classmethod
+    def shutdown_all(cls, timeout: Optional[float] = None) -> int:
+        with cls._live_lock:
+            workers = list(cls._live)
+        for worker in workers:
+            worker.stop()
+        return sum(not worker.shutdown(timeout) for worker in workers)
+
+    def on_teardown(self, callback: Callable, *args) -> Callable:
+        self._teardown.append((callback, args))
+        return callback
+
+    def subscribe(self, region: dict, source=None):
+        source = source or getattr(self, "source", None) or CaptureService()
+        roi = source.subscribe(region)
+        self.on_teardown(roi.close)
+        return roi
+
+    def watch_focus(self) -> FocusWatcher:
+        focus = FocusWatcher().acquire()
+        self.on_teardown(focus.release)
+        return focus
+
+    def add_hotkey(self, hotkey: str, callback: Callable):
+        handle = keyboard.add_hotkey(hotkey, callback)
+        self.on_teardown(keyboard.remove_hotkey, handle)
+        return handle
+
+    def use_gamepad(self, gamepad):
+        def reset():
+            gamepad.reset()
+            gamepad.update()
+        self.on_teardown(reset)
+        return gamepad
+
+    def own(self, worker: "BotWorker") -> "BotWorker":
+        self.on_teardown(worker.shutdown)
+        return worker
+
+    def spawn(self, target: Callable, *args, name: str = None) -> threading.Thread:
+        name = name or f"{type(self).__name__}-{len(self._threads) + 1}"
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+        return thread
+
+    def tap(self, key: str, times: int = 1) -> threading.Event:
+        if self._input is None:
+            self._input = InputDispatcher().acquire()
+            self.on_teardown(self._release_input)
+        return self._input.tap(key, times, owner=self)
+
+    def _release_input(self):
+        self._input.release(self)
+        self._input = None
+
+    def hold(self, *keys: str):
+        for key in keys:
+            InputDispatcher().press(key)
+            with self._held_lock:
+                if key not in self._held:
+                    self._held.append(key)
+
+    def release(self, *keys: str):
+        for key in keys:
+            with self._held_lock:
+                if key in self._held:
+                    self._held.remove(key)
+            InputDispatcher().unpress(key)
+
+    def release_keys(self):
+        with self._held_lock:
+            held, self._held = self._held, []
+        for key in reversed(held):
+            try:
+                InputDispatcher().unpress(key)
+            except Exception:
+                pass
+
+    def _teardown_all(self):
+        deadline = time.monotonic() + self.JOIN_TIMEOUT
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(max(0.0, deadline - time.monotonic()))
+        alive = [thread.name for thread in self._threads if thread.is_alive()]
+        if alive:
+            self.log(f"[!] Потоки не завершились вовремя: {', '.join(alive)}")
+        self._threads = []
+        self.release_keys()
+        while self._teardown:
+            callback, args = self._teardown.pop()
+            try:
+                callback(*args)
+            except Exception as exc:
+                self.log(f"[!] Ошибка при освобождении ресурсов: {exc}")